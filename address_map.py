@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+RSLogix 500 <-> Logix Address Translation
+Maps converted-SLC Logix tags (placeholder I/O UDTs, aliases, B3[0].4) to RSLogix 500 addresses and back
+"""
+
+import re
+from tag_address import parse_address
+
+# The SLC-to-Logix converter creates one SLOTnn_UDT per I/O slot, with DINT
+# members named after the SLC file they replace (I, O); every DINT holds one
+# 16-bit SLC word
+_SLOT_UDT_RE = re.compile(r'SLOT(\d+)_UDT')
+_IO_MEMBERS = ('I', 'O')
+_SLC_WORD_BITS = 16
+
+class AddressMap:
+    """
+    Bidirectional lookup between the Logix and RSLogix 500 spellings of a converted program.
+
+    Placeholder I/O bits are tabulated from the SLOTnn_UDT definitions and the
+    tags that use them:
+        SLOT00_Bul_1766_Placeholder.I[1].1  <->  I:0/17
+        SLOT01_1762_IQ16_Placeholder.I.7    <->  I:1/7
+    Alias tags resolve through their target (XIO -> ...I[0].7 -> I:0/7), and
+    converted data files translate by address (B3[3].10 <-> B3:3/10,
+    T4[16].DN <-> T4:16/DN). Every lookup is a dict hit.
+    """
+
+    def __init__(self):
+        self.logix_to_slc = {}
+        self.slc_to_logix = {}
+        self._members = {}       # data type -> [(member, dimension)]
+        self._aliases = {}       # alias tag -> target operand
+
+    def add_member(self, data_type, member, dimension):
+        """Record a member of a user data type (dimension 0 = scalar)"""
+        self._members.setdefault(data_type, []).append((member, dimension))
+
+    def add_tag(self, name, data_type=None, alias_for=None):
+        """Record a tag; placeholder I/O tags add one table entry per SLC bit"""
+        if alias_for:
+            self._aliases[name] = alias_for
+            return
+
+        match = _SLOT_UDT_RE.fullmatch(data_type or '')
+        if match is None:
+            return
+        slot = int(match.group(1))
+        for member, dimension in self._members.get(data_type, ()):
+            if member not in _IO_MEMBERS:
+                continue
+            for word in range(dimension or 1):
+                prefix = f'{name}.{member}[{word}]' if dimension else f'{name}.{member}'
+                for bit in range(_SLC_WORD_BITS):
+                    logix = f'{prefix}.{bit}'
+                    slc = f'{member}:{slot}/{word * _SLC_WORD_BITS + bit}'
+                    self.logix_to_slc[logix] = slc
+                    self.slc_to_logix[slc] = logix
+
+    def to_slc(self, tag):
+        """
+        RSLogix 500 address for a Logix operand, or None for a purely symbolic
+        tag - and for an alias chain that loops back on itself (A -> B -> A),
+        which translate() then leaves unresolved
+        """
+        seen = set()
+        while tag not in seen:
+            slc = self.logix_to_slc.get(tag)
+            if slc is not None:
+                return slc
+            target = self._aliases.get(tag)
+            if target is None:
+                address = parse_address(tag)
+                return str(address) if address is not None else None
+            seen.add(tag)
+            tag = target
+        return None
+
+    def to_logix(self, address):
+        """Logix operand for an RSLogix 500 address, or None if the program has no such tag"""
+        parsed = parse_address(address)
+        if parsed is None:
+            return None
+        logix = self.slc_to_logix.get(str(parsed))
+        if logix is not None:
+            return logix
+        if parsed.file_type in ('I', 'O', 'S'):
+            # Converted I/O lives in the placeholder tags; there is no status file
+            return None
+        return parsed.logix
+
+    def translate(self, tag):
+        """RSLogix 500 spelling of tag when it has one, else tag unchanged"""
+        return self.to_slc(tag) or tag
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Alarm Classification Rules
+Compiles regex / keyword / address-range rules from a JSON file into one matcher that classifies every tag
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+from tag_address import parse_address
+
+# Result of classifying one tag: categories it belongs to and its highest priority (None if unset)
+Classification = namedtuple('Classification', ['categories', 'priority'])
+
+# Upper bounds for the end of an address range given without bit / suffix
+_MAX_BIT = 1 << 30
+_MAX_SUFFIX = '\uffff'
+
+def _address_range(text):
+    """(low, high) Address bounds of 'B3:0/0-B3:4/15', 'B3:2' (whole word) or 'T4:0-T4:16'"""
+    low_text, _, high_text = text.partition('-')
+    low = parse_address(low_text.strip())
+    high = parse_address((high_text or low_text).strip())
+    if low is None or high is None:
+        raise ValueError(f'Bad address range in alarm rules: {text!r}')
+    if (low.file_type, low.file_number) != (high.file_type, high.file_number):
+        raise ValueError(f'Address range spans data files: {text!r}')
+    # An end without a bit covers the whole word (and every status bit of an element)
+    if high.bit < 0:
+        high = high._replace(sub=high.sub if high.sub >= 0 else _MAX_BIT, bit=_MAX_BIT)
+    high = high._replace(suffix=high.suffix or _MAX_SUFFIX)
+    return low, high
+
+class AlarmRules:
+    """
+    Compiled rule set. Each rule names a category (alarm, status, esd, shutdown,
+    ...) and up to two conditions, both of which must hold:
+        regex      - pattern searched in the description (case-insensitive)
+        keywords   - any of these whole words in the description
+        addresses  - any of these address ranges ('B3:0/0-B3:4/15', 'B3:10')
+    plus an optional priority and "exclude": true, which vetoes the category
+    for tags it matches (e.g. alarm, but not the 'Bit n' scratch bits).
+
+    Every description condition becomes an optional lookahead with its own
+    named group in one combined regex, so a tag is classified with a single
+    match() however many rules there are; address ranges are bucketed by
+    data file.
+    """
+
+    def __init__(self, rules, priorities=()):
+        self.rules = list(rules)
+        self.priorities = list(priorities)
+        self._rank = {priority: rank for rank, priority in enumerate(self.priorities)}
+
+        lookaheads = []
+        self._text_groups = []           # (group name, rule bit)
+        self._ranges = {}                # (file type, file number) -> [(low, high, rule bit)]
+        no_text = no_address = 0
+        self._include = {}               # category -> bitmask of including rules
+        self._exclude = {}               # category -> bitmask of excluding rules
+        self._rule_priority = []         # (rank, priority, bit) of rules with a priority
+
+        for index, rule in enumerate(self.rules):
+            bit = 1 << index
+            category = rule.get('category')
+            if not category:
+                raise ValueError(f'Alarm rule {index} has no category: {rule!r}')
+
+            patterns = []
+            if rule.get('regex'):
+                patterns.append(rule['regex'])
+            if rule.get('keywords'):
+                patterns.append(r'\b(?:' + '|'.join(re.escape(word) for word in rule['keywords']) + r')\b')
+            if patterns:
+                group = f'r{index}'
+                lookaheads.append(f"(?:(?=.*?(?P<{group}>{'|'.join(f'(?:{p})' for p in patterns)})))?")
+                self._text_groups.append((group, bit))
+            else:
+                no_text |= bit
+
+            if rule.get('addresses'):
+                for text in rule['addresses']:
+                    low, high = _address_range(text)
+                    self._ranges.setdefault((low.file_type, low.file_number), []).append((low, high, bit))
+            else:
+                no_address |= bit
+
+            if not patterns and not rule.get('addresses'):
+                raise ValueError(f'Alarm rule {index} has no regex, keywords or addresses: {rule!r}')
+
+            target = self._exclude if rule.get('exclude') else self._include
+            target[category] = target.get(category, 0) | bit
+            priority = rule.get('priority')
+            if priority is not None and not rule.get('exclude'):
+                if priority not in self._rank:
+                    self._rank[priority] = len(self._rank)
+                self._rule_priority.append((self._rank[priority], priority, bit))
+
+        self._matcher = re.compile(''.join(lookaheads), re.IGNORECASE | re.DOTALL)
+        self._no_text = no_text
+        self._no_address = no_address
+        self._rule_priority.sort()
+        self.categories = list(dict.fromkeys(rule['category'] for rule in self.rules))
+
+    @classmethod
+    def from_file(cls, path):
+        """Load rules from JSON: {"priorities": [...highest first], "rules": [...]}"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config.get('rules', ()), config.get('priorities', ()))
+
+    def _matched(self, tag, description):
+        """Bitmask of the rules whose conditions all hold for tag"""
+        match = self._matcher.match(description or '')
+        text_bits = self._no_text
+        for group, bit in self._text_groups:
+            if match.start(group) >= 0:
+                text_bits |= bit
+
+        address_bits = self._no_address
+        address = parse_address(tag)
+        if address is not None:
+            for low, high, bit in self._ranges.get((address.file_type, address.file_number), ()):
+                if low <= address <= high:
+                    address_bits |= bit
+        return text_bits & address_bits
+
+    def classify(self, tag, description):
+        """Classification of one tag, or None when no category applies"""
+        matched = self._matched(tag, description)
+        if not matched:
+            return None
+        categories = frozenset(
+            category for category, mask in self._include.items()
+            if matched & mask and not matched & self._exclude.get(category, 0)
+        )
+        if not categories:
+            return None
+        priority = None
+        for _, name, bit in self._rule_priority:
+            if matched & bit and self.rules[bit.bit_length() - 1]['category'] in categories:
+                priority = name
+                break
+        return Classification(categories, priority)
+
+    def classify_all(self, tag_descriptions):
+        """{tag: Classification} for every tag that falls in at least one category"""
+        classified = {}
+        for tag, description in tag_descriptions.items():
+            classification = self.classify(tag, description)
+            if classification is not None:
+                classified[tag] = classification
+        return classified
+
+# abspath -> (mtime, AlarmRules)
+_RULES_CACHE = {}
+
+def load_rules(path):
+    """AlarmRules for a JSON rule file, compiled once per process (reloaded if the file changes)"""
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime
+    entry = _RULES_CACHE.get(path)
+    if entry is None or entry[0] != mtime:
+        entry = _RULES_CACHE[path] = (mtime, AlarmRules.from_file(path))
+    return entry[1]
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Batch PLC Converter
+Converts a directory or manifest of PLC exports in parallel, one worker process per PLC
+
+Usage:
+    python3 parse_fire_system.py batch exports/ [--output-dir out] [--workers 8]
+    python3 parse_fire_system.py batch plcs.csv      # columns: name,input
+    python3 parse_fire_system.py batch plcs.json     # [{"name": ..., "input": ...}]
+    python3 parse_fire_system.py batch exports/ --profile   # per-stage timings in profile.jsonl
+    python3 parse_fire_system.py batch exports/ --pipeline  # parse the next PLC while writing this one
+    python3 parse_fire_system.py batch exports/ --transitive --voting --direct   # same options as a single PLC
+"""
+
+import argparse
+import csv
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from parse_fire_system import ALARM_RULES_FILE, convert_plc, prepare_plc, write_outputs
+from stage_profiler import profiling
+
+# Input file types picked up when a directory is given
+INPUT_EXTENSIONS = ('.pdf', '.l5x', '.l5k', '.slc')
+
+# Machine-readable summary written next to the workbooks
+REPORT_FILE = 'batch_report.json'
+
+# Per-stage records of every PLC (--profile), one JSON object per line
+PROFILE_FILE = 'profile.jsonl'
+
+# Slowest stages listed after the summary table (--profile)
+SLOWEST_STAGES = 10
+
+# --pipeline: parsed PLCs waiting for a render worker before parsing pauses
+PIPELINE_QUEUE_SIZE = 2
+
+def discover_jobs(source):
+    """
+    Build the job list from a directory of exports or a CSV / JSON manifest.
+
+    Directory inputs are named after the file (underscores become spaces).
+    Manifest paths are resolved relative to the manifest's own directory.
+
+    Returns:
+        List of {'name', 'input'} dicts
+    """
+    if os.path.isdir(source):
+        jobs = []
+        for entry in sorted(os.listdir(source)):
+            stem, ext = os.path.splitext(entry)
+            if ext.lower() in INPUT_EXTENSIONS:
+                jobs.append({'name': stem.replace('_', ' '), 'input': os.path.join(source, entry)})
+        return jobs
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    if source.lower().endswith('.json'):
+        with open(source, encoding='utf-8') as f:
+            rows = json.load(f)
+    else:
+        with open(source, newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+
+    jobs = []
+    for row in rows:
+        input_file = row['input'].strip()
+        if not os.path.isabs(input_file):
+            input_file = os.path.join(base_dir, input_file)
+        name = (row.get('name') or '').strip() or os.path.splitext(os.path.basename(input_file))[0]
+        jobs.append({'name': name, 'input': input_file})
+    return jobs
+
+def run_job(job, output_dir, use_cache=True, force=False, profile=False, **options):
+    """
+    Worker: convert one PLC, turning any exception into a failed result.
+    options go to convert_plc() (streaming, transitive, voting, direct,
+    alarm_rules, comment_store).
+    """
+    start = time.perf_counter()
+    result = {'name': job['name'], 'input': job['input']}
+    try:
+        if profile:
+            with profiling(plc=job['name']) as profiler:
+                try:
+                    result.update(convert_plc(job['input'], job['name'], output_dir, use_cache=use_cache,
+                                              force=force, **options))
+                finally:
+                    # Stages completed before a failure are still reported
+                    result['profile'] = profiler.records
+        else:
+            result.update(convert_plc(job['input'], job['name'], output_dir, use_cache=use_cache, force=force,
+                                      **options))
+        result['status'] = 'ok'
+    except Exception as exc:
+        result['status'] = 'failed'
+        result['error'] = f'{type(exc).__name__}: {exc}'
+        result['traceback'] = traceback.format_exc()
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+def run_batch(jobs, output_dir='', max_workers=None, use_cache=True, force=False, profile=False, **options):
+    """
+    Convert every job in a process pool and return results in job order.
+
+    A job that raises (or whose worker process dies) is recorded as failed and
+    does not stop the rest of the batch. options go to convert_plc().
+    """
+    if not jobs:
+        return []
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_job, job, output_dir, use_cache, force, profile, **options): index
+            for index, job in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as exc:
+                # Worker process crashed (e.g. killed) before it could report
+                results[index] = {
+                    'name': jobs[index]['name'],
+                    'input': jobs[index]['input'],
+                    'status': 'failed',
+                    'error': f'{type(exc).__name__}: {exc}',
+                }
+    return results
+
+def _failed(job, exc, with_traceback=True):
+    """Failed result for a job"""
+    result = {'name': job['name'], 'input': job['input'], 'status': 'failed', 'error': f'{type(exc).__name__}: {exc}'}
+    if with_traceback:
+        result['traceback'] = traceback.format_exc()
+    return result
+
+def parse_job(job, use_cache=True, profile=False, **options):
+    """Pipeline worker: extract and build one PLC (prepare_plc()), timing and profiling it"""
+    start = time.perf_counter()
+    if not profile:
+        plc = prepare_plc(job['input'], use_cache, **options)
+    else:
+        with profiling(plc=job['name']) as profiler:
+            plc = prepare_plc(job['input'], use_cache, **options)
+        plc['profile'] = profiler.records
+    plc['parse_seconds'] = time.perf_counter() - start
+    return plc
+
+def render_job(job, plc, output_dir, force=False, profile=False, streaming=False, direct=False):
+    """Pipeline worker: write one prepared PLC's workbooks, returning its batch result"""
+    start = time.perf_counter()
+    result = {'name': job['name'], 'input': job['input']}
+    try:
+        if not profile:
+            written = write_outputs(plc['alarms'], plc['interlocks'], plc['effect_descriptions'], job['name'],
+                                    output_dir, streaming=streaming, force=force, direct=direct)
+        else:
+            with profiling(plc=job['name']) as profiler:
+                written = write_outputs(plc['alarms'], plc['interlocks'], plc['effect_descriptions'], job['name'],
+                                        output_dir, streaming=streaming, force=force, direct=direct)
+            result['profile'] = plc.get('profile', []) + profiler.records
+        result.update(
+            rungs=plc['rungs'], tags=plc['tags'], alarms=len(plc['alarms']), interlocks=len(plc['interlocks']),
+            cache_hit=plc['cache_hit'], warnings=plc['warnings'], outputs=written['outputs'],
+            written=written['written'], changes=written['changes'], status='ok',
+        )
+    except Exception as exc:
+        result = _failed(job, exc)
+    result['seconds'] = round(plc['parse_seconds'] + time.perf_counter() - start, 3)
+    return result
+
+def run_pipeline(jobs, output_dir='', parse_workers=None, render_workers=None, queue_size=PIPELINE_QUEUE_SIZE,
+                 use_cache=True, force=False, profile=False, streaming=False, direct=False, **options):
+    """
+    Convert every job as a two-stage pipeline and return results in job order.
+
+    Parse workers (extract + build) feed render workers (both workbooks)
+    through a bounded queue, so the next PLCs are parsed while earlier ones are
+    written. When renders fall behind, the queue fills and no further parses
+    are started: at most parse_workers + queue_size + render_workers PLCs are
+    in memory at once. options go to prepare_plc() (transitive, voting, alarm_rules,
+    comment_store); streaming and direct to write_outputs().
+    """
+    if not jobs:
+        return []
+
+    parse_workers = min(parse_workers or max((os.cpu_count() or 2) // 2, 1), len(jobs))
+    render_workers = min(render_workers or max((os.cpu_count() or 2) // 2, 1), len(jobs))
+    results = [None] * len(jobs)
+    parsed = queue.Queue(maxsize=queue_size)
+    render_slots = threading.BoundedSemaphore(render_workers)
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as parse_pool, \
+            ProcessPoolExecutor(max_workers=render_workers) as render_pool:
+
+        def produce():
+            # Keep parse_workers parses running; put() blocks while the queue is full
+            running = []
+            try:
+                for index, job in enumerate(jobs):
+                    running.append((index, parse_pool.submit(parse_job, job, use_cache, profile, **options)))
+                    if len(running) >= parse_workers:
+                        parsed.put(running.pop(0))
+            finally:
+                # Always end the stream, even if the pool broke mid-batch
+                for item in running:
+                    parsed.put(item)
+                parsed.put(None)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        renders = {}
+        while True:
+            item = parsed.get()
+            if item is None:
+                break
+            index, future = item
+            try:
+                plc = future.result()
+            except Exception as exc:
+                results[index] = _failed(jobs[index], exc, with_traceback=False)
+                continue
+            # Wait for a free render worker, so rendering never queues up unbounded
+            render_slots.acquire()
+            render = render_pool.submit(render_job, jobs[index], plc, output_dir, force, profile, streaming, direct)
+            render.add_done_callback(lambda _: render_slots.release())
+            renders[render] = index
+        producer.join()
+
+        for render in as_completed(renders):
+            index = renders[render]
+            try:
+                results[index] = render.result()
+            except Exception as exc:
+                results[index] = _failed(jobs[index], exc, with_traceback=False)
+
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = _failed(jobs[index], RuntimeError('not started: parse pool stopped'), with_traceback=False)
+    return results
+
+def print_summary(results, wall_seconds):
+    """Print a one-line-per-PLC summary table"""
+    ok = [r for r in results if r['status'] == 'ok']
+    print('\n' + '═' * 70)
+    print(f'  BATCH COMPLETE: {len(ok)}/{len(results)} PLCs converted in {wall_seconds:.1f}s')
+    print('═' * 70)
+    for result in results:
+        if result['status'] == 'ok':
+            cached = ' (cached parse)' if result.get('cache_hit') else ''
+            if not result.get('written', True):
+                cached += ' (unchanged)'
+            print(f"  ✓ {result['name']:<45} {result['alarms']:>4} alarms {result['interlocks']:>4} interlocks"
+                  f"  {result['seconds']:.1f}s{cached}")
+            for warning in result.get('warnings', ()):
+                print(f'      ⚠ {warning}')
+        else:
+            print(f"  ✗ {result['name']:<45} {result.get('error', 'failed')}")
+    print('')
+
+def print_slowest_stages(results, limit=SLOWEST_STAGES):
+    """Print the slowest pipeline stages across all PLCs (--profile)"""
+    records = [record for result in results for record in result.get('profile', ())]
+    records.sort(key=lambda record: record['wall_s'], reverse=True)
+    print('  Slowest stages:')
+    for record in records[:limit]:
+        print(f"  {record['plc']:<40} {record['stage']:<30} {record['wall_s']:>7.2f}s wall "
+              f"{record['cpu_s']:>7.2f}s CPU {record['peak_alloc_mb']:>8.1f} MB alloc")
+    print('')
+
+def main(argv=None):
+    """Command-line entry point for 'parse_fire_system.py batch'"""
+    parser = argparse.ArgumentParser(prog='parse_fire_system.py batch',
+                                     description='Convert many PLC exports in parallel')
+    parser.add_argument('source', help='directory of .pdf/.L5X/.L5K/.SLC exports, or a CSV/JSON manifest')
+    parser.add_argument('--output-dir', default='', help='directory for the generated workbooks')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='re-parse even if inputs are unchanged')
+    parser.add_argument('--force', action='store_true', help='rewrite workbooks even if their content is unchanged')
+    parser.add_argument('--alarm-rules', default=ALARM_RULES_FILE, help='alarm classification rules (JSON)')
+    parser.add_argument('--comment-store', action='store_true', help='keep L5X / L5K tag comments on disk, not in memory')
+    parser.add_argument('--transitive', action='store_true',
+                        help='trace physical inputs to outputs through internal bits across rungs')
+    parser.add_argument('--voting', action='store_true',
+                        help='like --transitive, with k-out-of-N voting inputs on one row per vote (e.g. 2oo6)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='write the C&E matrices in constant memory (plain layout, no template)')
+    parser.add_argument('--direct', action='store_true',
+                        help='fill the templates by writing their sheet XML directly (much faster for large matrices)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='separate parse and render worker pools joined by a bounded queue')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='--pipeline parse processes (default: half the CPUs)')
+    parser.add_argument('--render-workers', type=int, default=None,
+                        help='--pipeline render processes (default: half the CPUs)')
+    parser.add_argument('--queue-size', type=int, default=PIPELINE_QUEUE_SIZE,
+                        help='--pipeline parsed PLCs held waiting for a render worker')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'record per-stage time / memory / counts for every PLC in {PROFILE_FILE}')
+    args = parser.parse_args(argv)
+
+    jobs = discover_jobs(args.source)
+    print(f'Converting {len(jobs)} PLC exports from {args.source}...')
+
+    options = dict(alarm_rules=args.alarm_rules, comment_store=args.comment_store, transitive=args.transitive,
+                   voting=args.voting, streaming=args.streaming, direct=args.direct)
+    start = time.perf_counter()
+    if args.pipeline:
+        results = run_pipeline(jobs, args.output_dir, args.parse_workers, args.render_workers, args.queue_size,
+                               use_cache=not args.no_cache, force=args.force, profile=args.profile, **options)
+    else:
+        results = run_batch(jobs, args.output_dir, args.workers, use_cache=not args.no_cache, force=args.force,
+                            profile=args.profile, **options)
+    wall_seconds = time.perf_counter() - start
+    print_summary(results, wall_seconds)
+    if args.profile:
+        print_slowest_stages(results)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    report_path = os.path.join(args.output_dir, REPORT_FILE)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'wall_seconds': round(wall_seconds, 3), 'results': results}, f, indent=2)
+    print(f'Report written to: {report_path}')
+
+    if args.profile:
+        profile_path = os.path.join(args.output_dir, PROFILE_FILE)
+        with open(profile_path, 'w', encoding='utf-8') as f:
+            for result in results:
+                for record in result.get('profile', ()):
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f'Profile written to: {profile_path}')
+
+    # Non-zero exit status when any PLC failed, for nightly job monitoring
+    return 1 if any(r['status'] != 'ok' for r in results) else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Binary Decision Diagrams
+Builds every tag's driving logic as a reduced ordered BDD over one shared node table and finds k-out-of-N voting
+"""
+
+import sys
+from collections import namedtuple
+from math import comb
+from rung_graph import RungGraph
+from rung_parser import COUNTER_INSTRUCTIONS, TIMER_INSTRUCTIONS, Instruction, rung_ast
+from tag_address import address_sort_key, element_of, status_bit
+
+# The constant functions; every other node is an int >= 2
+FALSE, TRUE = 0, 1
+
+# Level of the constants - below every variable
+_LEAF = sys.maxsize
+
+# Limits that keep composition polynomial: once a rung has expanded this many
+# nodes of other bits' functions its remaining contacts are read as
+# variables, and a rung that takes more ite() steps than this is built one
+# rung deep (arbitrary logic can grow exponentially when expanded; interlock
+# and voting logic does not)
+MAX_FUNCTION_NODES = 5000
+MAX_RUNG_STEPS = 20000
+
+# Cached ite() results kept before the computed table is emptied between rungs
+MAX_CACHE_ENTRIES = 1 << 20
+
+# Prime implicants enumerated per function before cause_groups() gives up
+MAX_PRIMES = 16384
+
+class BDDOverflow(RuntimeError):
+    """Raised when an operation runs out of its step budget"""
+
+class BDD:
+    """
+    Reduced ordered binary decision diagram manager.
+
+    Nodes are ints indexing parallel level / low / high lists; 0 and 1 are
+    the constants. The unique table maps (level, low, high) to its node, so
+    each function has exactly one node and equal functions compare equal
+    with ==. One computed table caches every ite() result, so functions
+    built from shared sub-logic (an internal bit read by many rungs) reuse
+    the work. Variables are ordered by first use.
+    """
+
+    def __init__(self):
+        self._level = [_LEAF, _LEAF]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}                # (level, low, high) -> node
+        self._cache = {}                 # (f, g, h) -> ite(f, g, h)
+        self.names = []                  # level -> variable name
+        self._levels = {}                # variable name -> level
+        self.budget = None               # ite() steps left before BDDOverflow (None = unlimited)
+
+    def __len__(self):
+        return len(self._level)
+
+    def mark(self):
+        """Point to roll back to: the sizes of the node and computed tables"""
+        return len(self._level), len(self._cache)
+
+    def rollback(self, mark):
+        """
+        Drop every node and cached result made since mark (work abandoned on
+        BDDOverflow). Both tables are dicts, so the newest entries are last.
+        """
+        nodes, results = mark
+        for _ in range(len(self._level) - nodes):
+            self._unique.popitem()
+        del self._level[nodes:], self._low[nodes:], self._high[nodes:]
+        for _ in range(len(self._cache) - results):
+            self._cache.popitem()
+
+    def trim_cache(self, limit):
+        """Forget every cached ite() result once there are more than limit (nodes stay valid)"""
+        if len(self._cache) > limit:
+            self._cache = {}
+
+    def variable(self, name):
+        """Node of the function that is true when variable name is"""
+        level = self._levels.get(name)
+        if level is None:
+            level = self._levels[name] = len(self.names)
+            self.names.append(name)
+        return self._node(level, FALSE, TRUE)
+
+    def _node(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = self._unique[key] = len(self._level)
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+        return node
+
+    def ite(self, f, g, h):
+        """
+        If f then g else h - the one operation every other is built from.
+        Runs on an explicit stack: a function of thousands of inputs would
+        otherwise recurse once per variable and hit the recursion limit.
+        """
+        levels, low, high = self._level, self._low, self._high
+        cache = self._cache
+        results = []
+        work = [(f, g, h, None)]
+        while work:
+            f, g, h, level = work.pop()
+            if level is not None:
+                # Both cofactors are done: combine them
+                high_result = results.pop()
+                result = cache[(f, g, h)] = self._node(level, results.pop(), high_result)
+                results.append(result)
+                continue
+            if f == TRUE or g == h:
+                results.append(g)
+                continue
+            if f == FALSE:
+                results.append(h)
+                continue
+            if g == TRUE and h == FALSE:
+                results.append(f)
+                continue
+            result = cache.get((f, g, h))
+            if result is not None:
+                results.append(result)
+                continue
+            if self.budget is not None:
+                self.budget -= 1
+                if self.budget < 0:
+                    raise BDDOverflow('BDD step budget exhausted')
+
+            level = min(levels[f], levels[g], levels[h])
+            f0, f1 = (low[f], high[f]) if levels[f] == level else (f, f)
+            g0, g1 = (low[g], high[g]) if levels[g] == level else (g, g)
+            h0, h1 = (low[h], high[h]) if levels[h] == level else (h, h)
+            work.append((f, g, h, level))
+            work.append((f1, g1, h1, None))
+            work.append((f0, g0, h0, None))
+        return results[0]
+
+    def and_(self, f, g):
+        return self.ite(f, g, FALSE)
+
+    def or_(self, f, g):
+        return self.ite(f, TRUE, g)
+
+    def not_(self, f):
+        return self.ite(f, FALSE, TRUE)
+
+    def any_of(self, functions):
+        """
+        OR of many functions, combined pairwise: the sizes stay balanced, so a
+        branch of hundreds of legs costs about n log n instead of n squared
+        """
+        functions = list(functions) or [FALSE]
+        while len(functions) > 1:
+            paired = [self.or_(f, g) for f, g in zip(functions[::2], functions[1::2])]
+            if len(functions) % 2:
+                paired.append(functions[-1])
+            functions = paired
+        return functions[0]
+
+    def at_least(self, k, functions):
+        """True when k or more of functions are - the k-out-of-N vote, built in k x N steps"""
+        counts = [TRUE] + [FALSE] * k    # counts[j]: at least j of the functions so far
+        for f in functions:
+            for j in range(k, 0, -1):
+                counts[j] = self.ite(f, counts[j - 1], counts[j])
+        return counts[k]
+
+    def implies(self, f, g):
+        """True when g holds wherever f does"""
+        return self.ite(f, g, TRUE) == TRUE
+
+    def restrict(self, f, values):
+        """f with the variables in values ({name: bool}) fixed"""
+        fixed = {self._levels[name]: value for name, value in values.items() if name in self._levels}
+        if not fixed:
+            return f
+        levels, low, high = self._level, self._low, self._high
+        done = {FALSE: FALSE, TRUE: TRUE}
+        # Children before parents, without recursion
+        stack = [f]
+        while stack:
+            node = stack[-1]
+            if node in done:
+                stack.pop()
+                continue
+            children = [child for child in (low[node], high[node]) if child not in done]
+            if children:
+                stack.extend(children)
+                continue
+            stack.pop()
+            level = levels[node]
+            if level in fixed:
+                done[node] = done[high[node]] if fixed[level] else done[low[node]]
+            else:
+                done[node] = self._node(level, done[low[node]], done[high[node]])
+        return done[f]
+
+    def nodes(self, f):
+        """Every node of f (constants excluded)"""
+        seen = set()
+        stack = [f]
+        while stack:
+            node = stack.pop()
+            if node > TRUE and node not in seen:
+                seen.add(node)
+                stack.append(self._low[node])
+                stack.append(self._high[node])
+        return seen
+
+    def support(self, f):
+        """Names of the variables f depends on, in variable order"""
+        return [self.names[level] for level in sorted({self._level[node] for node in self.nodes(f)})]
+
+    def polarities(self, f):
+        """
+        {name: True if f only rises with it (XIC-like), False if it only falls
+        (XIO-like), None if both} for f's support. f rises with a variable
+        exactly when low implies high at every node testing it, so one pass
+        over the nodes settles every variable.
+        """
+        levels, low, high = self._level, self._low, self._high
+        rises, falls = {}, {}
+        for node in self.nodes(f):
+            level = levels[node]
+            if rises.get(level, True):
+                rises[level] = self.implies(low[node], high[node])
+            if falls.get(level, True):
+                falls[level] = self.implies(high[node], low[node])
+        return {self.names[level]: True if rises[level] else False if falls[level] else None for level in rises}
+
+    def primes(self, f, asserted, limit=MAX_PRIMES):
+        """
+        Minimal sets of variables whose assertion makes a unate f true, for
+        asserted ({name: value that helps f}); None past limit sets.
+        """
+        levels, low, high = self._level, self._low, self._high
+        helps = {self._levels[name]: value for name, value in asserted.items() if name in self._levels}
+
+        def holds(node, prime):
+            """node's value with the variables in prime asserted and every other one not"""
+            while node > TRUE:
+                level = levels[node]
+                node = high[node] if helps[level] == (level in prime) else low[node]
+            return node == TRUE
+
+        found = {FALSE: [], TRUE: [frozenset()]}
+        stack = [f]
+        while stack:
+            node = stack[-1]
+            if node in found:
+                stack.pop()
+                continue
+            children = [child for child in (low[node], high[node]) if child not in found]
+            if children:
+                stack.extend(children)
+                continue
+            stack.pop()
+            level = levels[node]
+            on, off = (high[node], low[node]) if helps[level] else (low[node], high[node])
+            without = found[off]
+            # Sets that need this variable: those the branch without it does
+            # not already cover (shared sub-logic gives many identical sets)
+            shared = set(without)
+            with_it = [prime | {level} for prime in found[on] if prime not in shared and not holds(off, prime)]
+            if len(without) + len(with_it) > limit:
+                return None
+            found[node] = without + with_it
+        return [frozenset(self.names[level] for level in prime) for prime in found[f]]
+
+class Vote(namedtuple('Vote', ['k', 'causes', 'inverted'])):
+    """
+    One independent group of causes behind an effect: any k of causes trip
+    it (k None when the group is some other AND / OR combination). inverted
+    holds the causes that trip by going off (XIO / normally closed).
+    """
+
+    __slots__ = ()
+
+    @property
+    def label(self):
+        """'2oo6' style label; 'combination' for non-voting groups"""
+        return f'{self.k}oo{len(self.causes)}' if self.k else 'combination'
+
+class DriveLogic:
+    """
+    The driving function of every tag the rungs write, as nodes of one BDD.
+
+    A contact on an internal bit is replaced by that bit's own function, so
+    an output's function is in terms of the tags no rung writes (field
+    inputs, HMI bits). Rungs are built in the rung graph's topological order;
+    a tag OTE'd or latched by several rungs is on when any of them drives it,
+    a timer's done bit follows its rung (as if timed out), and counter done
+    bits stay variables. A contact that closes a feedback loop (seal-in,
+    latch) reads the tag's previous state as a variable. So do the contacts
+    of a rung past MAX_FUNCTION_NODES expanded nodes, and every contact of a
+    rung that takes more than MAX_RUNG_STEPS ite() steps to expand (the rung
+    is then built one rung deep). A tag whose own function would still be
+    larger than that is given up on (no function; read as a variable).
+    """
+
+    def __init__(self, rungs, bdd=None, max_rung_steps=MAX_RUNG_STEPS):
+        self.bdd = bdd or BDD()
+        self.functions = {}              # tag -> node
+        self.state = set()               # written tags read as their previous state (seal-ins, latches, counters)
+        self.truncated = set()           # written tags read as variables because their logic is too large
+        self.given_up = set()            # tags whose logic is too large to build (no function)
+        self._done = set()               # elements whose writers have all been built
+        self._sizes = {}                 # function -> node count
+        self._room = MAX_FUNCTION_NODES  # nodes the rung being built may still expand
+        self._tags = None                # function -> first tag (address order) it drives; built on demand
+
+        asts = [rung_ast(rung) for rung in rungs]
+        writers = {}                     # element -> indexes of the rungs writing it
+        for position, rung in enumerate(rungs):
+            for tag in rung['outputs'] + [rung[key] for key in ('timer', 'counter') if key in rung]:
+                element = element_of(tag)
+                if position not in writers.setdefault(element, []):
+                    writers[element].append(position)
+        self._written = writers
+
+        built = set()
+        for element in RungGraph(rungs).topological_order():
+            for position in writers.get(element, ()):
+                if position not in built:
+                    built.add(position)
+                    self._build(asts[position], rungs[position], max_rung_steps)
+            self._done.add(element)
+
+    def _build(self, ast, rung, max_rung_steps):
+        """Add one rung's drives; a rung too costly to expand is retried one rung deep, then given up on"""
+        bdd = self.bdd
+        functions = self.functions
+        bdd.trim_cache(MAX_CACHE_ENTRIES)
+        for expand in (True, False):
+            drives = []
+            mark = bdd.mark()
+            self._room = MAX_FUNCTION_NODES
+            bdd.budget = max_rung_steps
+            try:
+                self._series(ast, TRUE, drives, expand)
+                built = {}
+                for tag, condition in drives:
+                    if tag not in self.given_up:
+                        built[tag] = bdd.or_(built.get(tag, functions.get(tag, FALSE)), condition)
+            except BDDOverflow:
+                bdd.rollback(mark)
+                continue
+            finally:
+                bdd.budget = None
+            for tag, function in built.items():
+                if self._size(function) <= MAX_FUNCTION_NODES:
+                    functions[tag] = function
+                else:
+                    self._give_up(tag)
+            return
+        for tag in rung['outputs']:
+            self._give_up(tag)
+        if 'timer' in rung:
+            self._give_up(status_bit(rung['timer'], 'DN'))
+
+    def _give_up(self, tag):
+        self.given_up.add(tag)
+        self.functions.pop(tag, None)
+
+    def _size(self, function):
+        size = self._sizes.get(function)
+        if size is None:
+            size = self._sizes[function] = len(self.bdd.nodes(function))
+        return size
+
+    def _read(self, tag, expand=True):
+        element = element_of(tag)
+        if expand and element in self._done and tag in self.functions:
+            function = self.functions[tag]
+            size = self._size(function)
+            if size <= self._room:
+                self._room -= size
+                return function
+        if tag in self.functions or tag in self.given_up:
+            self.truncated.add(tag)
+        elif element in self._written:
+            self.state.add(tag)
+        return self.bdd.variable(tag)
+
+    def _series(self, nodes, condition, drives, expand=True):
+        """Condition after nodes in series; records (tag, condition) for what they turn on"""
+        bdd = self.bdd
+        for node in nodes:
+            if type(node) is not Instruction:
+                condition = bdd.any_of([self._series(leg, condition, drives, expand) for leg in node.legs])
+                continue
+            mnemonic, operands = node
+            if mnemonic == 'XIC':
+                condition = bdd.and_(condition, self._read(operands[0], expand))
+            elif mnemonic == 'XIO':
+                condition = bdd.and_(condition, bdd.not_(self._read(operands[0], expand)))
+            elif mnemonic == 'AFI':
+                condition = FALSE
+            elif mnemonic in ('OTE', 'OTL'):
+                drives.append((operands[0], condition))
+            elif mnemonic in TIMER_INSTRUCTIONS and operands:
+                drives.append((status_bit(operands[0], 'EN'), condition))
+                drives.append((status_bit(operands[0], 'DN'), condition))
+            elif mnemonic in COUNTER_INSTRUCTIONS and operands:
+                drives.append((status_bit(operands[0], 'CU' if mnemonic == 'CTU' else 'CD'), condition))
+        return condition
+
+    def function(self, tag):
+        """Node of what drives tag on (tag's own variable when no rung writes it)"""
+        return self.functions.get(tag, self.bdd.variable(tag))
+
+    def tag_of(self, vote):
+        """The written tag driven by exactly vote (B3:4/6 for its 2oo6 of detectors), or None"""
+        if not vote.k:
+            return None
+        if self._tags is None:
+            self._tags = {}
+            for tag in sorted(self.functions, key=address_sort_key):
+                self._tags.setdefault(self.functions[tag], tag)
+        bdd = self.bdd
+        causes = [bdd.not_(bdd.variable(name)) if name in vote.inverted else bdd.variable(name)
+                  for name in vote.causes]
+        return self._tags.get(bdd.at_least(vote.k, causes))
+
+    def cause_groups(self, tag, is_cause=None):
+        """
+        Split tag's driving function into independent groups of causes - a
+        Vote each, single causes as 1oo1 - with every tag is_cause rejects
+        (and every seal-in / latch state) held off. None when the logic was
+        too large to expand, a cause both trips and resets it (not unate) or
+        there are too many prime implicants.
+        """
+        bdd = self.bdd
+        if tag in self.given_up:
+            return None
+        function = self.function(tag)
+        support = bdd.support(function)
+        if any(name in self.truncated for name in support):
+            return None
+        function = bdd.restrict(function, {
+            name: False for name in support if name in self.state or is_cause is not None and not is_cause(name)
+        })
+        if function in (FALSE, TRUE):
+            return []                    # no cause changes it
+        asserted = bdd.polarities(function)
+        if None in asserted.values():
+            return None
+        names = list(asserted)
+        primes = bdd.primes(function, asserted)
+        if primes is None:
+            return None
+
+        # Causes that appear in a prime together belong to one group
+        group_of = {name: name for name in names}
+
+        def root(name):
+            while group_of[name] != name:
+                group_of[name] = group_of[group_of[name]]
+                name = group_of[name]
+            return name
+
+        for prime in primes:
+            first, *rest = sorted(prime)
+            for name in rest:
+                group_of[root(name)] = root(first)
+        members = {}
+        for prime in primes:
+            members.setdefault(root(next(iter(prime))), []).append(prime)
+
+        groups = []
+        for group_primes in members.values():
+            causes = sorted(set().union(*group_primes), key=address_sort_key)
+            sizes = {len(prime) for prime in group_primes}
+            # k-out-of-N exactly when the primes are every k-subset of the N causes
+            k = None
+            if len(sizes) == 1:
+                size = sizes.pop()
+                if len(group_primes) == comb(len(causes), size):
+                    k = size
+            groups.append(Vote(k, tuple(causes), tuple(name for name in causes if not asserted[name])))
+        groups.sort(key=lambda vote: (len(vote.causes), address_sort_key(vote.causes[0])))
+        return groups
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+BDD Benchmark
+Times building every tag's driving logic as BDDs and finding the voting groups of each effect
+
+Usage:
+    python3 benchmarks/bench_bdd.py [--zones 300] [--detectors 6] [--repeat 3] [--max-seconds 5.0]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bdd import DriveLogic
+
+def generate_program(zones, detectors=6, pulls=3):
+    """
+    Generate rung dicts for a fire & gas program of 'zones' zones: each
+    detector input runs a delay timer whose done bit sets a confirmed bit,
+    every two confirmed detectors of a zone set a pair bit, the pair bits vote
+    2ooN, the vote or any manual pull station trips the zone (bit and
+    output), and any zone trips the ESD bit B5:0/0.
+    """
+    rungs = []
+
+    def add(inputs, outputs, **extra):
+        number = len(rungs)
+        rungs.append(dict({'rung': f'{number:04d}', 'inputs': inputs, 'outputs': outputs, 'description': ''},
+                          **extra))
+        return number
+
+    point = detector = 0
+    zone_bits = []
+    for zone in range(zones):
+        confirmed = []
+        for _ in range(detectors):
+            timer = f'T4:{detector}'
+            add([f'I:{point // 16}/{point % 16}'], [], timer=timer)
+            confirmed.append(f'B3:{100 + detector // 16}/{detector % 16}')
+            add([f'{timer}/DN'], [confirmed[-1]])
+            point += 1
+            detector += 1
+        pairs = []
+        for first in range(detectors):
+            for second in range(first + 1, detectors):
+                number = len(rungs)
+                pairs.append(f'B13:{number // 16}/{number % 16}')
+                add([confirmed[first], confirmed[second]], [pairs[-1]])
+        vote = f'B4:{zone // 16}/{zone % 16}'
+        add(pairs, [vote], logic_type='OR')
+        pull_stations = [f'I:{(point + pull) // 16}/{(point + pull) % 16}' for pull in range(pulls)]
+        point += pulls
+        zone_bits.append(f'B3:{zone // 16}/{zone % 16}')
+        add(pull_stations + [vote], [zone_bits[-1], f'O:{zone // 16}/{zone % 16}'], logic_type='OR')
+    add(zone_bits, ['B5:0/0'], logic_type='OR')
+    return rungs
+
+def main():
+    """Run the benchmark and exit non-zero when a build + grouping pass exceeds the budget or misses a vote"""
+    parser = argparse.ArgumentParser(description='Benchmark BDD drive logic and k-out-of-N detection')
+    parser.add_argument('--zones', type=int, default=300, help='number of synthetic fire zones')
+    parser.add_argument('--detectors', type=int, default=6, help='detectors voting 2ooN per zone')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs (best is reported)')
+    parser.add_argument('--max-seconds', type=float, default=5.0, help='budget for build + grouping')
+    args = parser.parse_args()
+
+    rungs = generate_program(args.zones, args.detectors)
+    is_cause = lambda tag: tag.startswith('I:')
+    effects = [f'O:{zone // 16}/{zone % 16}' for zone in range(args.zones)] + ['B5:0/0']
+
+    build_time = group_time = float('inf')
+    gc.disable()
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            logic = DriveLogic(rungs)
+            build_time = min(build_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            groups = {effect: logic.cause_groups(effect, is_cause) for effect in effects}
+            group_time = min(group_time, time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    label = f'2oo{args.detectors}'
+    votes = sum(1 for vote in groups['B5:0/0'] or () if vote.label == label)
+    print(f'DriveLogic():    {len(rungs):,} rungs, {len(logic.functions):,} functions, '
+          f'{len(logic.bdd):,} BDD nodes in {build_time:.3f}s')
+    print(f'cause_groups():  {len(effects):,} effects in {group_time:.3f}s, '
+          f'{votes:,} {label} votes behind the ESD')
+
+    if votes != args.zones:
+        print(f'✗ Expected {args.zones:,} {label} votes behind the ESD')
+        sys.exit(1)
+    total = build_time + group_time
+    if total > args.max_seconds:
+        print(f'✗ Over budget of {args.max_seconds:.2f}s')
+        sys.exit(1)
+    print(f'✓ Within budget of {args.max_seconds:.2f}s')
+
+if __name__ == '__main__':
+    main()
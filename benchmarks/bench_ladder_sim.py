@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Ladder Simulator Benchmark
+Times compiling a synthetic program with LadderSimulator and sweeping every single and double input fault
+
+Usage:
+    python3 benchmarks/bench_ladder_sim.py [--rungs 3000] [--tags 2000] [--causes 150] [--repeat 3] [--min-rate 20000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ladder_sim import LadderSimulator, fault_sweep
+from rung_parser import rung_from_text
+from synthetic_plc import SyntheticProgram
+
+def main():
+    """Run the benchmark and exit non-zero when the pair sweep is below the target rate"""
+    parser = argparse.ArgumentParser(description='Benchmark the bit-parallel ladder simulator')
+    parser.add_argument('--rungs', type=int, default=3000, help='number of synthetic rungs')
+    parser.add_argument('--tags', type=int, default=2000, help='number of synthetic tags')
+    parser.add_argument('--causes', type=int, default=150, help='field inputs faulted (pairs grow as causes²/2)')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs (best is reported)')
+    parser.add_argument('--min-rate', type=float, default=20000, help='required pair-sweep scenarios/second')
+    args = parser.parse_args()
+
+    program = SyntheticProgram(args.tags, args.rungs)
+    rungs = [rung_from_text(number, program.rung_text()) for number in range(args.rungs)]
+
+    compile_time = single_time = pair_time = float('inf')
+    gc.disable()
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            simulator = LadderSimulator(rungs)
+            compile_time = min(compile_time, time.perf_counter() - start)
+
+            inputs = [tag for tag in simulator.inputs if tag.startswith('SLOT01')]
+            causes = random.Random(0).sample(inputs, min(args.causes, len(inputs)))
+            effects = [tag for tag in simulator.tags if tag.startswith('SLOT02')]
+
+            start = time.perf_counter()
+            single = fault_sweep(simulator, causes, effects)
+            single_time = min(single_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            pairs = fault_sweep(simulator, causes, effects, pairs=True)
+            pair_time = min(pair_time, time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    scenarios = 1 + len(causes) + len(causes) * (len(causes) - 1) // 2
+    rate = scenarios / pair_time
+    print(f'LadderSimulator(): {args.rungs:,} rungs, {len(simulator.tags):,} tags in {compile_time:.3f}s')
+    print(f'single faults:     {len(causes):,} scenarios in {single_time:.3f}s '
+          f"({sum(map(bool, single['single'].values()))} causes drive an effect)")
+    print(f'double faults:     {scenarios:,} scenarios in {pair_time:.3f}s ({rate:,.0f}/s, '
+          f"{len(pairs['pairs']):,} pairs drive an effect neither cause does alone)")
+
+    if rate < args.min_rate:
+        print(f'✗ Below {args.min_rate:,.0f} scenarios/second')
+        sys.exit(1)
+    print(f'✓ At least {args.min_rate:,.0f} scenarios/second')
+
+if __name__ == '__main__':
+    main()
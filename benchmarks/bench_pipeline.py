@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Times parse, matrix build and Excel write (openpyxl and --direct) on synthetic L5X programs at
+1x / 10x / 100x scale and compares the results with a saved JSON baseline
+
+Usage:
+    python3 benchmarks/bench_pipeline.py [--scales 1,10,100] [--repeat 1] [--tolerance 0.25]
+    python3 benchmarks/bench_pipeline.py --save-baseline      # record this machine's baseline
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import parse_fire_system
+from l5x_parser import extract_data_from_l5x
+from synthetic_plc import write_l5x
+
+# 1x is a small fire & gas PLC; 100x (20,000 tags, 30,000 rungs) is the size of
+# a full 1756-L72 project
+BASE_TAGS = 200
+BASE_RUNGS = 300
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'pipeline.json')
+
+# The C&E workbook has one cell per interlock x effect, which grows with the
+# square of the scale; larger matrices are parsed and built but not written
+MAX_WRITE_CELLS = 2_000_000
+
+# Timings below this many seconds are too noisy to call a regression
+MIN_REGRESSION_SECONDS = 0.05
+
+def _best_of(repeat, func):
+    """(best seconds, last result) of func() over repeat runs with the collector paused"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, result
+
+def run_scale(scale, work_dir, repeat=1, branch_depth=2, fan_out=2, max_write_cells=MAX_WRITE_CELLS):
+    """Generate, parse, build and write one scale; returns its result dict"""
+    tags, rungs = BASE_TAGS * scale, BASE_RUNGS * scale
+    l5x_file = write_l5x(os.path.join(work_dir, f'synthetic_{scale}x.L5X'), tags, rungs, branch_depth, fan_out)
+
+    parse_s, (rung_list, tag_descriptions) = _best_of(repeat, lambda: extract_data_from_l5x(l5x_file))
+
+    def build():
+        alarms = parse_fire_system.build_alarm_summary(tag_descriptions)
+        return alarms, parse_fire_system.build_cause_effect_matrix(rung_list, tag_descriptions)
+    build_s, (alarms, interlocks) = _best_of(repeat, build)
+
+    effects = len({effect for interlock in interlocks for effect in interlock['Effects']})
+    cells = len(interlocks) * effects
+    result = {
+        'tags': len(tag_descriptions),
+        'rungs': len(rung_list),
+        'alarms': len(alarms),
+        'interlocks': len(interlocks),
+        'effects': effects,
+        'parse_s': round(parse_s, 4),
+        'build_s': round(build_s, 4),
+    }
+
+    if cells > max_write_cells:
+        result['write_s'] = result['direct_write_s'] = None
+        return result
+
+    alarm_output, cause_effect_output = parse_fire_system.output_paths(f'bench {scale}x', work_dir)
+
+    def write(direct):
+        # The generators report every saved file; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse_fire_system.generate_alarm_summary_excel(
+                alarms, alarm_output, template_file=parse_fire_system.ALARM_SUMMARY_TEMPLATE, direct=direct)
+            parse_fire_system.generate_cause_effect_excel(
+                interlocks, tag_descriptions, cause_effect_output,
+                template_file=parse_fire_system.CAUSE_EFFECT_TEMPLATE, direct=direct)
+    write_s, _ = _best_of(repeat, lambda: write(False))
+    direct_write_s, _ = _best_of(repeat, lambda: write(True))
+    result['write_s'] = round(write_s, 4)
+    result['direct_write_s'] = round(direct_write_s, 4)
+    return result
+
+def compare(results, baseline, tolerance):
+    """Regression messages for every stage slower than the baseline by more than tolerance"""
+    regressions = []
+    for scale, result in results.items():
+        previous = baseline.get('scales', {}).get(scale)
+        if previous is None:
+            continue
+        for stage in ('parse_s', 'build_s', 'write_s', 'direct_write_s'):
+            now, then = result.get(stage), previous.get(stage)
+            if now is None or then is None:
+                continue
+            if now > then * (1 + tolerance) and now - then > MIN_REGRESSION_SECONDS:
+                regressions.append(f'{scale}x {stage[:-2]}: {now:.3f}s vs baseline {then:.3f}s '
+                                   f'(+{(now / then - 1) * 100:.0f}%)')
+    return regressions
+
+def main():
+    """Run the benchmark; exit non-zero when any stage regressed against the baseline"""
+    parser = argparse.ArgumentParser(description='Benchmark parse / build / write on synthetic programs')
+    parser.add_argument('--scales', default='1,10,100', help='comma-separated multiples of the 1x program')
+    parser.add_argument('--repeat', type=int, default=1, help='timing runs per stage (best is reported)')
+    parser.add_argument('--branch-depth', type=int, default=2, help='maximum nesting of parallel branches')
+    parser.add_argument('--fan-out', type=int, default=2, help='maximum coils per rung')
+    parser.add_argument('--max-write-cells', type=int, default=MAX_WRITE_CELLS,
+                        help='skip the Excel write when the C&E matrix has more interlock x effect cells')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before flagging (0.25 = 25%%)')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args()
+
+    # Templates are referenced relative to the repository root
+    os.chdir(os.path.dirname(BENCH_DIR))
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    results = {}
+    print(f"{'Scale':>6}{'Tags':>9}{'Rungs':>9}{'Interlocks':>12}{'Effects':>9}"
+          f"{'Parse s':>10}{'Build s':>10}{'Write s':>10}{'Direct s':>10}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in scales:
+            result = run_scale(scale, work_dir, args.repeat, args.branch_depth, args.fan_out, args.max_write_cells)
+            results[str(scale)] = result
+            write_s, direct_write_s = (f'{result[stage]:.3f}' if result[stage] is not None else 'skipped'
+                                       for stage in ('write_s', 'direct_write_s'))
+            print(f"{scale:>5}x{result['tags']:>9,}{result['rungs']:>9,}{result['interlocks']:>12,}"
+                  f"{result['effects']:>9,}{result['parse_s']:>10.3f}{result['build_s']:>10.3f}{write_s:>10}"
+                  f"{direct_write_s:>10}")
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'branch_depth': args.branch_depth,
+        'fan_out': args.fan_out,
+        'scales': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'✓ Baseline saved to: {args.baseline}')
+        return
+
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f'No baseline at {args.baseline} - run with --save-baseline to record one')
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f'✗ Slower than baseline by more than {args.tolerance:.0%}:')
+        for message in regressions:
+            print(f'  {message}')
+        sys.exit(1)
+    print(f'✓ Within {args.tolerance:.0%} of baseline')
+
+if __name__ == '__main__':
+    main()
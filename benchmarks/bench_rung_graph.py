@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Rung Graph Benchmark
+Times building RungGraph (SCCs + transitive reachability) and extracting field trips
+
+Usage:
+    python3 benchmarks/bench_rung_graph.py [--rungs 5000] [--repeat 3] [--max-seconds 1.0]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rung_graph import RungGraph
+
+def generate_program(count, seed=0):
+    """
+    Generate 'count' rung dicts layered like a real program: field inputs feed
+    internal B3 bits, internal bits feed later internal bits and field outputs,
+    with a sprinkling of seal-in rungs.
+    """
+    rng = random.Random(seed)
+    words = max(count // 16, 1)
+    rungs = []
+    for number in range(count):
+        output = f'B3:{number // 16}/{number % 16}'
+        inputs = [f'I:{rng.randrange(words)}/{rng.randrange(16)}' for _ in range(rng.randint(0, 2))]
+        if number:
+            # Earlier internal bits only, so most of the program is acyclic
+            for _ in range(rng.randint(1, 3)):
+                earlier = rng.randrange(number)
+                inputs.append(f'B3:{earlier // 16}/{earlier % 16}')
+        if rng.random() < 0.05:
+            inputs.append(output)       # seal-in
+        outputs = [output]
+        if rng.random() < 0.2:
+            outputs.append(f'O:{rng.randrange(words)}/{rng.randrange(16)}')
+        rungs.append({'rung': f'{number:04d}', 'inputs': inputs, 'outputs': outputs})
+    return rungs
+
+def main():
+    """Run the benchmark and exit non-zero when a build + trips pass exceeds the budget"""
+    parser = argparse.ArgumentParser(description='Benchmark the rung dependency graph')
+    parser.add_argument('--rungs', type=int, default=5000, help='number of synthetic rungs')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs (best is reported)')
+    parser.add_argument('--max-seconds', type=float, default=1.0, help='budget for build + trips')
+    args = parser.parse_args()
+
+    rungs = generate_program(args.rungs)
+    is_cause = lambda tag: tag.startswith('I:')
+    is_effect = lambda tag: tag.startswith('O:')
+
+    build_time = trips_time = float('inf')
+    gc.disable()
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            graph = RungGraph(rungs)
+            build_time = min(build_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            trips = graph.trips(is_cause, is_effect)
+            trips_time = min(trips_time, time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    pairs = sum(len(effects) for _, effects in trips)
+    print(f'RungGraph():  {args.rungs:,} rungs, {len(graph.nodes):,} tags in {build_time:.3f}s '
+          f'({len(graph.cycles())} cycles)')
+    print(f'trips():      {len(trips):,} causes, {pairs:,} cause/effect pairs in {trips_time:.3f}s')
+
+    total = build_time + trips_time
+    if total > args.max_seconds:
+        print(f'✗ Over budget of {args.max_seconds:.2f}s')
+        sys.exit(1)
+    print(f'✓ Within budget of {args.max_seconds:.2f}s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Rung Parser Benchmark
+Times parse_rung() / rung_from_text() over synthetic RLL rungs
+
+Usage:
+    python3 benchmarks/bench_rung_parser.py [--rungs 100000] [--repeat 3] [--min-rate 100000] [--min-record-rate 40000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rung_parser import parse_rung, rung_from_text
+
+def _bit(rng):
+    """Random bit operand in converted-SLC Logix form"""
+    kind = rng.random()
+    if kind < 0.3:
+        return f'SLOT00_Bul_1766_Placeholder.I[{rng.randrange(2)}].{rng.randrange(16)}'
+    if kind < 0.4:
+        return f'T4[{rng.randrange(20)}].DN'
+    return f'B3[{rng.randrange(12)}].{rng.randrange(16)}'
+
+def generate_rungs(count, seed=0):
+    """Generate 'count' synthetic rungs mixing series contacts, OR branches and outputs"""
+    rng = random.Random(seed)
+    rungs = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 3)):
+            if rng.random() < 0.4:
+                legs = ','.join(f'XIC({_bit(rng)}) ' for _ in range(rng.randint(2, 6)))
+                parts.append(f'[{legs}]')
+            else:
+                parts.append(f'{rng.choice(("XIC", "XIO"))}({_bit(rng)})')
+        roll = rng.random()
+        if roll < 0.2:
+            parts.append(f'TON(T4[{rng.randrange(20)}],?,?)')
+        elif roll < 0.3:
+            parts.append(f'[OTE({_bit(rng)}) ,CTU(C5[{rng.randrange(8)}],?,?) ]')
+        elif roll < 0.5:
+            parts.append(f'[OTE({_bit(rng)}) ,OTE({_bit(rng)}) ]')
+        else:
+            parts.append(f'{rng.choice(("OTE", "OTL", "OTU"))}({_bit(rng)})')
+        rungs.append(''.join(parts) + ';')
+    return rungs
+
+def main():
+    """Run the benchmark and exit non-zero when parse_rung() or rung_from_text() is below its target rate"""
+    parser = argparse.ArgumentParser(description='Benchmark the RLL rung parser')
+    parser.add_argument('--rungs', type=int, default=100000, help='number of synthetic rungs')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs (best is reported)')
+    parser.add_argument('--min-rate', type=float, default=100000, help='required parse_rung() rungs/second')
+    parser.add_argument('--min-record-rate', type=float, default=40000,
+                        help='required rung_from_text() rungs/second')
+    args = parser.parse_args()
+
+    rungs = generate_rungs(args.rungs)
+
+    # Best of N with the collector paused, the same way timeit measures
+    parse_time = record_time = float('inf')
+    gc.disable()
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for text in rungs:
+                parse_rung(text)
+            parse_time = min(parse_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for number, text in enumerate(rungs):
+                rung_from_text(number, text)
+            record_time = min(record_time, time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    parse_rate = len(rungs) / parse_time
+    record_rate = len(rungs) / record_time
+    print(f'parse_rung():     {len(rungs):,} rungs in {parse_time:.3f}s ({parse_rate:,.0f} rungs/s)')
+    print(f'rung_from_text(): {len(rungs):,} rungs in {record_time:.3f}s ({record_rate:,.0f} rungs/s)')
+
+    failed = False
+    for name, rate, target in (('parse_rung()', parse_rate, args.min_rate),
+                               ('rung_from_text()', record_rate, args.min_record_rate)):
+        if rate < target:
+            failed = True
+            print(f'✗ {name} below target of {target:,.0f} rungs/s')
+        else:
+            print(f'✓ {name} meets target of {target:,.0f} rungs/s')
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Template Output Golden Check
+Renders the golden inputs through the openpyxl and --direct template writers and compares each workbook with
+the one the baseline writers rendered from the same inputs (benchmarks/golden/)
+
+Usage:
+    python3 benchmarks/check_goldens.py [--limit 20]
+
+Each golden/<name>_inputs.json holds alarms, interlocks and tag descriptions;
+golden/Alarm_Summary_<name>.xlsx and golden/Cause_Effect_<name>.xlsx are the
+workbooks the baseline commit (e85445c) rendered from them:
+    baseline   - the baseline's own PDF data (its Alarm_Summary / Cause_Effect_Fire_System_PLC_1.xlsx)
+    l5x_sample - the _2_LADDER.L5X sample's alarms and interlocks (first page)
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+GOLDEN_DIR = os.path.join(BENCH_DIR, 'golden')
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import parse_fire_system
+from compare_workbooks import WorkbookView, compare
+
+def golden_sets():
+    """(name, inputs path) of every golden input set"""
+    paths = sorted(glob.glob(os.path.join(GOLDEN_DIR, '*_inputs.json')))
+    return [(os.path.basename(path)[:-len('_inputs.json')], path) for path in paths]
+
+def render(inputs_file, output_dir, direct=False):
+    """Render one input set with the template writers; returns (alarm summary, cause & effect) paths"""
+    with open(inputs_file, encoding='utf-8') as f:
+        inputs = json.load(f)
+    mode = 'direct' if direct else 'openpyxl'
+    alarm_file = os.path.join(output_dir, f'Alarm_Summary_{mode}.xlsx')
+    cause_effect_file = os.path.join(output_dir, f'Cause_Effect_{mode}.xlsx')
+    templates = (os.path.join(ROOT_DIR, parse_fire_system.ALARM_SUMMARY_TEMPLATE),
+                 os.path.join(ROOT_DIR, parse_fire_system.CAUSE_EFFECT_TEMPLATE))
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse_fire_system.generate_alarm_summary_excel(inputs['alarms'], alarm_file, templates[0], direct=direct)
+        parse_fire_system.generate_cause_effect_excel(inputs['interlocks'], inputs['tag_descriptions'],
+                                                      cause_effect_file, templates[1], direct=direct)
+    return alarm_file, cause_effect_file
+
+def check_goldens():
+    """{(set name, writer, workbook): differences} for every golden workbook"""
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, inputs_file in golden_sets():
+            for direct in (False, True):
+                rendered = render(inputs_file, output_dir, direct)
+                for kind, candidate in zip(('Alarm_Summary', 'Cause_Effect'), rendered):
+                    golden = os.path.join(GOLDEN_DIR, f'{kind}_{name}.xlsx')
+                    results[(name, 'direct' if direct else 'openpyxl', kind)] = compare(
+                        WorkbookView(golden), WorkbookView(candidate))
+    return results
+
+def main():
+    """Check every golden; exit non-zero when a rendered workbook differs"""
+    parser = argparse.ArgumentParser(description='Compare the template writers with the baseline golden workbooks')
+    parser.add_argument('--limit', type=int, default=20, help='differences to print per workbook')
+    args = parser.parse_args()
+
+    failed = False
+    for (name, writer, kind), differences in check_goldens().items():
+        if differences:
+            failed = True
+            print(f'✗ {name} {kind} ({writer}): {len(differences)} difference(s)')
+            for line in differences[:args.limit]:
+                print(f'  {line}')
+        else:
+            print(f'✓ {name} {kind} ({writer}) matches the golden')
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
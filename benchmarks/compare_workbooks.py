@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Workbook Golden-File Comparison
+Checks that two .xlsx files look the same in Excel: sheet names, cell values, resolved cell formatting,
+merged ranges, row heights, column widths, frozen panes, page setup and print titles
+
+Usage:
+    python3 benchmarks/compare_workbooks.py golden.xlsx candidate.xlsx [--limit 20]
+"""
+
+import argparse
+import posixpath
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from openpyxl.styles import Alignment
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils import column_index_from_string, get_column_letter, range_boundaries
+
+NS = {
+    'm': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+_R_ID = f"{{{NS['r']}}}id"
+
+STYLE_FIELDS = ('number format', 'font', 'fill', 'border', 'alignment')
+BORDER_SIDES = ('left', 'right', 'top', 'bottom', 'diagonal')
+
+# Column settings are compared up to here
+MAX_COLUMN = 1024
+
+_COORD = re.compile(r'([A-Z]+)(\d+)')
+
+def _text(element):
+    """Text of a shared / inline string item (rich text runs joined)"""
+    return ''.join(t.text or '' for t in element.iter(f"{{{NS['m']}}}t"))
+
+def _merged_cells(ranges):
+    """(row, column) -> (min row, min column, max row, max column) of the merged range covering it"""
+    cells = {}
+    for ref in ranges:
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        for row in range(min_row, max_row + 1):
+            for column in range(min_col, max_col + 1):
+                cells[(row, column)] = (min_row, min_col, max_row, max_col)
+    return cells
+
+class WorkbookView:
+    """What Excel renders from one .xlsx, read straight from its XML parts"""
+
+    def __init__(self, path):
+        self.path = path
+        with zipfile.ZipFile(path) as archive:
+            self.members = set(archive.namelist())
+            self._parts = {name: archive.read(name) for name in self.members if not name.endswith('.bin')}
+        workbook = ET.fromstring(self._parts['xl/workbook.xml'])
+        rels = self._rels('xl/workbook.xml')
+
+        styles = Stylesheet.from_tree(ET.fromstring(self._parts['xl/styles.xml']))
+        self._styles = [self._resolve(styles, xf) for xf in styles.cellXfs.xf]
+
+        self.shared = []
+        if 'xl/sharedStrings.xml' in self._parts:
+            root = ET.fromstring(self._parts['xl/sharedStrings.xml'])
+            self.shared = [_text(si) for si in root.findall('m:si', NS)]
+
+        self.defined_names = {
+            (name.get('name'), name.get('localSheetId')): name.text
+            for name in workbook.iterfind('m:definedNames/m:definedName', NS)
+        }
+        self.sheets = []
+        for sheet in workbook.iterfind('m:sheets/m:sheet', NS):
+            target = rels[sheet.get(_R_ID)]
+            target = target[1:] if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            self.sheets.append((sheet.get('name'), sheet.get('state', 'visible'), self._sheet(target)))
+
+    def _rels(self, part):
+        folder, name = posixpath.split(part)
+        root = ET.fromstring(self._parts[posixpath.join(folder, '_rels', name + '.rels')])
+        return {rel.get('Id'): rel.get('Target') for rel in root.findall('rel:Relationship', NS)}
+
+    @staticmethod
+    def _resolve(styles, xf):
+        """(number format, font, fill, {side: (style, color)}, alignment) of one cellXfs entry"""
+        formats = {fmt.numFmtId: fmt.formatCode for fmt in styles.numFmts.numFmt}
+        border = styles.borders[xf.borderId or 0]
+        sides = {}
+        for name in BORDER_SIDES:
+            side = getattr(border, name)
+            if side is not None and side.style is not None:
+                sides[name] = (side.style, side.color)
+        return (
+            formats.get(xf.numFmtId, xf.numFmtId or 0),
+            styles.fonts[xf.fontId or 0],
+            styles.fills[xf.fillId or 0],
+            sides,
+            xf.alignment if xf.alignment is not None and xf.alignment != Alignment() else None,
+        )
+
+    def _sheet(self, part):
+        root = ET.fromstring(self._parts[part])
+        m = f"{{{NS['m']}}}"
+
+        columns = {}
+        for col in root.iterfind('m:cols/m:col', NS):
+            # Columns past MAX_COLUMN share the last one's settings in practice
+            for index in range(int(col.get('min')), min(int(col.get('max')), MAX_COLUMN) + 1):
+                columns[index] = (col.get('width'), col.get('hidden') in ('1', 'true'), int(col.get('style', 0)))
+
+        rows, cells = {}, {}
+        for row in root.iterfind('m:sheetData/m:row', NS):
+            number = int(row.get('r'))
+            custom = row.get('customFormat') in ('1', 'true')
+            rows[number] = (
+                float(row.get('ht')) if row.get('ht') else None,
+                row.get('hidden') in ('1', 'true'),
+                int(row.get('s', 0)) if custom else None,
+            )
+            for cell in row.iterfind('m:c', NS):
+                kind = cell.get('t', 'n')
+                if kind == 'inlineStr':
+                    inline = cell.find('m:is', NS)
+                    value = _text(inline) if inline is not None else None
+                else:
+                    raw = cell.findtext(f'{m}v')
+                    if raw is None:
+                        value = None
+                    elif kind == 's':
+                        value = self.shared[int(raw)]
+                    elif kind in ('str', 'e'):
+                        value = raw
+                    elif kind == 'b':
+                        value = raw in ('1', 'true')
+                    else:
+                        value = float(raw)
+                column, _ = _COORD.match(cell.get('r')).groups()
+                cells[(number, column_index_from_string(column))] = (value or None, int(cell.get('s', 0)))
+
+        pane = root.find('m:sheetViews/m:sheetView/m:pane', NS)
+        setup = root.find('m:pageSetup', NS)
+        return {
+            'columns': columns,
+            'rows': rows,
+            'cells': cells,
+            'merged': {merge.get('ref') for merge in root.iterfind('m:mergeCells/m:mergeCell', NS)},
+            'pane': None if pane is None else (pane.get('xSplit'), pane.get('ySplit'), pane.get('state')),
+            'page_setup': None if setup is None else
+            tuple(setup.get(key) for key in ('paperSize', 'scale', 'fitToWidth', 'fitToHeight', 'orientation')),
+        }
+
+    def cell(self, sheet, row, column):
+        """(value, resolved style) shown at a position - the cell's own style, else the row's, else the column's"""
+        value, style = sheet['cells'].get((row, column), (None, None))
+        if style is None:
+            row_style = sheet['rows'].get(row, (None, False, None))[2]
+            style = row_style if row_style is not None else sheet['columns'].get(column, (None, False, 0))[2]
+        return value, self._styles[style]
+
+def compare(golden, candidate):
+    """List of human-readable differences between two WorkbookViews (empty when they look the same)"""
+    differences = []
+    if [s[:2] for s in golden.sheets] != [s[:2] for s in candidate.sheets]:
+        differences.append(f'sheets: {[s[:2] for s in golden.sheets]} != {[s[:2] for s in candidate.sheets]}')
+        return differences
+    if golden.defined_names != candidate.defined_names:
+        differences.append(f'defined names: {golden.defined_names} != {candidate.defined_names}')
+
+    for (name, _, a), (_, _, b) in zip(golden.sheets, candidate.sheets):
+        for key in ('merged', 'pane', 'page_setup'):
+            if a[key] != b[key]:
+                if key == 'merged':
+                    extra = (f' (only golden: {sorted(a[key] - b[key])[:10]},'
+                             f' only candidate: {sorted(b[key] - a[key])[:10]})')
+                else:
+                    extra = f': {a[key]} != {b[key]}'
+                differences.append(f'{name}: {key} differs{extra}')
+        for index in sorted(set(a['columns']) | set(b['columns'])):
+            if a['columns'].get(index, (None, False, 0))[:2] != b['columns'].get(index, (None, False, 0))[:2]:
+                differences.append(f"{name}: column {index} {a['columns'].get(index)} != {b['columns'].get(index)}")
+        for number in sorted(set(a['rows']) | set(b['rows'])):
+            if a['rows'].get(number, (None, False))[:2] != b['rows'].get(number, (None, False))[:2]:
+                differences.append(f"{name}: row {number} {a['rows'].get(number)} != {b['rows'].get(number)}")
+        merged = _merged_cells(a['merged'])
+        for row, column in sorted(set(a['cells']) | set(b['cells'])):
+            if a['rows'].get(row, (None, False))[1]:
+                continue                 # hidden row
+            (value, style), (other_value, other_style) = golden.cell(a, row, column), candidate.cell(b, row, column)
+            top_left, sides = True, BORDER_SIDES
+            if (row, column) in merged:
+                # Excel draws a merged range from its top-left cell, plus the
+                # borders of the cells along the range's outer edge
+                min_row, min_col, max_row, max_col = merged[(row, column)]
+                top_left = (row, column) == (min_row, min_col)
+                sides = [side for side, on_edge in (('left', column == min_col), ('right', column == max_col),
+                                                    ('top', row == min_row), ('bottom', row == max_row)) if on_edge]
+            fields = []
+            if top_left:
+                if value != other_value:
+                    differences.append(f'{name}: {get_column_letter(column)}{row} value {value!r} != {other_value!r}')
+                # Font, alignment and number format only show on a cell with a value
+                shown = ('fill',) if value is None else ('number format', 'font', 'fill', 'alignment')
+                fields = [field for field, x, y in zip(STYLE_FIELDS, style, other_style) if field in shown and x != y]
+            fields += [f'{side} border' for side in sides if style[3].get(side) != other_style[3].get(side)]
+            if fields:
+                differences.append(f"{name}: {get_column_letter(column)}{row} {', '.join(fields)} differ")
+    return differences
+
+def main():
+    """Compare two workbooks; exit non-zero when they differ"""
+    parser = argparse.ArgumentParser(description='Check that two .xlsx files render the same')
+    parser.add_argument('golden', help='reference workbook')
+    parser.add_argument('candidate', help='workbook to check')
+    parser.add_argument('--limit', type=int, default=20, help='differences to print')
+    args = parser.parse_args()
+
+    differences = compare(WorkbookView(args.golden), WorkbookView(args.candidate))
+    if differences:
+        for line in differences[:args.limit]:
+            print(f'  {line}')
+        print(f'✗ {len(differences)} difference(s)')
+        sys.exit(1)
+    print(f'✓ {args.candidate} matches {args.golden}')
+
+if __name__ == '__main__':
+    main()
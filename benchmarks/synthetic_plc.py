@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Synthetic PLC Program Generator
+Writes converted-SLC style Studio 5000 L5X exports of any size for benchmarking
+
+Usage:
+    python3 benchmarks/synthetic_plc.py out.L5X [--tags 2000] [--rungs 3000] [--branch-depth 2] [--fan-out 2]
+"""
+
+import argparse
+import random
+from xml.sax.saxutils import quoteattr
+
+# Share of the tag budget per kind of tag
+INPUT_SHARE = 0.3        # field inputs (SLOT01 placeholder .I bits)
+OUTPUT_SHARE = 0.1       # field outputs (SLOT02 placeholder .O bits)
+TIMER_SHARE = 0.05       # T4 timers
+
+# First B3 words of the internal bit file are the shutdown words (B3:2, B3:10)
+SHUTDOWN_WORDS = (2, 10)
+
+_INPUT_TAG = 'SLOT01_Synthetic_IB16_Placeholder'
+_OUTPUT_TAG = 'SLOT02_Synthetic_OB16_Placeholder'
+
+_DESCRIPTIONS = (
+    'Fire Eye {n} Fire Detected', 'Fire Eye {n} Failure Alarm', 'Pull Station {n}', 'Gas Detector {n} High Alarm',
+    'Zone {n} Deluge Valve Open', 'Strobe Light {n} On', 'ESD Alarm {n} to Office PLC', 'Horn {n} Silence',
+)
+
+class SyntheticProgram:
+    """
+    Tag layout and rung generator for one synthetic program.
+
+    tags is split into field inputs, field outputs, timers and B3 internal
+    bits; every tag gets a comment. Each rung is a random series / parallel
+    condition nested up to branch_depth levels of [ , ] branches, driving
+    fan_out coils (internal bits, field outputs, shutdown bits or a TON).
+    """
+
+    def __init__(self, tags, rungs, branch_depth=2, fan_out=2, seed=0):
+        self.rng = random.Random(seed)
+        self.rung_count = rungs
+        self.branch_depth = branch_depth
+        self.fan_out = fan_out
+        self.inputs = max(int(tags * INPUT_SHARE), 16)
+        self.outputs = max(int(tags * OUTPUT_SHARE), 16)
+        self.timers = max(int(tags * TIMER_SHARE), 1)
+        self.bits = max(tags - self.inputs - self.outputs - self.timers, 16 * (max(SHUTDOWN_WORDS) + 1))
+
+    @staticmethod
+    def _words(bits):
+        return (bits + 15) // 16
+
+    def _input(self):
+        bit = self.rng.randrange(self.inputs)
+        return f'{_INPUT_TAG}.I[{bit // 16}].{bit % 16}'
+
+    def _output(self):
+        bit = self.rng.randrange(self.outputs)
+        return f'{_OUTPUT_TAG}.O[{bit // 16}].{bit % 16}'
+
+    def _internal(self):
+        bit = self.rng.randrange(self.bits)
+        return f'B3[{bit // 16}].{bit % 16}'
+
+    def _contact(self):
+        roll = self.rng.random()
+        if roll < 0.45:
+            operand = self._input()
+        elif roll < 0.9:
+            operand = self._internal()
+        else:
+            operand = f'T4[{self.rng.randrange(self.timers)}].DN'
+        return f"{'XIO' if self.rng.random() < 0.2 else 'XIC'}({operand})"
+
+    def _condition(self, depth):
+        parts = []
+        for _ in range(self.rng.randint(1, 3 if depth == self.branch_depth else 2)):
+            if depth and self.rng.random() < 0.4:
+                legs = ','.join(self._condition(depth - 1) + ' ' for _ in range(self.rng.randint(2, 3)))
+                parts.append(f'[{legs}]')
+            else:
+                parts.append(self._contact())
+        return ''.join(parts)
+
+    def _coil(self):
+        roll = self.rng.random()
+        if roll < 0.2:
+            return f'OTE({self._output()})'
+        if roll < 0.3:
+            word = self.rng.choice(SHUTDOWN_WORDS)
+            return f'OTE(B3[{word}].{self.rng.randrange(16)})'
+        if roll < 0.35:
+            return f'TON(T4[{self.rng.randrange(self.timers)}],?,?)'
+        return f"{self.rng.choice(('OTE', 'OTE', 'OTL', 'OTU'))}({self._internal()})"
+
+    def rung_text(self):
+        """One random rung in L5X neutral text"""
+        coils = [self._coil() for _ in range(self.rng.randint(1, self.fan_out))]
+        body = coils[0] if len(coils) == 1 else '[' + ','.join(coil + ' ' for coil in coils) + ']'
+        return f'{self._condition(self.branch_depth)}{body};'
+
+    def _description(self, n):
+        return self.rng.choice(_DESCRIPTIONS).format(n=n)
+
+    def write(self, f):
+        """Write the whole L5X export to a text file object"""
+        input_words, output_words = self._words(self.inputs), self._words(self.outputs)
+        write = f.write
+        write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+        write('<RSLogix5000Content SchemaRevision="1.0" SoftwareRevision="32.04" TargetName="SYNTHETIC" '
+              'TargetType="Routine" TargetSubType="RLL" ContainsContext="true">\n')
+        write('<Controller Use="Context" Name="SYNTHETIC">\n<DataTypes Use="Context">\n')
+        for slot, member, words in ((1, 'I', input_words), (2, 'O', output_words)):
+            write(f'<DataType Name="SLOT{slot:02d}_UDT" Family="NoFamily" Class="User">\n<Members>\n'
+                  f'<Member Name="{member}" DataType="DINT" Dimension="{words}" Radix="Decimal"/>\n'
+                  '</Members>\n</DataType>\n')
+        write('</DataTypes>\n<Tags Use="Context">\n')
+
+        def tag(name, data_type, operands, dimensions=None):
+            dims = f' Dimensions="{dimensions}"' if dimensions else ''
+            write(f'<Tag Name="{name}" TagType="Base" DataType="{data_type}"{dims}>\n<Comments>\n')
+            for operand, text in operands:
+                write(f'<Comment Operand={quoteattr(operand)}>\n<![CDATA[{text}]]>\n</Comment>\n')
+            write('</Comments>\n</Tag>\n')
+
+        tag('B3', 'DINT', ((f'[{bit // 16}].{bit % 16}', self._description(bit)) for bit in range(self.bits)),
+            self._words(self.bits))
+        tag('T4', 'TIMER', ((f'[{n}]', f'Delay Timer {n}') for n in range(self.timers)), self.timers)
+        tag(_INPUT_TAG, 'SLOT01_UDT',
+            ((f'.I[{bit // 16}].{bit % 16}', self._description(bit)) for bit in range(self.inputs)))
+        tag(_OUTPUT_TAG, 'SLOT02_UDT',
+            ((f'.O[{bit // 16}].{bit % 16}', self._description(bit)) for bit in range(self.outputs)))
+
+        write('</Tags>\n<Programs Use="Context">\n<Program Use="Context" Name="SYNTHETIC">\n'
+              '<Routines Use="Context">\n<Routine Use="Target" Name="MAIN" Type="RLL">\n<RLLContent>\n')
+        for number in range(self.rung_count):
+            write(f'<Rung Number="{number}" Type="N">\n<Text>\n<![CDATA[{self.rung_text()}]]>\n</Text>\n</Rung>\n')
+        write('</RLLContent>\n</Routine>\n</Routines>\n</Program>\n</Programs>\n</Controller>\n'
+              '</RSLogix5000Content>\n')
+
+def write_l5x(path, tags, rungs, branch_depth=2, fan_out=2, seed=0):
+    """Write a synthetic L5X export to path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        SyntheticProgram(tags, rungs, branch_depth, fan_out, seed).write(f)
+    return path
+
+def main():
+    """Write one synthetic L5X export"""
+    parser = argparse.ArgumentParser(description='Generate a synthetic converted-SLC L5X export')
+    parser.add_argument('output', help='L5X file to write')
+    parser.add_argument('--tags', type=int, default=2000, help='number of commented tags')
+    parser.add_argument('--rungs', type=int, default=3000, help='number of rungs')
+    parser.add_argument('--branch-depth', type=int, default=2, help='maximum nesting of parallel branches')
+    parser.add_argument('--fan-out', type=int, default=2, help='maximum coils per rung')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (same seed, same program)')
+    args = parser.parse_args()
+    write_l5x(args.output, args.tags, args.rungs, args.branch_depth, args.fan_out, args.seed)
+    print(f'✓ Wrote {args.rungs:,} rungs, {args.tags:,} tags to {args.output}')
+
+if __name__ == '__main__':
+    main()
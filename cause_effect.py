@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Sparse Cause & Effect Matrix
+Interns effect tags to column indices and stores every cause row as an int bitset
+"""
+
+def _iter_bits(bits):
+    """Yield the indexes of the set bits of a non-negative int, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+class CauseEffectMatrix:
+    """
+    Cause rows x effect columns, storing only which cells hold an X.
+
+    Row i belongs to cause tag causes[i]; several rows may share a cause (one
+    per interlock rung). Each row is an int whose bit c is set when the row
+    trips effects[c], and each column keeps the same kind of bitset over rows,
+    so row and column queries and cell iteration cost O(set cells), never
+    O(rows x columns).
+
+    Example:
+        m = CauseEffectMatrix()
+        m.add_row('I:0/3', ['O:0/0', 'B3:2/0'])
+        m.causes_of('O:0/0')   -> ['I:0/3']
+    """
+
+    __slots__ = ('effects', 'causes', '_columns', '_rows', '_column_rows', '_cause_rows')
+
+    def __init__(self, effects=()):
+        self.effects = []        # column index -> effect tag
+        self.causes = []         # row index -> cause tag
+        self._columns = {}       # effect tag -> column index
+        self._rows = []          # row index -> bitset of columns
+        self._column_rows = []   # column index -> bitset of rows
+        self._cause_rows = {}    # cause tag -> row indexes
+        for effect in effects:
+            self.column(effect)
+
+    @classmethod
+    def from_interlocks(cls, interlocks):
+        """One row per interlock (cause = its Tag No), effects from interlock['Effects']"""
+        matrix = cls()
+        for interlock in interlocks:
+            matrix.add_row(interlock['Tag No'], interlock['Effects'])
+        return matrix
+
+    def column(self, effect):
+        """Column index of an effect tag, interning it on first use"""
+        index = self._columns.get(effect)
+        if index is None:
+            index = self._columns[effect] = len(self.effects)
+            self.effects.append(effect)
+            self._column_rows.append(0)
+        return index
+
+    def add_row(self, cause, effects=()):
+        """Append a row for cause with an X under each effect tag and return its index"""
+        row = len(self._rows)
+        self.causes.append(cause)
+        self._rows.append(0)
+        self._cause_rows.setdefault(cause, []).append(row)
+        for effect in effects:
+            self.mark(row, effect)
+        return row
+
+    def mark(self, row, effect):
+        """Put an X in (row, effect)"""
+        column = self.column(effect)
+        self._rows[row] |= 1 << column
+        self._column_rows[column] |= 1 << row
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def shape(self):
+        """(rows, columns)"""
+        return len(self._rows), len(self.effects)
+
+    def count(self):
+        """Number of X marks"""
+        return sum(bin(bits).count('1') for bits in self._rows)
+
+    def has(self, row, effect):
+        """True if row trips effect"""
+        column = self._columns.get(effect)
+        return column is not None and bool(self._rows[row] >> column & 1)
+
+    def row_columns(self, row):
+        """Column indexes marked in a row, in interning order"""
+        return list(_iter_bits(self._rows[row]))
+
+    def row_effects(self, row):
+        """Effect tags marked in a row"""
+        effects = self.effects
+        return [effects[column] for column in _iter_bits(self._rows[row])]
+
+    def column_rows(self, effect):
+        """Row indexes that trip effect"""
+        column = self._columns.get(effect)
+        if column is None:
+            return []
+        return list(_iter_bits(self._column_rows[column]))
+
+    def effects_of(self, cause):
+        """Every effect tripped by any row of cause"""
+        bits = 0
+        for row in self._cause_rows.get(cause, ()):
+            bits |= self._rows[row]
+        effects = self.effects
+        return [effects[column] for column in _iter_bits(bits)]
+
+    def causes_of(self, effect):
+        """Distinct cause tags that trip effect, in row order"""
+        causes = self.causes
+        return list(dict.fromkeys(causes[row] for row in self.column_rows(effect)))
+
+    def cells(self):
+        """Yield (row, column) for every X, row by row"""
+        for row, bits in enumerate(self._rows):
+            for column in _iter_bits(bits):
+                yield row, column
+
+    def used_effects(self):
+        """Effect tags with at least one X"""
+        return [effect for effect, rows in zip(self.effects, self._column_rows) if rows]
+
+    def _cause_bits(self, columns=None):
+        """cause -> OR of its rows, with columns optionally remapped through a list"""
+        merged = {}
+        for cause, rows in self._cause_rows.items():
+            bits = 0
+            for row in rows:
+                bits |= self._rows[row]
+            if columns is not None:
+                remapped = 0
+                for column in _iter_bits(bits):
+                    remapped |= 1 << columns[column]
+                bits = remapped
+            merged[cause] = bits
+        return merged
+
+    def _combine(self, other, keep_self_only, combine):
+        """Build a one-row-per-cause matrix from this one and other, matching columns by tag"""
+        result = CauseEffectMatrix(self.effects)
+        columns = [result.column(effect) for effect in other.effects]
+        ours = self._cause_bits()
+        theirs = other._cause_bits(columns)
+
+        causes = list(ours) + [cause for cause in theirs if cause not in ours]
+        for cause in causes:
+            if cause in ours and cause in theirs:
+                bits = combine(ours[cause], theirs[cause])
+            elif keep_self_only:
+                bits = ours.get(cause, 0) | theirs.get(cause, 0)
+            else:
+                continue
+            if bits:
+                row = result.add_row(cause)
+                result._rows[row] = bits
+                for column in _iter_bits(bits):
+                    result._column_rows[column] |= 1 << row
+        return result
+
+    def union(self, other):
+        """(cause, effect) pairs present in either matrix - e.g. across PLCs - one row per cause"""
+        return self._combine(other, True, int.__or__)
+
+    def intersection(self, other):
+        """(cause, effect) pairs present in both matrices, one row per cause"""
+        return self._combine(other, False, int.__and__)
+
+    __or__ = union
+    __and__ = intersection
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Indexed Tag Comment Store
+Keeps tag comments on disk as a sorted key index plus a string blob, mmap'd and decoded on lookup
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from collections.abc import Mapping
+
+# File layout (little endian):
+#   header   MAGIC, version, record count, key count, then the offsets of the
+#            index, key blob, text blob and language table
+#   index    one RECORD per (key, language), sorted by key bytes then file order
+#   keys     UTF-8 key bytes, each distinct key stored once
+#   texts    UTF-8 comment bytes
+#   langs    JSON list of language codes; language id 0 is "no language"
+MAGIC = b'RCCMT\x00\x00\x01'
+STORE_VERSION = 1
+HEADER = struct.Struct('<8sIIIQQQQ')
+RECORD = struct.Struct('<QQIHH')         # key offset, text offset, text length, key length, language id
+
+class CommentStoreWriter:
+    """
+    Builds a store file from comments added in any order.
+
+    Comment text is spooled straight to a temporary file; only the keys and
+    offsets are held in memory until close() sorts them and writes the index.
+    For the same key and language the first comment added wins.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._texts = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path)))
+        self._text_size = 0
+        self._entries = []               # (key, order, language id, text offset, text length)
+        self._langs = {None: 0}
+
+    def add(self, key, text, lang=None):
+        """Append one comment for key (lang None = the untranslated comment)"""
+        data = text.encode('utf-8')
+        lang_id = self._langs.setdefault(lang, len(self._langs))
+        self._entries.append((key, len(self._entries), lang_id, self._text_size, len(data)))
+        self._texts.write(data)
+        self._text_size += len(data)
+
+    def close(self, translate=None):
+        """
+        Sort, de-duplicate and write the store; translate, if given, maps each
+        key to its final spelling first (e.g. Logix -> RSLogix 500 addresses).
+        """
+        if translate is None:
+            translate = str
+        entries = self._entries
+        self._entries = []
+        for position, (key, *rest) in enumerate(entries):
+            entries[position] = (translate(key).encode('utf-8'), *rest)
+        entries.sort()
+
+        index = bytearray()
+        keys = bytearray()
+        seen = set()
+        key_count = 0
+        previous = None
+        key_offset = 0
+        for key, _, lang_id, text_offset, text_length in entries:
+            if key != previous:
+                key_offset = len(keys)
+                keys += key
+                key_count += 1
+                previous = key
+            if (key, lang_id) in seen:
+                continue
+            seen.add((key, lang_id))
+            index += RECORD.pack(key_offset, text_offset, text_length, len(key), lang_id)
+
+        langs = json.dumps(sorted(self._langs, key=self._langs.get)).encode('utf-8')
+        index_offset = HEADER.size
+        keys_offset = index_offset + len(index)
+        texts_offset = keys_offset + len(keys)
+        langs_offset = texts_offset + self._text_size
+
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, STORE_VERSION, len(index) // RECORD.size, key_count,
+                                index_offset, keys_offset, texts_offset, langs_offset))
+            f.write(index)
+            f.write(keys)
+            self._texts.seek(0)
+            shutil.copyfileobj(self._texts, f)
+            f.write(langs)
+        self._texts.close()
+        os.replace(temp_path, self.path)
+        return self.path
+
+class CommentStore(Mapping):
+    """
+    Read-only tag -> comment mapping over a store file.
+
+    The file is memory-mapped and lookups bisect the sorted index, so opening
+    a store costs no more than reading its header, and a comment is decoded
+    only when it is looked up. lang selects the preferred language; when a tag
+    has no comment in that language the first one exported is returned, the
+    same rule extract_data_from_l5x() applies. Usable anywhere a
+    tag_descriptions dict is (get, [], in, len, iteration); pickles by path.
+    """
+
+    def __init__(self, path, lang=None):
+        self.path = path
+        self.lang = lang
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f'Not a comment store: {path}')
+        (magic, version, self._count, self._key_count, self._index_offset,
+         self._keys_offset, self._texts_offset, langs_offset) = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != STORE_VERSION:
+            raise ValueError(f'Not a comment store (or another version): {path}')
+        self.languages = json.loads(bytes(self._mm[langs_offset:]).decode('utf-8'))
+        self._lang_ids = {code: index for index, code in enumerate(self.languages)}
+
+    def __reduce__(self):
+        return (CommentStore, (self.path, self.lang))
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _record(self, index):
+        return RECORD.unpack_from(self._mm, self._index_offset + index * RECORD.size)
+
+    def _key_bytes(self, record):
+        start = self._keys_offset + record[0]
+        return self._mm[start:start + record[3]]
+
+    def _text(self, record):
+        start = self._texts_offset + record[1]
+        return self._mm[start:start + record[2]].decode('utf-8')
+
+    def _first(self, key):
+        """Index of the first record for key bytes, or -1"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_bytes(self._record(middle)) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key_bytes(self._record(low)) == key:
+            return low
+        return -1
+
+    def _records(self, key):
+        """Records of one key (one per language), in export order"""
+        index = self._first(key.encode('utf-8'))
+        if index < 0:
+            return
+        first = self._record(index)
+        yield first
+        for index in range(index + 1, self._count):
+            record = self._record(index)
+            if record[0] != first[0]:
+                break
+            yield record
+
+    def get(self, tag, default=None, lang=None):
+        """Comment for tag in lang (default: the store's language), else the first one, else default"""
+        lang = lang if lang is not None else self.lang
+        lang_id = self._lang_ids.get(lang) if lang is not None else None
+        found = None
+        for record in self._records(tag):
+            if found is None:
+                found = record
+                if lang_id is None:
+                    break
+            if record[4] == lang_id:
+                found = record
+                break
+        return self._text(found) if found is not None else default
+
+    def __getitem__(self, tag):
+        text = self.get(tag)
+        if text is None:
+            raise KeyError(tag)
+        return text
+
+    def __contains__(self, tag):
+        return isinstance(tag, str) and self._first(tag.encode('utf-8')) >= 0
+
+    def __len__(self):
+        return self._key_count
+
+    def __iter__(self):
+        previous = None
+        for index in range(self._count):
+            record = self._record(index)
+            if record[0] != previous:
+                previous = record[0]
+                yield self._key_bytes(record).decode('utf-8')
+
+    def translations(self, tag):
+        """{language: comment} for every language tag has a comment in (None = untranslated)"""
+        return {self.languages[record[4]]: self._text(record) for record in self._records(tag)}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Cross Reference
+Inverted index from every address to the rungs that read it, write it, or use it as a timer / counter
+"""
+
+from collections import namedtuple
+from rung_parser import COUNTER_INSTRUCTIONS, OUTPUT_INSTRUCTIONS, TIMER_INSTRUCTIONS, Instruction, rung_ast, rung_label
+from tag_address import address_sort_key, addresses_in, element_of, normalize_address, parse_address
+
+# How an instruction uses its operand
+READ, WRITE, TIMER, COUNTER = 'read', 'write', 'timer', 'counter'
+USES = (READ, WRITE, TIMER, COUNTER)
+
+# Word instructions and the position of the operand they store into; their
+# other data-table operands are reads
+DESTINATION_OPERANDS = {
+    'MOV': 1, 'MVM': 2, 'COP': 1, 'FLL': 1, 'CPT': 0, 'CLR': 0, 'NOT': 1,
+    'ADD': 2, 'SUB': 2, 'MUL': 2, 'DIV': 2, 'AND': 2, 'OR': 2, 'XOR': 2,
+    'NEG': 1, 'ABS': 1, 'SQR': 1, 'TOD': 1, 'FRD': 1, 'DCD': 1, 'ENC': 1,
+    'SCL': 3, 'SCP': 5,
+}
+
+# Instructions whose operands may be expressions (CPT N7:0 N7:5+N7:6, CMP N7:1>N7:2);
+# every address in an expression is a read
+EXPRESSION_INSTRUCTIONS = frozenset(('CPT', 'CMP'))
+
+# Instructions that write their (only) address operand besides the coils
+WRITE_INSTRUCTIONS = frozenset(('RES', 'ONS', 'OSR', 'OSF'))
+
+Reference = namedtuple('Reference', ['rung', 'instruction', 'use'])
+
+class CrossReference:
+    """
+    Where every address is used, built in one pass over the rungs.
+
+    Addresses are keyed by their normalized RSLogix 500 spelling (B3:4/6,
+    T4:16/DN), so a Logix-spelled query (B3[4].6) finds the same entry.
+    references holds each address's Reference(rung, instruction, use) list in
+    program order, and one dict per use maps address -> rungs, so
+    readers() / writers() / timer_uses() / counter_uses() are single dict
+    lookups. The same pass records OTE coils written by more than one OTE
+    (the last one scanned wins - the others are dead) and, given the tag
+    descriptions, commented tags no rung references.
+
+    Example:
+        xref = CrossReference(rungs, tag_descriptions)
+        xref.writers('B3:4/6')     -> ['MainRoutine:0045']
+        xref.duplicate_coils       -> {'B3:2/0': ['MainRoutine:0012', 'Alarms:0003']}
+
+    Rungs are labelled with their routine / program file (rung_label()),
+    since rung numbers restart in each one.
+    """
+
+    def __init__(self, rungs, tag_descriptions=None):
+        self.references = {}             # address -> [Reference] in program order
+        self._by_use = {use: {} for use in USES}
+        self.duplicate_coils = {}        # address -> rungs of its OTEs, when more than one
+        coils = {}                       # address -> rungs of its OTEs
+
+        for rung in rungs:
+            number = rung_label(rung)
+            for mnemonic, address, use in _uses(rung_ast(rung)):
+                self.references.setdefault(address, []).append(Reference(number, mnemonic, use))
+                rung_numbers = self._by_use[use].setdefault(address, [])
+                if not rung_numbers or rung_numbers[-1] != number:
+                    rung_numbers.append(number)
+                if mnemonic == 'OTE':
+                    # Two coils of the same address in one rung are one location
+                    locations = coils.setdefault(address, [])
+                    if not locations or locations[-1] != number:
+                        locations.append(number)
+                        if len(locations) == 2:
+                            self.duplicate_coils[address] = locations
+
+        # Status bits and words count as references to their element (T4:16/DN -> T4:16)
+        referenced = set(self.references)
+        referenced.update(element_of(address) for address in self.references)
+        referenced.update(str(parsed.element) for parsed in map(parse_address, self.references) if parsed is not None)
+        self.unused = sorted((tag for tag in (tag_descriptions or ()) if normalize_address(tag) not in referenced),
+                             key=address_sort_key)
+
+    def __len__(self):
+        return len(self.references)
+
+    def __contains__(self, address):
+        return normalize_address(address) in self.references
+
+    def where_used(self, address):
+        """Every Reference to address, in program order"""
+        return self.references.get(normalize_address(address), [])
+
+    def rungs(self, address, use):
+        """Rung numbers that use address as use (READ / WRITE / TIMER / COUNTER)"""
+        return self._by_use[use].get(normalize_address(address), [])
+
+    def readers(self, address):
+        return self.rungs(address, READ)
+
+    def writers(self, address):
+        return self.rungs(address, WRITE)
+
+    def timer_uses(self, address):
+        return self.rungs(address, TIMER)
+
+    def counter_uses(self, address):
+        return self.rungs(address, COUNTER)
+
+    def addresses(self):
+        """Every referenced address in address order"""
+        return sorted(self.references, key=address_sort_key)
+
+def _uses(nodes):
+    """Yield (mnemonic, address, use) for every data-table operand in a rung's instruction tree"""
+    for node in nodes:
+        if type(node) is not Instruction:
+            for leg in node.legs:
+                yield from _uses(leg)
+            continue
+        mnemonic, operands = node
+        if not operands:
+            continue
+        if mnemonic in ('XIC', 'XIO'):
+            yield mnemonic, operands[0], READ
+        elif mnemonic in OUTPUT_INSTRUCTIONS or mnemonic in WRITE_INSTRUCTIONS:
+            yield mnemonic, operands[0], WRITE
+        elif mnemonic in TIMER_INSTRUCTIONS:
+            yield mnemonic, operands[0], TIMER
+        elif mnemonic in COUNTER_INSTRUCTIONS:
+            yield mnemonic, operands[0], COUNTER
+        else:
+            destination = DESTINATION_OPERANDS.get(mnemonic)
+            for position, operand in enumerate(operands):
+                if parse_address(operand) is not None:
+                    yield mnemonic, operand, WRITE if position == destination else READ
+                elif mnemonic in EXPRESSION_INSTRUCTIONS:
+                    for address in addresses_in(operand):
+                        yield mnemonic, address, READ
+                # Literals are not addresses
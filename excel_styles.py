@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Shared Excel Cell Styles
+Font / fill / border / alignment sets for the template outputs, resolved once per workbook and applied to cells
+"""
+
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles.cell_style import StyleArray
+
+class CellStyle:
+    """
+    Cell attributes to set, like assigning cell.font / .fill / .border /
+    .alignment in turn: an attribute left as None keeps the cell's own (the
+    template's number format, fill, wrap ... stay as they are).
+    """
+    __slots__ = ('font', 'fill', 'border', 'alignment')
+
+    def __init__(self, font=None, fill=None, border=None, alignment=None):
+        self.font = font
+        self.fill = fill
+        self.border = border
+        self.alignment = alignment
+
+    def attributes(self):
+        """(StyleArray key, workbook table, value) of each attribute set"""
+        return [(key, table, value) for key, table, value in (
+            ('fontId', '_fonts', self.font), ('fillId', '_fills', self.fill),
+            ('borderId', '_borders', self.border), ('alignmentId', '_alignments', self.alignment),
+        ) if value is not None]
+
+_THIN = Side(style='thin')
+_THICK = Side(style='thick')
+THIN_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+# Template data area: size 8 black text
+_DATA_FONT = Font(size=8, color='000000')
+_BOLD_FONT = Font(size=8, bold=True, color='000000')
+_GREY_FILL = PatternFill(start_color='C0C0C0', end_color='C0C0C0', fill_type='solid')
+_LEFT = Alignment(horizontal='left', vertical='center')
+_CENTER = Alignment(horizontal='center', vertical='center')
+_CENTER_WRAP = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+STYLE_DATA = CellStyle(font=_DATA_FONT, border=THIN_BORDER)
+STYLE_DATA_LEFT = CellStyle(font=_DATA_FONT, border=THIN_BORDER, alignment=_LEFT)
+STYLE_DATA_CENTER = CellStyle(font=_DATA_FONT, border=THIN_BORDER, alignment=_CENTER)
+STYLE_DATA_WRAP = CellStyle(font=_DATA_FONT, border=THIN_BORDER, alignment=_CENTER_WRAP)
+STYLE_X_MARK = CellStyle(font=_BOLD_FONT, border=THIN_BORDER, alignment=_CENTER)
+# Discrete alarms have no HH / H / L / LL setpoints - those columns are greyed out
+STYLE_DISCRETE = CellStyle(font=_DATA_FONT, fill=_GREY_FILL, border=THIN_BORDER, alignment=_CENTER)
+# Border only: the right halves of merges and empty padding rows
+STYLE_BORDERED = CellStyle(border=THIN_BORDER)
+STYLE_BORDERED_DISCRETE = CellStyle(fill=_GREY_FILL, border=THIN_BORDER)
+STYLE_HEADER_THICK = CellStyle(border=Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THICK))
+STYLE_HEADER_THICK_BOXED = CellStyle(border=Border(left=_THIN, right=_THIN, top=_THICK, bottom=_THICK))
+# Cells right of the printable area: no border
+STYLE_BLANK = CellStyle(border=Border())
+
+class WorkbookStyles:
+    """
+    CellStyles resolved against one workbook's style tables.
+
+    apply(cell, style) does what setting cell.font, cell.border, ... does,
+    except that each style's table indices are looked up once per workbook
+    instead of hashing the Font / Border objects again for every cell.
+    """
+
+    def __init__(self, wb):
+        self.wb = wb
+        self._ids = {}                   # CellStyle -> ((StyleArray key, index), ...)
+
+    def ids(self, style):
+        ids = self._ids.get(style)
+        if ids is None:
+            ids = self._ids[style] = tuple(
+                (key, getattr(self.wb, table).add(value)) for key, table, value in style.attributes())
+        return ids
+
+    def apply(self, cell, style):
+        """Set style's attributes on cell, keeping the others; returns the cell"""
+        cell_style = cell._style
+        if not cell_style:
+            # A MergedCell has no format of its own until one is set
+            cell_style = cell._style = StyleArray()
+        for key, index in self.ids(style):
+            setattr(cell_style, key, index)
+        return cell
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Studio 5000 L5K Streaming Parser
+Reads tag comments and rung text from full-project .L5K text exports one line at a time
+"""
+
+import re
+from l5x_parser import DataTypeMember, RungText, TagComment, TagDefinition, program_from_records
+
+# Keywords whose header line ends without ';' - a block opens or closes there
+BLOCK_KEYWORDS = frozenset((
+    'CONTROLLER', 'DATATYPE', 'MODULE', 'ADD_ON_INSTRUCTION_DEFINITION', 'PARAMETERS', 'LOCAL_TAGS', 'TAG',
+    'PROGRAM', 'ROUTINE', 'FBD_ROUTINE', 'SFC_ROUTINE', 'ST_ROUTINE', 'TASK', 'CONFIG', 'TREND', 'QUICK_WATCH',
+    'CONNECTION', 'ENCODED_DATA', 'SHEET', 'EXTENDED_PROPERTIES',
+))
+
+# Characters that change the scanner state outside / inside string literals
+_SPECIAL_RE = re.compile(r'''[$"'();:*]''')
+_QUOTED_RE = re.compile(r'''[$"']''')
+_FIRST_WORD_RE = re.compile(r'\s*(\w+)')
+_BLOCK_NAME_RE = re.compile(r'\s*\w+\s+(\w+)')
+
+# name : TYPE[dims] (...) / name OF target (...)
+_TAG_RE = re.compile(r'(\w+)\s*(?::\s*(\w+)\s*(?:\[([\d,\s]+)\])?|\s+OF\s+([^\s(;]+))')
+# TYPE name[dim] (...) inside a DATATYPE
+_MEMBER_RE = re.compile(r'(\w+)\s+(\w+)\s*(?:\[(\d+)\])?')
+# Description := "..." and COMMENT<operand> := "...", each value possibly split into adjacent literals
+_COMMENT_RE = re.compile(r'''\b(Description|COMMENT([^\s:=]*))\s*:=\s*((?:"(?:[^"$]|\$.)*"\s*)+)''', re.IGNORECASE)
+_LITERAL_RE = re.compile(r'"((?:[^"$]|\$.)*)"')
+_ESCAPE_RE = re.compile(r'\$([0-9A-Fa-f]{2}|.)')
+_ESCAPES = {'N': '\n', 'L': '\n', 'R': '\r', 'T': '\t', 'P': '\f'}
+
+def _unescape(match):
+    code = match.group(1)
+    if len(code) == 2:
+        return chr(int(code, 16))
+    return _ESCAPES.get(code.upper(), code)
+
+def _string_value(literals):
+    """Text of one or more adjacent "..." literals with $ escapes decoded"""
+    return ''.join(_ESCAPE_RE.sub(_unescape, body) for body in _LITERAL_RE.findall(literals))
+
+def iter_l5k_statements(lines):
+    """
+    Yield the statements of an L5K file: everything up to a ';' outside string
+    literals and parentheses, or a block header / END_ line.
+
+    Lines are scanned once with a regex that only stops on the few characters
+    that matter (quotes, parentheses, ':', ';', '(*' comments). A ':=' at the
+    top level starts a value (tag initial data, module config) that is dropped
+    as it is read, so a tag holding a 100,000-element array costs no memory.
+    """
+    parts = []
+    quote = None         # open string delimiter
+    depth = 0            # parenthesis depth
+    comment = False      # inside (* ... *)
+    value = False        # dropping a top-level := value
+    for line in lines:
+        if not (quote or comment or value or depth):
+            match = _FIRST_WORD_RE.match(line)
+            word = match.group(1) if match else ''
+            if word in BLOCK_KEYWORDS or word.startswith('END_'):
+                # A header never continues a statement (encoded data, ST code)
+                statement = ''.join(parts).strip()
+                if statement:
+                    yield statement
+                parts = []
+        keep = pos = 0
+        while True:
+            match = (_QUOTED_RE if quote else _SPECIAL_RE).search(line, pos)
+            if match is None:
+                break
+            index = match.start()
+            char = line[index]
+            pos = index + 1
+            if comment:
+                if char == '*' and line.startswith(')', pos):
+                    comment = False
+                    keep = pos = pos + 1
+            elif quote:
+                if char == '$':
+                    pos += 1
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '(':
+                if line.startswith('*', pos):
+                    if not value:
+                        parts.append(line[keep:index])
+                    comment = True
+                    pos += 1
+                else:
+                    depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ':' and not depth and not value and line.startswith('=', pos):
+                parts.append(line[keep:index])
+                value = True
+            elif char == ';' and not depth:
+                if not value:
+                    parts.append(line[keep:pos])
+                statement = ''.join(parts).strip()
+                if statement:
+                    yield statement
+                parts = []
+                value = False
+                keep = pos
+        if not (comment or value):
+            parts.append(line[keep:])
+        if parts and not (quote or comment or value or depth):
+            statement = ''.join(parts).strip()
+            match = _FIRST_WORD_RE.match(statement)
+            word = match.group(1) if match else ''
+            if word in BLOCK_KEYWORDS or word.startswith('END_'):
+                yield statement
+                parts = []
+    statement = ''.join(parts).strip()
+    if statement:
+        yield statement
+
+def iter_l5k_records(l5k_file):
+    """
+    Stream an L5K export and yield the records iter_l5x_records() yields for an L5X.
+
+    Only the current statement is held in memory; rungs of RLL routines are
+    numbered from 0 per routine, and routines inside Add-On Instruction
+    definitions (which address their own parameters) are skipped.
+
+    Yields:
+        DataTypeMember for every DATATYPE member; TagDefinition for every
+        controller / program tag; TagComment for its Description and every
+        COMMENT<operand>; RungText for every N: rung (with the RC: comment
+        before it)
+    """
+    with open(l5k_file, encoding='utf-8-sig', errors='replace') as f:
+        data_type = None
+        routine = None
+        in_tags = False
+        in_add_on = False
+        number = 0
+        rung_comment = ''
+        for statement in iter_l5k_statements(f):
+            match = _FIRST_WORD_RE.match(statement)
+            word = match.group(1) if match else ''
+            if word == 'DATATYPE':
+                data_type = _BLOCK_NAME_RE.match(statement).group(1)
+            elif word == 'END_DATATYPE':
+                data_type = None
+            elif word == 'TAG':
+                in_tags = not in_add_on
+            elif word == 'END_TAG':
+                in_tags = False
+            elif word == 'ROUTINE':
+                routine = None if in_add_on else _BLOCK_NAME_RE.match(statement).group(1)
+                number = 0
+                rung_comment = ''
+            elif word == 'END_ROUTINE':
+                routine = None
+            elif word == 'ADD_ON_INSTRUCTION_DEFINITION':
+                in_add_on = True
+            elif word == 'END_ADD_ON_INSTRUCTION_DEFINITION':
+                in_add_on = False
+            elif routine is not None:
+                if word == 'RC':
+                    rung_comment = _string_value(statement)
+                elif word == 'N':
+                    # A long rung wraps over several indented lines
+                    text = ' '.join(statement.split(':', 1)[1].split())
+                    yield RungText(routine, number, text, rung_comment)
+                    number += 1
+                    rung_comment = ''
+            elif data_type is not None:
+                match = _MEMBER_RE.match(statement)
+                if match:
+                    member_type, name, dimension = match.groups()
+                    yield DataTypeMember(data_type, name, member_type, int(dimension or 0))
+            elif in_tags:
+                match = _TAG_RE.match(statement)
+                if match is None:
+                    continue
+                name, tag_type, dimensions, alias_for = match.groups()
+                yield TagDefinition(name, tag_type, ' '.join((dimensions or '').replace(',', ' ').split()),
+                                    alias_for)
+                for comment in _COMMENT_RE.finditer(statement):
+                    key, operand, literals = comment.groups()
+                    text = _string_value(literals).strip()
+                    if not text:
+                        continue
+                    if key.lower() == 'description':
+                        yield TagComment(name, name, '', text, None)
+                    else:
+                        operand = operand[1:] if operand.startswith('.[') else operand
+                        yield TagComment(name + operand, name, operand, text, None)
+
+def extract_data_from_l5k(l5k_file, translate=True, comment_store=None):
+    """
+    Extract ladder rungs and tag descriptions from a Studio 5000 L5K export.
+
+    Same result as extract_data_from_l5x() for the same project: records are
+    streamed through program_from_records(), with translate and
+    comment_store as there (L5K comments carry no language).
+    """
+    return program_from_records(iter_l5k_records(l5k_file), None, translate, comment_store)
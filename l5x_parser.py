@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Studio 5000 L5X Streaming Parser
+Reads tag comments and rung text from .L5X exports without building a DOM
+"""
+
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from address_map import AddressMap
+from comment_store import CommentStore, CommentStoreWriter
+from rung_parser import rung_from_text
+
+# Records yielded by iter_l5x_records()
+TagComment = namedtuple('TagComment', ['address', 'tag', 'operand', 'description', 'lang'])
+RungText = namedtuple('RungText', ['routine', 'number', 'text', 'comment'])
+DataTypeMember = namedtuple('DataTypeMember', ['data_type', 'name', 'member_type', 'dimension'])
+TagDefinition = namedtuple('TagDefinition', ['name', 'data_type', 'dimensions', 'alias_for'])
+
+def _strip_ns(tag):
+    """Drop any '{namespace}' prefix from an element tag"""
+    return tag.rsplit('}', 1)[-1]
+
+def iter_l5x_records(l5x_file):
+    """
+    Stream an L5X export and yield TagComment and RungText records in file order.
+
+    The file is read with ElementTree.iterparse and every element is detached
+    from its parent as soon as it has been consumed, so peak memory depends on
+    the nesting depth of the XML rather than on the size of the export.
+
+    Args:
+        l5x_file: path (or binary file object) of the .L5X export
+
+    Yields:
+        DataTypeMember for every <DataType>/<Members>/<Member>; TagDefinition
+        for every <Tag>; TagComment for every <Tag>/<Comments>/<Comment
+        Operand=...> (one per language when the export carries localized
+        comments), plus one for a tag-level <Description>; RungText for every
+        <Rung> with its <Text>
+    """
+    stack = []
+    data_type_name = None
+    tag_name = None
+    routine_name = None
+    operand = None
+    rung_number = None
+    rung_text = ''
+    rung_comment = ''
+    in_rung = False
+
+    for event, elem in ET.iterparse(l5x_file, events=('start', 'end')):
+        name = _strip_ns(elem.tag)
+
+        if event == 'start':
+            if name == 'Tag':
+                tag_name = elem.get('Name')
+                yield TagDefinition(tag_name, elem.get('DataType'), elem.get('Dimensions', ''),
+                                    elem.get('AliasFor'))
+            elif name == 'DataType':
+                data_type_name = elem.get('Name')
+            elif name == 'Member' and data_type_name is not None:
+                yield DataTypeMember(data_type_name, elem.get('Name'), elem.get('DataType'),
+                                     int(elem.get('Dimension', 0)))
+            elif name == 'Routine':
+                routine_name = elem.get('Name')
+            elif name == 'Comment' and tag_name is not None and not in_rung:
+                operand = elem.get('Operand', '')
+            elif name == 'Rung':
+                in_rung = True
+                rung_number = int(elem.get('Number', 0))
+                rung_text = ''
+                rung_comment = ''
+            stack.append(elem)
+            continue
+
+        # 'end' event - element text is complete here
+        stack.pop()
+        text = (elem.text or '').strip()
+
+        if name == 'Comment' and operand is not None and not in_rung:
+            if text:
+                yield TagComment(tag_name + operand, tag_name, operand, text, None)
+            operand = None
+        elif name == 'LocalizedComment' and operand is not None and not in_rung:
+            if text:
+                yield TagComment(tag_name + operand, tag_name, operand, text, elem.get('Lang'))
+        elif name in ('Description', 'LocalizedDescription') and tag_name is not None and not in_rung:
+            # Only tag-level descriptions (direct children of <Tag>)
+            parent = _strip_ns(stack[-1].tag) if stack else ''
+            if text and (parent == 'Tag' or (parent == 'Description' and name == 'LocalizedDescription')):
+                yield TagComment(tag_name, tag_name, '', text, elem.get('Lang'))
+        elif name == 'Tag':
+            tag_name = None
+        elif name == 'DataType':
+            data_type_name = None
+        elif in_rung and name == 'Text':
+            rung_text = text
+        elif in_rung and name in ('Comment', 'LocalizedComment'):
+            if text and not rung_comment:
+                rung_comment = text
+        elif name == 'Rung':
+            in_rung = False
+            yield RungText(routine_name, rung_number, rung_text, rung_comment)
+        elif name == 'Routine':
+            routine_name = None
+
+        # Detach the consumed element so the tree never grows
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+def _translate_rung(rung, translate):
+    """Rewrite a rung's operands in place with translate()"""
+    rung['inputs'] = [translate(tag) for tag in rung['inputs']]
+    rung['outputs'] = [translate(tag) for tag in rung['outputs']]
+    for key in ('timer', 'counter'):
+        if key in rung:
+            rung[key] = translate(rung[key])
+
+def extract_data_from_l5x(l5x_file, lang=None, translate=True, comment_store=None):
+    """
+    Extract ladder rungs and tag descriptions from a Studio 5000 L5X export.
+
+    Args:
+        l5x_file: path of the .L5X export
+        lang: preferred comment language (e.g. 'en-US'); the first language
+              seen for an operand is used when the preferred one is missing
+        translate: rewrite addresses of a converted SLC program in RSLogix 500
+                   form (SLOT00_..._Placeholder.I[0].1 -> I:0/1, B3[0].4 -> B3:0/4)
+                   using the export's placeholder UDTs, so the result keys
+                   match a PDF parse of the same PLC; rung 'text' is kept as is
+        comment_store: path of a comment store file (comment_store.py) to
+                       write every comment, in every language, to instead of
+                       a dict; tag_descriptions is then a CommentStore over it
+
+    Returns:
+        (rungs, tag_descriptions) in the same structures as extract_data_from_pdf()
+    """
+    return program_from_records(iter_l5x_records(l5x_file), lang, translate, comment_store)
+
+def program_from_records(records, lang=None, translate=True, comment_store=None):
+    """
+    (rungs, tag_descriptions) from a stream of TagComment / RungText /
+    TagDefinition / DataTypeMember records (any export format); the arguments
+    are those of extract_data_from_l5x()
+    """
+    rungs = []
+    tag_descriptions = {}
+    preferred = set()
+    address_map = AddressMap()
+    writer = CommentStoreWriter(comment_store) if comment_store else None
+
+    for record in records:
+        if isinstance(record, RungText):
+            rungs.append(rung_from_text(record.number, record.text, record.comment, record.routine))
+        elif isinstance(record, TagDefinition):
+            address_map.add_tag(record.name, record.data_type, record.alias_for)
+        elif isinstance(record, DataTypeMember):
+            address_map.add_member(record.data_type, record.name, record.dimension)
+        elif writer is not None:
+            writer.add(record.address, record.description, record.lang)
+        elif record.address not in tag_descriptions:
+            tag_descriptions[record.address] = record.description
+            if lang is not None and record.lang == lang:
+                preferred.add(record.address)
+        elif lang is not None and record.lang == lang and record.address not in preferred:
+            tag_descriptions[record.address] = record.description
+            preferred.add(record.address)
+
+    if writer is not None:
+        writer.close(address_map.translate if translate else None)
+        tag_descriptions = CommentStore(comment_store, lang)
+
+    if translate:
+        # Tags may be defined after the aliases that point at them, so the
+        # table is only complete once the whole export has been read
+        if writer is None:
+            translated = {}
+            for address, description in tag_descriptions.items():
+                translated.setdefault(address_map.translate(address), description)
+            tag_descriptions = translated
+        for rung in rungs:
+            _translate_rung(rung, address_map.translate)
+
+    return rungs, tag_descriptions
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Ladder Logic Simulator
+Compiles a program's rungs into Python functions that scan thousands of input scenarios at once, one bit per scenario
+"""
+
+from itertools import combinations
+from rung_parser import COUNTER_INSTRUCTIONS, OUTPUT_INSTRUCTIONS, TIMER_INSTRUCTIONS, Instruction, rung_ast
+from tag_address import status_bit
+
+# Scans run until no tag changes (seal-ins, latches and rungs that read bits
+# written further down settle within a few); a tag still changing after this
+# many scans is reported as unsettled (an oscillating rung)
+MAX_SCANS = 64
+
+# Scenarios per simulator run in fault_sweep() - every tag's state is an int of this many bits
+BATCH_SIZE = 4096
+
+# Rungs per generated scan function (one huge function compiles slowly)
+RUNGS_PER_FUNCTION = 256
+
+class _ScanCompiler:
+    """Generates the Python source of the scan functions, one statement per instruction"""
+
+    def __init__(self, index):
+        self.index = index               # tag -> state slot
+        self.written = set()             # slots the logic assigns
+        self.lines = []
+        self.temps = 0
+
+    def slot(self, tag, written=False):
+        position = self.index.get(tag)
+        if position is None:
+            position = self.index[tag] = len(self.index)
+        if written:
+            self.written.add(position)
+        return f's[{position}]'
+
+    def temp(self, expression):
+        """A name holding expression (expressions used more than once are evaluated once)"""
+        if expression in ('A', '0') or expression.startswith('t') and expression[1:].isdigit():
+            return expression
+        name = f't{self.temps}'
+        self.temps += 1
+        self.lines.append(f'    {name} = {expression}')
+        return name
+
+    def series(self, nodes, condition):
+        """Emit nodes in series after condition; returns the condition they leave"""
+        for node in nodes:
+            if type(node) is not Instruction:
+                start = self.temp(condition)
+                legs = [self.temp(self.series(leg, start)) for leg in node.legs]
+                condition = self.temp('(' + ' | '.join(legs) + ')') if len(legs) > 1 else legs[0]
+            else:
+                condition = self.instruction(node, condition)
+        return condition
+
+    def instruction(self, node, condition):
+        mnemonic, operands = node
+        emit = self.lines.append
+        if mnemonic == 'XIC':
+            bit = self.slot(operands[0])
+            return bit if condition == 'A' else f'{condition} & {bit}'
+        if mnemonic == 'XIO':
+            bit = self.slot(operands[0])
+            return f'(A ^ {bit})' if condition == 'A' else f'{condition} & ~{bit}'
+        if mnemonic == 'AFI':
+            return '0'
+        if mnemonic in ('ONS', 'OSR', 'OSF') and operands:
+            condition = self.temp(condition)
+            storage = self.slot(operands[0], True)
+            edge = f'{storage} & ~{condition}' if mnemonic == 'OSF' else f'{condition} & ~{storage}'
+            if mnemonic == 'ONS':
+                result = self.temp(edge)
+                emit(f'    {storage} = {condition}')
+                return result
+            if len(operands) > 1:
+                emit(f'    {self.slot(operands[1], True)} = {edge}')
+            emit(f'    {storage} = {condition}')
+            return condition
+
+        if mnemonic in OUTPUT_INSTRUCTIONS:
+            condition = self.temp(condition)
+            bit = self.slot(operands[0], True)
+            if mnemonic == 'OTE':
+                emit(f'    {bit} = {condition}')
+            elif mnemonic == 'OTL':
+                emit(f'    {bit} |= {condition}')
+            else:
+                emit(f'    {bit} &= ~{condition}')
+        elif mnemonic in TIMER_INSTRUCTIONS and operands:
+            # Timers are taken as timed out: done follows the rung (RTO holds it)
+            condition = self.temp(condition)
+            emit(f'    {self.slot(status_bit(operands[0], "EN"), True)} = {condition}')
+            done = self.slot(status_bit(operands[0], 'DN'), True)
+            emit(f'    {done} |= {condition}' if mnemonic == 'RTO' else f'    {done} = {condition}')
+        elif mnemonic in COUNTER_INSTRUCTIONS and operands:
+            # The count is not tracked; the done bit is left to the scenario
+            condition = self.temp(condition)
+            emit(f'    {self.slot(status_bit(operands[0], "CU" if mnemonic == "CTU" else "CD"), True)} = {condition}')
+        elif mnemonic == 'RES' and operands:
+            condition = self.temp(condition)
+            emit(f'    {self.slot(status_bit(operands[0], "DN"), True)} &= ~{condition}')
+        # Everything else compares or moves data values the simulator does not
+        # track (EQU, LIM, MOV, COP, MSG, ...) and passes the condition on
+        return condition
+
+    def function(self, name, asts):
+        self.lines = [f'def {name}(s, A):']
+        self.temps = 0
+        for ast in asts:
+            self.series(ast, 'A')
+        self.lines.append('    return None')
+        return '\n'.join(self.lines)
+
+class LadderSimulator:
+    """
+    Bit-parallel simulator of one program.
+
+    Every tag's state is one Python int holding a bit per scenario, so a rung
+    is evaluated for every scenario of a batch with a handful of big-int
+    operations: XIC is AND, XIO is AND NOT, a branch is OR of its legs, OTE
+    stores the rung condition, OTL / OTU set / clear. The rungs are compiled
+    once into straight-line Python functions (no per-instruction dispatch);
+    each run scans them in program order until no tag changes, so seal-ins
+    and latches settle. Timers are taken as timed out (DN follows the rung),
+    counter done bits and data comparisons are not modelled (comparisons pass
+    the rung condition through).
+    """
+
+    def __init__(self, rungs):
+        self.rungs = len(rungs)
+        asts = [rung_ast(rung) for rung in rungs]
+        self.index = {}                  # tag -> position in the state list
+        compiler = _ScanCompiler(self.index)
+        sources = [
+            compiler.function(f'_scan{number}', asts[start:start + RUNGS_PER_FUNCTION])
+            for number, start in enumerate(range(0, len(asts), RUNGS_PER_FUNCTION))
+        ]
+        namespace = {}
+        exec(compile('\n\n'.join(sources), '<ladder scan>', 'exec'), namespace)
+        self._functions = [namespace[f'_scan{number}'] for number in range(len(sources))]
+
+        self.tags = sorted(self.index, key=self.index.get)
+        # Only tags the logic writes can change from one scan to the next
+        self._written = sorted(compiler.written)
+        self.inputs = [tag for tag in self.tags if self.index[tag] not in compiler.written]
+
+    def run_masks(self, masks, count, max_scans=MAX_SCANS):
+        """
+        Simulate count scenarios given as {tag: int} - bit k set when the tag
+        is on in scenario k before the first scan. Tags the logic never writes
+        (inputs) keep their value; the others start there and follow the rungs.
+        """
+        everything = (1 << count) - 1
+        state = [0] * len(self.index)
+        for tag, mask in masks.items():
+            position = self.index.get(tag)
+            if position is not None:
+                state[position] = mask & everything
+        written = self._written
+        previous = [state[position] for position in written]
+        earlier = None
+        changes = {}
+        scans = 0
+        while scans < max_scans:
+            for function in self._functions:
+                function(state, everything)
+            scans += 1
+            current = [state[position] for position in written]
+            changes = {position: new ^ old for position, new, old in zip(written, current, previous) if new != old}
+            # Settled, or every change undoes the one before (a self-resetting
+            # timer, a flasher): scanning longer changes nothing else
+            if not changes or current == earlier:
+                break
+            previous, earlier = current, previous
+        return SimulationResult(self, state, count, scans, changes)
+
+    def run(self, scenarios, base=None, max_scans=MAX_SCANS):
+        """
+        Simulate a list of scenarios, each {tag: bool}; tags a scenario leaves
+        out take their value from base ({tag: bool}, default all off).
+        """
+        count = len(scenarios)
+        everything = (1 << count) - 1
+        masks = {tag: everything for tag, on in (base or {}).items() if on}
+        for number, scenario in enumerate(scenarios):
+            bit = 1 << number
+            for tag, on in scenario.items():
+                masks[tag] = masks.get(tag, 0) | bit if on else masks.get(tag, 0) & ~bit
+        return self.run_masks(masks, count, max_scans)
+
+class SimulationResult:
+    """Final tag states of one batch of scenarios"""
+
+    def __init__(self, simulator, state, count, scans, changes):
+        self._index = simulator.index
+        self._state = state
+        self.count = count
+        self.scans = scans
+        self._changes = changes          # position -> scenarios where the last scan changed it
+
+    def mask(self, tag):
+        """Bit k set when tag ends up on in scenario k"""
+        position = self._index.get(tag)
+        return self._state[position] if position is not None else 0
+
+    def is_on(self, tag, scenario):
+        return bool(self.mask(tag) >> scenario & 1)
+
+    def energized(self, scenario, tags):
+        """The tags among tags that are on in one scenario"""
+        return [tag for tag in tags if self.mask(tag) >> scenario & 1]
+
+    def unsettled(self, tags=None):
+        """Scenarios in which tags (default: any tag) still changed on the last scan - oscillating logic"""
+        if tags is None:
+            positions = self._changes
+        else:
+            positions = [self._index[tag] for tag in tags if tag in self._index]
+        mask = 0
+        for position in positions:
+            mask |= self._changes.get(position, 0)
+        return _bits(mask)
+
+def _bits(mask):
+    """Positions of the set bits of an int, lowest first"""
+    found = []
+    while mask:
+        low = mask & -mask
+        found.append(low.bit_length() - 1)
+        mask ^= low
+    return found
+
+def fault_sweep(simulator, causes, effects, base=None, pairs=False, groups=(), batch_size=BATCH_SIZE,
+                max_scans=MAX_SCANS):
+    """
+    Assert every cause on its own (and, with pairs=True, every two causes, and
+    every tuple of causes in groups together) and report the effects that
+    change state.
+
+    Asserting a cause flips it from its base value (default off), so
+    normally-closed devices examined with XIO count too. Scenario 0 is the
+    base state itself. Pair results list only effects neither cause changes
+    on its own - the ones behind AND / voting logic.
+
+    Returns:
+        {'baseline': {effect: bool}, 'single': {cause: [effects]},
+         'pairs': {(cause, cause): [effects]}, 'groups': {causes: [effects]},
+         'unsettled': [scenario descriptions]}
+    """
+    base = base or {}
+    causes = list(dict.fromkeys(causes))
+    effects = list(dict.fromkeys(effects))
+    scenarios = [()] + [(cause,) for cause in causes]
+    if pairs:
+        scenarios += list(combinations(causes, 2))
+    first_group = len(scenarios)
+    scenarios += dict.fromkeys(tuple(group) for group in groups)
+
+    report = {'baseline': {}, 'single': {}, 'pairs': {}, 'groups': {}, 'unsettled': []}
+    baseline = None
+    for start in range(0, len(scenarios), batch_size):
+        batch = scenarios[start:start + batch_size]
+        everything = (1 << len(batch)) - 1
+        masks = {tag: everything for tag, on in base.items() if on}
+        for number, flipped in enumerate(batch):
+            for tag in flipped:
+                masks[tag] = masks.get(tag, 0) ^ (1 << number)
+        result = simulator.run_masks(masks, len(batch), max_scans)
+        if baseline is None:
+            baseline = {effect: result.is_on(effect, 0) for effect in effects}
+            report['baseline'] = baseline
+
+        changed = {}
+        for effect in effects:
+            mask = result.mask(effect) ^ (everything if baseline[effect] else 0)
+            for number in _bits(mask):
+                changed.setdefault(number, []).append(effect)
+        for number, flipped in enumerate(batch):
+            if start + number >= first_group:
+                report['groups'][flipped] = changed.get(number, [])
+            elif len(flipped) == 1:
+                report['single'][flipped[0]] = changed.get(number, [])
+            elif len(flipped) == 2:
+                alone = set(report['single'].get(flipped[0], ())) | set(report['single'].get(flipped[1], ()))
+                extra = [effect for effect in changed.get(number, ()) if effect not in alone]
+                if extra:
+                    report['pairs'][flipped] = extra
+        report['unsettled'].extend(' + '.join(batch[number]) or 'base' for number in result.unsettled(effects))
+    return report
+
+def verify_interlocks(rungs, interlocks, base=None, pairs=False, simulator=None):
+    """
+    Check a cause & effect matrix against the logic: simulate each interlock's
+    cause (Tag No) and compare the effects that change with its X marks. A
+    voting row ('Vote': k, from build_transitive_interlocks(voting=True))
+    asserts the first k of its 'All Inputs' together instead.
+
+    Returns:
+        One dict per interlock: 'Interlock No', 'Tag No', 'Rung', 'confirmed' (marked
+        and driven), 'missing' (marked, not driven by this cause alone) and,
+        with pairs=True, 'with_second_cause' ({missing effect: [other causes
+        that drive it together with this one]}); plus, per cause, the effects
+        of other interlocks it also drives under 'unmarked'.
+    """
+    simulator = simulator or LadderSimulator(rungs)
+    votes = {id(interlock): tuple(interlock['All Inputs'][:interlock['Vote']])
+             for interlock in interlocks if interlock.get('Vote')}
+    causes = [interlock['Tag No'] for interlock in interlocks if interlock['Tag No'] and id(interlock) not in votes]
+    effects = list(dict.fromkeys(effect for interlock in interlocks for effect in interlock['Effects']))
+    report = fault_sweep(simulator, causes, effects, base, pairs, votes.values())
+
+    marked_by_cause = {}
+    for interlock in interlocks:
+        marked_by_cause.setdefault(interlock['Tag No'], set()).update(interlock['Effects'])
+    partners = {}
+    for (first, second), driven in report['pairs'].items():
+        for effect in driven:
+            partners.setdefault((first, effect), []).append(second)
+            partners.setdefault((second, effect), []).append(first)
+
+    results = []
+    for interlock in interlocks:
+        cause = interlock['Tag No']
+        vote = votes.get(id(interlock))
+        changes = report['groups'][vote] if vote else report['single'].get(cause, ())
+        driven = set(changes)
+        marked = list(dict.fromkeys(interlock['Effects']))
+        missing = [effect for effect in marked if effect not in driven]
+        result = {
+            'Interlock No': interlock['Interlock No'],
+            'Tag No': cause,
+            'Rung': interlock.get('Rung', ''),
+            'confirmed': [effect for effect in marked if effect in driven],
+            'missing': missing,
+            'unmarked': [effect for effect in changes if effect not in marked_by_cause.get(cause, ())],
+        }
+        if pairs and not vote:
+            result['with_second_cause'] = {
+                effect: partners[(cause, effect)] for effect in missing if (cause, effect) in partners
+            }
+        results.append(result)
+    return results
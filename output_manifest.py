@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Output Manifest
+Fingerprints the content behind each generated workbook so unchanged PLCs are not rewritten
+"""
+
+import hashlib
+import json
+import os
+
+# Bump OUTPUT_FORMAT_VERSION whenever a generate_*_excel() layout changes, so
+# every workbook is rewritten once on the next run
+MANIFEST_SCHEMA_VERSION = 1
+OUTPUT_FORMAT_VERSION = 2
+
+def fingerprint(*parts):
+    """SHA-256 of JSON-serializable content (dict key order and tuple vs list do not matter)"""
+    payload = json.dumps([OUTPUT_FORMAT_VERSION, parts], sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def snapshot(alarms, interlocks):
+    """The reviewable content of one conversion: alarm rows, interlock rows and X cells"""
+    return {
+        'alarms': {alarm['Tag No']: alarm['Service Description'] for alarm in alarms},
+        'interlocks': sorted({f"{interlock['Tag No']} (rung {interlock['Rung']})": interlock['Service Description']
+                              for interlock in interlocks}.items()),
+        'cells': sorted({(interlock['Tag No'], effect) for interlock in interlocks for effect in interlock['Effects']}),
+    }
+
+def diff_snapshots(old, new):
+    """
+    Structured difference between two snapshots.
+
+    Returns:
+        {'alarms': {'added', 'removed', 'changed'}, 'interlocks': {'added', 'removed'},
+         'cells': {'added', 'removed'}} - cells are [cause, effect] pairs
+    """
+    old_alarms, new_alarms = old.get('alarms', {}), new['alarms']
+    old_interlocks = {key for key, _ in old.get('interlocks', [])}
+    new_interlocks = {key for key, _ in new['interlocks']}
+    old_cells = {tuple(cell) for cell in old.get('cells', [])}
+    new_cells = {tuple(cell) for cell in new['cells']}
+    return {
+        'alarms': {
+            'added': sorted(set(new_alarms) - set(old_alarms)),
+            'removed': sorted(set(old_alarms) - set(new_alarms)),
+            'changed': sorted(tag for tag in set(old_alarms) & set(new_alarms) if old_alarms[tag] != new_alarms[tag]),
+        },
+        'interlocks': {
+            'added': sorted(new_interlocks - old_interlocks),
+            'removed': sorted(old_interlocks - new_interlocks),
+        },
+        'cells': {
+            'added': [list(cell) for cell in sorted(new_cells - old_cells)],
+            'removed': [list(cell) for cell in sorted(old_cells - new_cells)],
+        },
+    }
+
+def diff_is_empty(diff):
+    """True when a diff_snapshots() result records no change"""
+    return not any(items for section in diff.values() for items in section.values())
+
+def load_manifest(path):
+    """Previous manifest, or an empty one if it is missing, unreadable or from another schema"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('schema') != MANIFEST_SCHEMA_VERSION:
+        return {}
+    return manifest
+
+def save_manifest(path, manifest):
+    """Write a manifest atomically (concurrent batch workers never see a partial file)"""
+    manifest = dict(manifest, schema=MANIFEST_SCHEMA_VERSION)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+    os.replace(temp_path, path)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Parsed Program Cache
+Stores parsed rungs and tag descriptions on disk keyed by the input file's content hash
+"""
+
+import hashlib
+import os
+import pickle
+
+# Cache location and size bound (least recently used entries are evicted first)
+CACHE_DIR = '.parse_cache'
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump CACHE_SCHEMA_VERSION when the payload layout changes and PARSER_VERSION
+# when any extractor changes the rungs / tag_descriptions it returns
+CACHE_SCHEMA_VERSION = 1
+PARSER_VERSION = 4
+
+# Files evicted from the cache directory: pickled entries and the comment stores they reference
+CACHE_SUFFIXES = ('.pkl', '.comments')
+
+# Read size used while hashing inputs
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file, read in chunks so large exports are not loaded whole"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_key(path, variant=''):
+    """Cache key for an input file: content hash plus parser and schema versions (and parse variant)"""
+    key = f'{file_sha256(path)}-p{PARSER_VERSION}-s{CACHE_SCHEMA_VERSION}'
+    return f'{key}-{variant}' if variant else key
+
+def _load_entry(entry_path):
+    """Load a cache entry, returning None if it is missing, unreadable or from another schema"""
+    try:
+        with open(entry_path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        # Truncated or corrupt entry - drop it and re-parse
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+        return None
+
+    if not isinstance(payload, dict) or payload.get('schema') != CACHE_SCHEMA_VERSION:
+        return None
+    return payload
+
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes"""
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return
+
+    entries = []
+    total = 0
+    for name in names:
+        if not name.endswith(CACHE_SUFFIXES):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    # Oldest mtime first - hits refresh mtime, so this is LRU order
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def cached_parse(input_file, parse_func, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, variant=''):
+    """
+    Return (rungs, tag_descriptions) for input_file, parsing only on a cache miss.
+
+    Args:
+        input_file: PDF / L5X path; its SHA-256 is the cache key
+        parse_func: callable(input_file) -> (rungs, tag_descriptions)
+        cache_dir: directory holding the pickled entries
+        max_bytes: size bound enforced after each write
+        variant: kept apart from other parses of the same file (e.g. 'comments'
+                 for an L5X parsed into a comment store)
+
+    Returns:
+        (rungs, tag_descriptions, hit) - hit is True when the cache was used
+    """
+    entry_path = os.path.join(cache_dir, cache_key(input_file, variant) + '.pkl')
+
+    payload = _load_entry(entry_path)
+    if payload is not None:
+        # Refresh the entry's position in LRU order
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return payload['rungs'], payload['tag_descriptions'], True
+
+    rungs, tag_descriptions = parse_func(input_file)
+
+    payload = {
+        'schema': CACHE_SCHEMA_VERSION,
+        'parser_version': PARSER_VERSION,
+        'source': os.path.basename(input_file),
+        'rungs': rungs,
+        'tag_descriptions': tag_descriptions,
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f'{entry_path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Atomic publish so concurrent batch workers never read a half-written entry
+    os.replace(temp_path, entry_path)
+
+    evict_cache(cache_dir, max_bytes)
+    return rungs, tag_descriptions, False
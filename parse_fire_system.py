@@ -4,16 +4,42 @@ RSLogix 500 Fire System Parser
 Extracts alarm and cause-effect data from PDF ladder logic
 """
 
+import argparse
+import functools
+import json
+import os
 import pandas as pd
 import re
-import shutil
-from openpyxl import Workbook, load_workbook
+import sys
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
-from collections import defaultdict
+from l5x_parser import extract_data_from_l5x
+from l5k_parser import extract_data_from_l5k
+from slc_parser import extract_data_from_slc, symbol_database_for
+from pdf_extractor import extract_data_from_pdf_report
+from parse_cache import CACHE_DIR, cache_key, cached_parse, file_sha256
+from output_manifest import diff_is_empty, diff_snapshots, fingerprint, load_manifest, save_manifest, snapshot
+from template_cache import add_pages, load_template
+from template_writer import TemplateSheet, save_pages
+from alarm_rules import load_rules
+from stage_profiler import count, profiled, stage, start_profiling, stop_profiling
+from cause_effect import CauseEffectMatrix
+from rung_graph import RungGraph
+from rung_parser import has_logic, rung_label
+from bdd import DriveLogic
+from cross_reference import CrossReference
+from ladder_sim import verify_interlocks
+from tag_address import address_sort_key
+from excel_styles import (
+    STYLE_BLANK, STYLE_BORDERED, STYLE_BORDERED_DISCRETE, STYLE_DATA, STYLE_DATA_CENTER, STYLE_DATA_LEFT,
+    STYLE_DATA_WRAP, STYLE_DISCRETE, STYLE_HEADER_THICK, STYLE_HEADER_THICK_BOXED, STYLE_X_MARK, WorkbookStyles,
+)
 
 # File paths
 PDF_FILE = 'test.pdf'
+L5X_FILE = '_2_LADDER.L5X'
 
 # PLC Configuration
 PLC_NAME = 'Fire System PLC 1'
@@ -22,438 +48,190 @@ PLC_NAME = 'Fire System PLC 1'
 ALARM_SUMMARY_TEMPLATE = 'templates/STX Alarm Summary Template - 251113.xlsx'
 CAUSE_EFFECT_TEMPLATE = 'templates/STX Cause & Effect Template - 251113.xlsx'
 
+# Data rows per page of the template outputs (the templates' document area);
+# longer outputs get one copy of the template sheet per page
+PAGE_ROWS = 48
+
+# Alarm / status / ESD / shutdown classification rules (see alarm_rules.py)
+ALARM_RULES_FILE = 'alarm_rules.json'
+
+# Cause & effect tag classes: physical inputs, physical outputs, and shutdown bits
+PHYSICAL_INPUT_PREFIXES = ('I:', 'B11:', 'B14:')
+PHYSICAL_OUTPUT_PREFIXES = ('O:',)
+SHUTDOWN_PREFIXES = ('B3:2', 'B3:10', 'B3:0/0', 'B3:0/11')
+
+def is_cause(tag):
+    """Whether tag is a physical input (a row of the transitive matrix)"""
+    return tag.startswith(PHYSICAL_INPUT_PREFIXES)
+
+def is_effect(tag):
+    """Whether tag is a physical output or shutdown bit (a column of the transitive matrix)"""
+    return tag.startswith(PHYSICAL_OUTPUT_PREFIXES + SHUTDOWN_PREFIXES)
+
+def _safe_name(plc_name):
+    """PLC name made safe for use in a file name"""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', plc_name.strip())
+
+def output_paths(plc_name, output_dir=''):
+    """Alarm Summary and Cause & Effect output paths for a PLC (file-name-safe PLC name)"""
+    safe_name = _safe_name(plc_name)
+    return (
+        os.path.join(output_dir, f'Alarm_Summary_{safe_name}.xlsx'),
+        os.path.join(output_dir, f'Cause_Effect_{safe_name}.xlsx'),
+    )
+
+def cross_reference_path(plc_name, output_dir=''):
+    """Cross reference workbook path for a PLC (--xref)"""
+    return os.path.join(output_dir, f'Cross_Reference_{_safe_name(plc_name)}.xlsx')
+
+def manifest_paths(plc_name, output_dir=''):
+    """Sidecar manifest and change report paths for a PLC's workbooks"""
+    safe_name = _safe_name(plc_name)
+    return (
+        os.path.join(output_dir, f'.{safe_name}.manifest.json'),
+        os.path.join(output_dir, f'Changes_{safe_name}.json'),
+    )
+
 # Output paths (include PLC name)
-ALARM_SUMMARY_OUTPUT = f'Alarm_Summary_{PLC_NAME.replace(" ", "_")}.xlsx'
-CAUSE_EFFECT_OUTPUT = f'Cause_Effect_{PLC_NAME.replace(" ", "_")}.xlsx'
+ALARM_SUMMARY_OUTPUT, CAUSE_EFFECT_OUTPUT = output_paths(PLC_NAME)
 
-def extract_data_from_pdf():
+def extract_data_from_pdf(pdf_file=PDF_FILE):
     """
     Extract ladder logic information from PDF including tag descriptions
     Returns rungs and tag descriptions
     """
-    rungs = []
-    tag_descriptions = {}
-
-    # Manual extraction from PDF analysis
-    # All data extracted from test.pdf ladder logic diagrams
-
-    # Build tag descriptions dictionary from PDF analysis
-    tag_descriptions = {
-        # Pull Stations
-        'I:0/0': 'Pull Station 1 Zone 2',
-        'I:0/1': 'Pull Station 2 Zone 1',
-        'I:0/2': 'Pull Station 3 Zone 2',
-        'I:0/3': 'Pull Station 4 Zone 1',
-        'I:0/4': 'Pull Station 5 Zone 2',
-        'I:0/5': 'Pull Station 6 Zone 1',
-        'B11:0/0': 'Pull Station 7 Zone 1',
-        'B11:0/1': 'Pull Station 8 Zone 1',
-        'B14:0/0': 'Pull Station 10 from Office Plc Zone 1',
-        'B14:0/1': 'Pull Station 9 From Office PLC Zone 2',
-        'B14:0/2': 'Fire Alarm Zone 2',
-        'B14:0/3': 'Plant ESD',
-
-        # Fire Eyes - Fire Detected
-        'I:0/6': 'Fire Eye 1 Failure Alarm',
-        'I:0/7': 'Fire Eye 1 Fire Detected Zone 1',
-        'I:0/8': 'Fire Eye 2 Failure Alarm',
-        'I:0/9': 'Fire Eye 2 Fire Detected Zone 2',
-        'I:0/10': 'Fire Eye 3 Failure Alarm',
-        'I:0/11': 'Fire Eye 3 Detected Zone 1',
-        'I:0/12': 'Fire Eye 4 Failure Alarm',
-        'I:0/13': 'Fire Eye 4 Fire Detected Zone 2',
-        'I:0/14': 'Fire Eye 5 Failure Alarm',
-        'I:0/15': 'Fire Eye 5 Fire Detected Zone 1',
-        'I:0/16': 'Fire Eye 6 Failure Alaram',
-        'I:0/17': 'Fire Eye 6 Fire Detected Zone 2',
-        'I:0/18': 'Fire Eye 7 Failure Alarm',
-        'I:0/19': 'Fire Eye 7 Failure Zone 1',
-        'I:1/0': 'Fire Eye 8 Failure Alarm',
-        'I:1/1': 'Fire Eye 8 Fire Detected Zone 2',
-        'I:1/12': 'Fire Eye Failure Warning',
-        'I:1/13': 'Strobe Light Trigger',
-        'I:1/15': 'Strobe Light Trigger',
-
-        # Outputs
-        'O:0/0': 'Deluge Valve Zone 2 Open',
-
-        # Internal Alarms and Status - B3:0
-        'B3:0/0': 'Fire Alarm Zone 1',
-        'B3:0/1': 'Fire Eye Faulted Zone 1',
-        'B3:0/3': 'Fire Eye Faulted Zone 2',
-        'B3:0/4': 'Fire Detected Zone 2 Fire Eyes. Single Detector Only',
-        'B3:0/5': 'Fire Detected Zone 1 Fire Eyes. Single Detector Only',
-        'B3:0/6': 'Plant ESD',
-        'B3:0/8': 'Fire Eye Failure Warning',
-        'B3:0/9': 'Strobe Light On',
-        'B3:0/10': 'Strobe Light On',
-        'B3:0/11': 'Fire Alarm Zone 2',
-        'B3:0/12': 'Fire System Deluge Valve Open',
-        'B3:0/13': 'Strobe Light On',
-
-        # Plant ESD outputs - B3:2
-        'B3:2/0': 'Plant ESD',
-        'B3:2/1': 'Plant ESD',
-        'B3:2/2': 'Plant ESD',
-        'B3:2/3': 'Plant ESD',
-        'B3:2/4': 'Plant ESD',
-        'B3:2/5': 'Plant ESD',
-        'B3:2/6': 'Plant ESD',
-        'B3:2/7': 'Plant ESD',
-        'B3:2/8': 'Plant ESD',
-        'B3:2/9': 'Plant ESD',
-        'B3:2/10': 'Plant ESD',
-        'B3:2/13': 'Plant ESD',
-        'B3:2/14': 'Plant ESD',
-
-        # Fire Eye Detection Status - B3:3
-        'B3:3/0': 'Fire Eye 1 Fire Detected',
-        'B3:3/1': 'Fire Eye 2 Fire Detected',
-        'B3:3/2': 'Fire Eye 3 Fire Detected',
-        'B3:3/3': 'Fire Eye 4 Fire Detected',
-        'B3:3/4': 'Fire Eye 5 Fire Detected',
-        'B3:3/5': 'Fire Eye 6 Fire Detected',
-        'B3:3/6': 'Fire Eye 7 Fire Detected',
-        'B3:3/7': 'Fire Eye 8 Fire Detected',
-        'B3:3/8': 'FE 1 Failure Alarm',
-        'B3:3/9': 'FE 2 Failure Alarm',
-        'B3:3/10': 'FE 3 Failure Alarm',
-        'B3:3/11': 'FE 4 Failure Alarm',
-        'B3:3/12': 'FE 5 Failure Alarm',
-        'B3:3/13': 'FE 6 Failure Alarm',
-        'B3:3/14': 'FE 7 Failure Alarm',
-        'B3:3/15': 'FE 8 Failure Alarm',
-
-        # 2 Detector Logic - B3:4
-        'B3:4/0': '2 Detectors In Alarm Bit 1',
-        'B3:4/1': '2 Detectors In Alarm Bit 2',
-        'B3:4/2': '2 Detectors In Alarm Bit 3',
-        'B3:4/3': '2 Detectors In Alarm Bit 4',
-        'B3:4/4': '2 Detectors In Alarm Bit 5',
-        'B3:4/5': '2 Detectors In Alarm Zone 2',
-        'B3:4/6': '2 Detectors In Alarm Zone 1',
-
-        # ESD to Office
-        'B3:10/0': 'ESD Alarm to Office PLC',
-
-        # Timers
-        'T4:0': 'Message Control Timer',
-        'T4:1': 'Delay Trigger Timer',
-        'T4:2': 'Delay Timer',
-        'T4:3': 'Delay Trigger Timer',
-        'T4:4': 'Delay Trigger Timer',
-        'T4:5': 'Delay Trigger Timer',
-        'T4:6': 'Delay Trigger Timer',
-        'T4:7': 'Delay Trigger Timer',
-        'T4:8': 'Delay Trigger Timer',
-        'T4:9': 'Delay Timer',
-        'T4:10': 'Delay Timer',
-        'T4:11': 'Delay Timer',
-        'T4:12': 'Delay Timer',
-        'T4:13': 'Delay Timer',
-        'T4:14': 'Delay Timer',
-        'T4:15': 'Delay Timer',
-        'T4:16': 'Delay Timer',
-    }
-
-    # Build rungs from PDF analysis
-    rungs = [
-        # Rung 0000
-        {
-            'rung': '0000',
-            'inputs': ['B14:0/3'],
-            'outputs': ['B3:2/4'],
-            'description': 'Plant ESD from Office PLC'
-        },
-        # Rung 0001 - Fire Alarm Zone 1
-        {
-            'rung': '0001',
-            'inputs': ['I:0/1', 'I:0/3', 'I:0/5', 'B11:0/1', 'B14:0/0', 'B3:4/6'],
-            'outputs': ['B3:0/0', 'B3:2/0'],
-            'description': 'Fire Alarm Zone 1'
-        },
-        # Rung 0002 - Fire Alarm Zone 2 with Deluge
-        {
-            'rung': '0002',
-            'inputs': ['I:0/0', 'I:0/2', 'I:0/4', 'B11:0/0', 'B14:0/1', 'B3:4/5'],
-            'outputs': ['O:0/0', 'B3:0/10', 'B3:2/10'],
-            'description': 'Fire Alarm Zone 2 and Deluge Valve'
-        },
-        # Rung 0003 - ESD to Office PLC
-        {
-            'rung': '0003',
-            'inputs': ['B3:0/0', 'O:0/0', 'B11:0/1'],
-            'outputs': ['B3:10/0'],
-            'description': 'ESD Alarm to Office PLC'
-        },
-        # Fire Eye Failure Detection (XIO logic - examines if open)
-        {
-            'rung': '0004',
-            'inputs': ['I:0/7'],  # XIO - Examine if Open
-            'outputs': ['B3:3/8'],
-            'description': 'Fire Eye 1 Failure Alarm',
-            'timer': 'T4:16',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0006',
-            'inputs': ['I:0/9'],
-            'outputs': ['B3:3/9'],
-            'description': 'Fire Eye 2 Failure Alarm',
-            'timer': 'T4:15',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0008',
-            'inputs': ['I:0/11'],
-            'outputs': ['B3:3/10'],
-            'description': 'Fire Eye 3 Failure Alarm',
-            'timer': 'T4:14',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0010',
-            'inputs': ['I:0/13'],
-            'outputs': ['B3:3/11'],
-            'description': 'Fire Eye 4 Failure Alarm',
-            'timer': 'T4:13',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0012',
-            'inputs': ['I:0/15'],
-            'outputs': ['B3:3/12'],
-            'description': 'Fire Eye 5 Failure Alarm',
-            'timer': 'T4:12',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0014',
-            'inputs': ['I:0/17'],
-            'outputs': ['B3:3/13'],
-            'description': 'Fire Eye 6 Failure Alarm',
-            'timer': 'T4:11',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0016',
-            'inputs': ['I:0/19'],
-            'outputs': ['B3:3/14'],
-            'description': 'Fire Eye 7 Failure Alarm',
-            'timer': 'T4:10',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0018',
-            'inputs': ['I:1/1'],
-            'outputs': ['B3:3/15'],
-            'description': 'Fire Eye 8 Failure Alarm',
-            'timer': 'T4:9',
-            'logic_type': 'XIO'
-        },
-        # Rung 0020 - Fire Eye Faulted Zone 1 (OR of failures)
-        {
-            'rung': '0020',
-            'inputs': ['B3:3/10', 'B3:3/11', 'B3:3/12', 'B3:3/13', 'B3:3/14', 'B3:3/15'],
-            'outputs': ['B3:0/1'],
-            'description': 'Fire Eye Faulted Zone 1',
-            'logic_type': 'OR'
-        },
-        # Rung 0021 - Fire Eye Faulted Zone 2
-        {
-            'rung': '0021',
-            'inputs': ['B3:3/9', 'B3:3/8'],
-            'outputs': ['B3:0/3'],
-            'description': 'Fire Eye Faulted Zone 2',
-            'logic_type': 'OR'
-        },
-        # Fire Eye Fire Detection with TON and CTU
-        {
-            'rung': '0022-0023',
-            'inputs': ['I:0/6'],
-            'outputs': ['B3:3/0'],
-            'description': 'Fire Eye 1 Fire Detected',
-            'timer': 'T4:1',
-            'counter': 'C5:0'
-        },
-        {
-            'rung': '0024-0025',
-            'inputs': ['I:0/8'],
-            'outputs': ['B3:3/1'],
-            'description': 'Fire Eye 2 Fire Detected',
-            'timer': 'T4:2',
-            'counter': 'C5:1'
-        },
-        {
-            'rung': '0026-0027',
-            'inputs': ['I:0/10'],
-            'outputs': ['B3:3/2'],
-            'description': 'Fire Eye 3 Fire Detected',
-            'timer': 'T4:3',
-            'counter': 'C5:2'
-        },
-        {
-            'rung': '0028-0029',
-            'inputs': ['I:0/12'],
-            'outputs': ['B3:3/3'],
-            'description': 'Fire Eye 4 Fire Detected',
-            'timer': 'T4:4',
-            'counter': 'C5:3'
-        },
-        {
-            'rung': '0030-0031',
-            'inputs': ['I:0/14'],
-            'outputs': ['B3:3/4'],
-            'description': 'Fire Eye 5 Fire Detected',
-            'timer': 'T4:5',
-            'counter': 'C5:4'
-        },
-        {
-            'rung': '0032-0033',
-            'inputs': ['I:0/16'],
-            'outputs': ['B3:3/5'],
-            'description': 'Fire Eye 6 Fire Detected',
-            'timer': 'T4:6',
-            'counter': 'C5:5'
-        },
-        {
-            'rung': '0034-0035',
-            'inputs': ['I:0/18'],
-            'outputs': ['B3:3/6'],
-            'description': 'Fire Eye 7 Fire Detected',
-            'timer': 'T4:7',
-            'counter': 'C5:6'
-        },
-        {
-            'rung': '0036-0037',
-            'inputs': ['I:1/0'],
-            'outputs': ['B3:3/7'],
-            'description': 'Fire Eye 8 Fire Detected',
-            'timer': 'T4:8',
-            'counter': 'C5:7'
-        },
-        # Single detector alarms
-        {
-            'rung': '0038',
-            'inputs': ['B3:3/2', 'B3:3/3', 'B3:3/4', 'B3:3/5', 'B3:3/6', 'B3:3/7'],
-            'outputs': ['B3:0/5'],
-            'description': 'Fire Detected Zone 1 Fire Eyes Single Detector',
-            'logic_type': 'OR'
-        },
-        {
-            'rung': '0039',
-            'inputs': ['B3:3/1', 'B3:3/0'],
-            'outputs': ['B3:0/4'],
-            'description': 'Fire Detected Zone 2 Fire Eyes Single Detector',
-            'logic_type': 'OR'
-        },
-        # Additional alarm rungs
-        {
-            'rung': '0054',
-            'inputs': ['B14:0/2'],
-            'outputs': ['B3:0/11'],
-            'description': 'Fire Alarm Zone 2'
-        },
-        {
-            'rung': '0055',
-            'inputs': ['I:1/12'],
-            'outputs': ['B3:0/8', 'B3:2/8'],
-            'description': 'Fire Eye Failure Warning',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0056',
-            'inputs': ['I:1/13'],
-            'outputs': ['B3:0/9', 'B3:2/9'],
-            'description': 'Strobe Light On',
-            'logic_type': 'XIO'
-        },
-        {
-            'rung': '0057',
-            'inputs': ['I:1/15'],
-            'outputs': ['B3:0/13', 'B3:2/13'],
-            'description': 'Strobe Light On'
-        },
-    ]
+    # Rung numbers, addresses and descriptions come from the report's text layer;
+    # pages are parsed in a process pool for long printouts
+    rungs, tag_descriptions = extract_data_from_pdf_report(pdf_file)
 
     return rungs, tag_descriptions
 
-def build_alarm_summary(tag_descriptions):
-    """Build alarm summary data from tags - only includes entries with 'alarm' in description"""
-    alarms = []
+@profiled('build_alarm_summary', lambda alarms: {'alarms': len(alarms)})
+def build_alarm_summary(tag_descriptions, rules=None):
+    """
+    Build alarm summary rows for every tag the rules classify as an alarm.
 
-    # Define all potential alarm tags to extract
-    alarm_tags = [
-        # Fire Alarms
-        ('B3:0/0', 'Fire Alarm Zone 1'),
-        ('B3:0/11', 'Fire Alarm Zone 2'),
-        ('B3:0/1', 'Fire Eye Faulted Zone 1'),
-        ('B3:0/3', 'Fire Eye Faulted Zone 2'),
-        ('B3:0/4', 'Fire Detected Zone 2 Fire Eyes. Single Detector Only'),
-        ('B3:0/5', 'Fire Detected Zone 1 Fire Eyes. Single Detector Only'),
-        ('B3:0/6', 'Plant ESD'),
-        ('B3:0/8', 'Fire Eye Failure Warning'),
-        ('B3:0/9', 'Strobe Light On'),
-        ('B3:0/10', 'Strobe Light On'),
-        ('B3:0/12', 'Fire System Deluge Valve Open'),
-        ('B3:0/13', 'Strobe Light On'),
-        # Fire Eye Failure Alarms
-        ('B3:3/8', 'FE 1 Failure Alarm'),
-        ('B3:3/9', 'FE 2 Failure Alarm'),
-        ('B3:3/10', 'FE 3 Failure Alarm'),
-        ('B3:3/11', 'FE 4 Failure Alarm'),
-        ('B3:3/12', 'FE 5 Failure Alarm'),
-        ('B3:3/13', 'FE 6 Failure Alarm'),
-        ('B3:3/14', 'FE 7 Failure Alarm'),
-        ('B3:3/15', 'FE 8 Failure Alarm'),
-        # Fire Eye Fire Detected
-        ('B3:3/0', 'Fire Eye 1 Fire Detected'),
-        ('B3:3/1', 'Fire Eye 2 Fire Detected'),
-        ('B3:3/2', 'Fire Eye 3 Fire Detected'),
-        ('B3:3/3', 'Fire Eye 4 Fire Detected'),
-        ('B3:3/4', 'Fire Eye 5 Fire Detected'),
-        ('B3:3/5', 'Fire Eye 6 Fire Detected'),
-        ('B3:3/6', 'Fire Eye 7 Fire Detected'),
-        ('B3:3/7', 'Fire Eye 8 Fire Detected'),
-        # 2 Detector Alarms
-        ('B3:4/6', '2 Detectors In Alarm Zone 1'),
-        ('B3:4/5', '2 Detectors In Alarm Zone 2'),
-        # ESD
-        ('B3:10/0', 'ESD Alarm to Office PLC'),
-        # Deluge Status
-        ('O:0/0', 'Deluge Valve Zone 2 Open'),
-    ]
-
-    # Filter to only include entries with "alarm" in the description (case-insensitive)
-    for tag_addr, description in alarm_tags:
-        if 'alarm' in description.lower():
-            alarms.append({
-                'Tag No': tag_addr,
-                'P & ID': '',
-                'Service Description': description,
-                'Range': '',
-                'EU': '',
-                'Normal Operating Conditions': '',
-                'HH': '',
-                'H': '',
-                'L': '',
-                'LL': '',
-                'Engineering Notes': ''
-            })
+    rules is an AlarmRules; by default ALARM_RULES_FILE is loaded. Rows come
+    out in data-table order (B3:0/0, B3:0/11, B3:3/8, ...).
+    """
+    if rules is None:
+        rules = load_rules(ALARM_RULES_FILE)
+
+    alarms = []
+    classified = rules.classify_all(tag_descriptions)
+    for tag_addr in sorted(classified, key=address_sort_key):
+        classification = classified[tag_addr]
+        if 'alarm' not in classification.categories:
+            continue
+        alarms.append({
+            'Tag No': tag_addr,
+            'P & ID': '',
+            'Service Description': tag_descriptions[tag_addr],
+            'Range': '',
+            'EU': '',
+            'Normal Operating Conditions': '',
+            'HH': '',
+            'H': '',
+            'L': '',
+            'LL': '',
+            'Engineering Notes': '',
+            'Priority': classification.priority or '',
+        })
 
     return alarms
 
-def build_cause_effect_matrix(rungs, tag_descriptions):
-    """Build cause and effect matrix from ladder rungs"""
+def build_transitive_interlocks(rungs, tag_descriptions, voting=False):
+    """
+    One interlock per physical input, with every physical output / shutdown bit it
+    trips through any chain of internal bits (I:0/1 -> B3:0/0 -> B3:10/0 -> ESD).
+
+    voting=True builds each effect's driving logic as a BDD (see bdd.py): an
+    effect tripped only when k of N inputs agree is marked on one 'kooN' row
+    for the group (named after the bit that holds the vote, e.g. B3:4/6)
+    instead of on each input's row; inputs left without effects are dropped.
+    """
+    graph = RungGraph(rungs)
+    trips = graph.trips(is_cause, is_effect)
+
+    votes = {}                           # Vote -> effects it trips
+    if voting:
+        logic = DriveLogic(rungs)
+        voted = {}                       # effect -> inputs that trip it only through a vote
+        for effect in dict.fromkeys(effect for _, effects in trips for effect in effects):
+            groups = logic.cause_groups(effect, is_cause)
+            if not groups:
+                continue                 # not expandable, or no input trips it
+            for vote in groups:
+                if len(vote.causes) > 1:
+                    votes.setdefault(vote, []).append(effect)
+                    voted.setdefault(effect, set()).update(vote.causes)
+        trips = [(cause, [effect for effect in effects if cause not in voted.get(effect, ())])
+                 for cause, effects in trips]
+        trips = [(cause, effects) for cause, effects in trips if effects]
+
+    interlocks = []
+    for cause, effects in trips:
+        interlocks.append(_interlock_row(graph, cause, tag_descriptions.get(cause, ''), effects, [cause]))
+    for vote, effects in votes.items():
+        tag = logic.tag_of(vote)
+        description = tag_descriptions.get(tag, '') if tag else ''
+        row = _interlock_row(graph, tag or vote.label, f"{vote.label}: {description or ', '.join(vote.causes)}",
+                             effects, list(vote.causes))
+        row['Vote'] = vote.k or len(vote.causes)  # inputs that must agree to trip
+        interlocks.append(row)
+    for interlock_num, interlock in enumerate(interlocks, 1):
+        interlock['Interlock No'] = interlock_num
+    return interlocks
+
+def _interlock_row(graph, tag, description, effects, inputs):
+    """One transitive interlock row; its rungs are those writing its effects"""
+    rung_numbers = sorted({number for effect in effects for number in graph.writers.get(effect, ())})
+    return {
+        'Interlock No': 0,
+        'Tag No': tag,
+        'Service Description': description,
+        'Range': '',
+        'Pre-Trip (H or L)': '',
+        'Trip (HH or LL)': '',
+        'P & ID': '',
+        'Rung': ', '.join(rung_numbers),
+        'Effects': effects,
+        'All Inputs': inputs,
+        'All Outputs': effects
+    }
+
+def voting_warning(rungs):
+    """
+    Why --voting cannot run on these rungs, or None. Votes are read from each
+    rung's logic, and PDF rungs (no rung text) only list their contacts.
+    """
+    guessed = sum(1 for rung in rungs if not has_logic(rung))
+    if not guessed:
+        return None
+    return (f'--voting ignored: {guessed} rung(s) have no rung text (PDF printout), so their branches are unknown '
+            f'- built the --transitive matrix instead')
+
+@profiled('build_cause_effect_matrix', lambda interlocks: {'interlocks': len(interlocks)})
+def build_cause_effect_matrix(rungs, tag_descriptions, transitive=False, voting=False):
+    """
+    Build cause and effect matrix from ladder rungs.
+
+    By default each qualifying rung is one interlock (one rung deep);
+    transitive=True follows internal bits across rungs instead, and
+    voting=True (implies transitive) also groups k-out-of-N votes.
+    """
+    if transitive or voting:
+        return build_transitive_interlocks(rungs, tag_descriptions, voting)
+
     interlocks = []
     interlock_num = 1
 
     # Filter rungs that have physical I/O or shutdowns
     for rung in rungs:
         # Check if rung has physical inputs (I:, B11:, B14:) or outputs (O:, B3:2, B3:10)
-        has_physical_input = any(tag.startswith(('I:', 'B11:', 'B14:')) for tag in rung['inputs'])
-        has_physical_output = any(tag.startswith(('O:')) for tag in rung['outputs'])
-        has_shutdown = any(tag.startswith(('B3:2', 'B3:10', 'B3:0/0', 'B3:0/11')) for tag in rung['outputs'])
+        has_physical_input = any(tag.startswith(PHYSICAL_INPUT_PREFIXES) for tag in rung['inputs'])
+        has_physical_output = any(tag.startswith(PHYSICAL_OUTPUT_PREFIXES) for tag in rung['outputs'])
+        has_shutdown = any(tag.startswith(SHUTDOWN_PREFIXES) for tag in rung['outputs'])
 
         # Only include rungs with physical I/O or key outputs
         if has_physical_input and (has_physical_output or has_shutdown):
@@ -463,7 +241,7 @@ def build_cause_effect_matrix(rungs, tag_descriptions):
             # Primary input (first physical input)
             primary_input = None
             for tag in input_tags:
-                if tag.startswith(('I:', 'B11:', 'B14:')):
+                if tag.startswith(PHYSICAL_INPUT_PREFIXES):
                     primary_input = tag
                     break
 
@@ -475,10 +253,8 @@ def build_cause_effect_matrix(rungs, tag_descriptions):
             if primary_input and primary_input in tag_descriptions:
                 service_desc = tag_descriptions[primary_input]
 
-            # Build effects dictionary
-            effects = defaultdict(str)
-            for output in rung['outputs']:
-                effects[output] = 'X'
+            # Effects tripped by this rung (an output written twice is one X)
+            effects = list(dict.fromkeys(rung['outputs']))
 
             # Add timer/counter info to description if present
             extra_info = []
@@ -497,7 +273,7 @@ def build_cause_effect_matrix(rungs, tag_descriptions):
                 'Pre-Trip (H or L)': '',
                 'Trip (HH or LL)': '',
                 'P & ID': '',
-                'Rung': rung['rung'],
+                'Rung': rung_label(rung),
                 'Effects': effects,
                 'All Inputs': input_tags,
                 'All Outputs': rung['outputs']
@@ -508,15 +284,30 @@ def build_cause_effect_matrix(rungs, tag_descriptions):
 
     return interlocks
 
-def generate_alarm_summary_excel(alarms, output_file, template_file=None):
-    """Generate Alarm Summary Excel file using template if provided"""
+def page_titles(title, rows):
+    """Sheet names for rows data rows split into PAGE_ROWS-row pages: title, 'title (2)', ..."""
+    pages = max(1, -(-rows // PAGE_ROWS))
+    return [title] + [f'{title} ({page})' for page in range(2, pages + 1)]
+
+@profiled('generate_alarm_summary_excel')
+def generate_alarm_summary_excel(alarms, output_file, template_file=None, plc_name=PLC_NAME, direct=False):
+    """
+    Generate Alarm Summary Excel file using template if provided.
+
+    direct=True fills the template by writing its sheet XML directly
+    (write_alarm_summary_direct()) - same sheet, a fraction of the time.
+    """
     
+    if direct and template_file:
+        write_alarm_summary_direct(alarms, output_file, template_file, plc_name)
+        print(f'✓ Alarm Summary saved to: {output_file}')
+        return
+
     if template_file:
-        # Copy template to output file and load it
-        shutil.copy(template_file, output_file)
-        wb = load_workbook(output_file)
+        # Fresh in-memory copy of the template (parsed once per process)
+        wb = load_template(template_file)
+        styles = WorkbookStyles(wb)
         ws = wb['TEMPLATE']
-        ws.title = 'Alarm Summary'
         
         # Template structure:
         # Row 19 = Headers
@@ -525,7 +316,7 @@ def generate_alarm_summary_excel(alarms, output_file, template_file=None):
         
         HEADER_ROW = 19
         DATA_START_ROW = 20
-        END_ROW = 67  # End of document area
+        END_ROW = 67  # End of document area (PAGE_ROWS data rows)
         
         # Unmerge cells in the data area to allow writing (row 19+ for headers and data)
         merged_ranges_to_remove = []
@@ -535,133 +326,77 @@ def generate_alarm_summary_excel(alarms, output_file, template_file=None):
         for merged_range in merged_ranges_to_remove:
             ws.unmerge_cells(str(merged_range))
         
-        # Standard black font for data rows
-        black_font = Font(size=8, color='000000')
-        
-        # Standard thin border
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        # Header row 19 (columns A-M): A-F thick bottom only, G-M thick top AND
+        # bottom to match the other labels; no border past column M
+        for col in range(1, 20):
+            if col <= 6:
+                styles.apply(ws.cell(row=HEADER_ROW, column=col), STYLE_HEADER_THICK)
+            elif col <= 13:
+                styles.apply(ws.cell(row=HEADER_ROW, column=col), STYLE_HEADER_THICK_BOXED)
+            else:
+                styles.apply(ws.cell(row=HEADER_ROW, column=col), STYLE_BLANK)
         
-        # Thick top and bottom border for header row (columns A-F and K-M have thick bottom, G-J have thick top+bottom)
-        thick_bottom_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thick')
-        )
+        # Update the title in the template (rows 16-18 have the title)
+        # Replace [UNIT NAME] with PLC name
+        for row in range(16, 19):
+            for col in range(1, 7):
+                cell = ws.cell(row=row, column=col)
+                if cell.value and '[UNIT NAME]' in str(cell.value):
+                    cell.value = str(cell.value).replace('[UNIT NAME]', plc_name)
         
-        # Thick top AND bottom border for header row (columns G-M need thick top to match visual)
-        thick_top_bottom_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thick'),
-            bottom=Side(style='thick')
+        # Style by column for data rows: A, B, C = left aligned text; D-F and K
+        # centered; G-J (HH, H, L, LL) grey for discrete alarms; L, M (merged
+        # with K) border only; no border past M. Padding rows: border (and the
+        # grey G-J) only
+        column_styles = (
+            [STYLE_DATA_LEFT] * 3 + [STYLE_DATA_CENTER] * 3 + [STYLE_DISCRETE] * 4
+            + [STYLE_DATA_CENTER] + [STYLE_BORDERED] * 2 + [STYLE_BLANK] * 6
         )
+        padding_styles = [STYLE_BORDERED] * 6 + [STYLE_BORDERED_DISCRETE] * 4 + [STYLE_BORDERED] * 3 + [STYLE_BLANK] * 6
         
-        # No border (for cells past column M)
-        no_border = Border()
-        
-        # Grey fill for discrete alarm setpoint columns (G-J: HH, H, L, LL)
-        grey_fill = PatternFill(start_color='C0C0C0', end_color='C0C0C0', fill_type='solid')
-        
-        # Apply borders to header row 19 (columns A-M)
-        # Columns A-F: thick bottom only
-        for col in range(1, 7):  # Columns A-F (1-6)
-            cell = ws.cell(row=HEADER_ROW, column=col)
-            cell.border = thick_bottom_border
-        
-        # Columns G-M: thick top AND bottom (to match other labels)
-        for col in range(7, 14):  # Columns G-M (7-13)
-            cell = ws.cell(row=HEADER_ROW, column=col)
-            cell.border = thick_top_bottom_border
-        
-        # Remove borders past column M in header row
-        for col in range(14, 20):  # Columns N onwards
-            cell = ws.cell(row=HEADER_ROW, column=col)
-            cell.border = no_border
-        
-        # Write alarm data starting at row 20 (replacing example row)
-        for row_idx, alarm in enumerate(alarms):
-            current_row = DATA_START_ROW + row_idx
+        # Title and header rows are ready: one copy of the sheet per PAGE_ROWS alarms
+        pages = add_pages(ws, page_titles('Alarm Summary', len(alarms)))
+        count(pages=len(pages))
+        for page_idx, ws in enumerate(pages):
+            page_alarms = alarms[page_idx * PAGE_ROWS:(page_idx + 1) * PAGE_ROWS]
             
-            # Column mapping: A=Tag No, B=P&ID, C=Service Description, D=Range, 
-            # E=EU, F=Normal Operating Conditions, G=HH, H=H, I=L, J=LL, K-M=Engineering Notes (merged)
-            # For discrete alarms: D, E, F get "-" and G-J get grey shading
-            row_data = [
-                alarm['Tag No'],           # A
-                alarm['P & ID'],           # B
-                alarm['Service Description'],  # C
-                '-',                       # D - Range (discrete alarm)
-                '-',                       # E - EU (discrete alarm)
-                '-',                       # F - Normal Operating Conditions (discrete alarm)
-                '',                        # G - HH (grey, empty for discrete)
-                '',                        # H - H (grey, empty for discrete)
-                '',                        # I - L (grey, empty for discrete)
-                '',                        # J - LL (grey, empty for discrete)
-                alarm['Engineering Notes'],  # K (will merge K:M)
-            ]
-            
-            # Standard alignment for data rows
-            left_align = Alignment(horizontal='left', vertical='center')
-            center_align = Alignment(horizontal='center', vertical='center')
-            
-            for col_idx, value in enumerate(row_data, 1):
-                cell = ws.cell(row=current_row, column=col_idx, value=value)
-                cell.font = black_font
-                cell.border = thin_border
+            # Write alarm data starting at row 20 (replacing example row)
+            for row_idx, alarm in enumerate(page_alarms):
+                current_row = DATA_START_ROW + row_idx
                 
-                # Apply consistent alignment based on column
-                # A, B, C = left aligned text; D, E, F, G-J, K = center aligned
-                if col_idx <= 3:  # A, B, C - left aligned
-                    cell.alignment = left_align
-                else:  # D, E, F, G-J, K - center aligned
-                    cell.alignment = center_align
+                # Column mapping: A=Tag No, B=P&ID, C=Service Description, D=Range, 
+                # E=EU, F=Normal Operating Conditions, G=HH, H=H, I=L, J=LL, K-M=Engineering Notes (merged)
+                # For discrete alarms: D, E, F get "-" and G-J get grey shading
+                row_data = [
+                    alarm['Tag No'],           # A
+                    alarm['P & ID'],           # B
+                    alarm['Service Description'],  # C
+                    '-',                       # D - Range (discrete alarm)
+                    '-',                       # E - EU (discrete alarm)
+                    '-',                       # F - Normal Operating Conditions (discrete alarm)
+                    '',                        # G - HH (grey, empty for discrete)
+                    '',                        # H - H (grey, empty for discrete)
+                    '',                        # I - L (grey, empty for discrete)
+                    '',                        # J - LL (grey, empty for discrete)
+                    alarm['Engineering Notes'],  # K (will merge K:M)
+                ]
                 
-                # Apply grey fill to columns G-J (7-10) for discrete alarms
-                if col_idx >= 7 and col_idx <= 10:
-                    cell.fill = grey_fill
-            
-            # Set border on columns L and M (for merge with K)
-            for col in [12, 13]:  # L and M
-                cell = ws.cell(row=current_row, column=col)
-                cell.border = thin_border
+                for col_idx, value in enumerate(row_data, 1):
+                    styles.apply(ws.cell(row=current_row, column=col_idx, value=value), column_styles[col_idx - 1])
+                
+                # L and M (merged with K) and the columns past M
+                for col_idx in range(len(row_data) + 1, 20):
+                    styles.apply(ws.cell(row=current_row, column=col_idx), column_styles[col_idx - 1])
             
-            # Remove borders past column M
-            for col in range(14, 20):  # Columns N onwards
-                cell = ws.cell(row=current_row, column=col)
-                cell.border = no_border
-        
-        # Handle remaining empty rows (from end of data to row 67)
-        last_data_row = DATA_START_ROW + len(alarms)
-        for row in range(last_data_row, END_ROW + 1):
-            # Set thin borders for columns A-M
-            for col in range(1, 14):
-                cell = ws.cell(row=row, column=col)
-                cell.border = thin_border
-                # Apply grey fill to columns G-J
-                if col >= 7 and col <= 10:
-                    cell.fill = grey_fill
+            # Handle remaining empty rows (from end of data to row 67)
+            last_data_row = DATA_START_ROW + len(page_alarms)
+            for row in range(last_data_row, END_ROW + 1):
+                for col_idx, style in enumerate(padding_styles, 1):
+                    styles.apply(ws.cell(row=row, column=col_idx), style)
             
-            # Remove borders past column M
-            for col in range(14, 20):
-                cell = ws.cell(row=row, column=col)
-                cell.border = no_border
-        
-        # Merge K:M (Engineering Notes) for header row and all data rows (19-67)
-        for row in range(HEADER_ROW, END_ROW + 1):
-            ws.merge_cells(start_row=row, start_column=11, end_row=row, end_column=13)
-        
-        # Update the title in the template (rows 16-18 have the title)
-        # Replace [UNIT NAME] with PLC name
-        for row in range(16, 19):
-            for col in range(1, 7):
-                cell = ws.cell(row=row, column=col)
-                if cell.value and '[UNIT NAME]' in str(cell.value):
-                    cell.value = str(cell.value).replace('[UNIT NAME]', PLC_NAME)
+            # Merge K:M (Engineering Notes) for header row and all data rows (19-67)
+            for row in range(HEADER_ROW, END_ROW + 1):
+                ws.merge_cells(start_row=row, start_column=11, end_row=row, end_column=13)
         
     else:
         # Original behavior - create new workbook
@@ -729,25 +464,314 @@ def generate_alarm_summary_excel(alarms, output_file, template_file=None):
         ws.column_dimensions['J'].width = 8
         ws.column_dimensions['K'].width = 30
 
+    count(rows=len(alarms), cells=sum(sheet.max_row * sheet.max_column for sheet in wb.worksheets))
     wb.save(output_file)
     print(f'✓ Alarm Summary saved to: {output_file}')
 
-def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, template_file=None):
-    """Generate Cause & Effect Matrix Excel file using template if provided"""
+def effect_marks(matrix, effect_columns):
+    """For each matrix row, the positions in effect_columns that hold an X (O(X marks))"""
+    position = {matrix.column(tag): idx for idx, tag in enumerate(effect_columns)}
+    return [[position[column] for column in matrix.row_columns(row)] for row in range(len(matrix))]
+
+def write_cause_effect_streaming(interlocks, marks, tag_descriptions, effect_columns, output_file):
+    """
+    Write the plain (non-template) Cause & Effect layout with a write-only workbook.
+
+    Rows are serialized as they are appended, so memory stays flat however
+    large the matrix is. Every styled cell is a pre-styled WriteOnlyCell; the
+    constant ones (blank bordered cell, X mark) are built once and appended
+    again for every position they occupy - append() writes a cell out before
+    the next one is placed, so sharing them is safe.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Cause & Effect')
+
+    header_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+    effect_fill = PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid')
+    cause_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    center = Alignment(horizontal='center', vertical='center')
+    center_wrap = Alignment(wrap_text=True, horizontal='center', vertical='center')
+
+    def styled(value, font=None, fill=None, alignment=None):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.border = thin_border
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        return cell
+
+    # Shared cells for the bulk of the sheet
+    blank = styled('')
+    effect_blank = styled('', alignment=center)
+    x_mark = styled('X', font=Font(bold=True), alignment=center)
+
+    # Column widths and row heights must be set before the first row is written
+    for letter, width in zip('ABCDEFG', (12, 18, 60, 12, 12, 12, 15)):
+        ws.column_dimensions[letter].width = width
+    for idx in range(len(effect_columns)):
+        ws.column_dimensions[get_column_letter(8 + idx)].width = 20
+    for row, height in ((1, 20), (2, 30), (3, 30), (4, 20)):
+        ws.row_dimensions[row].height = height
+
+    # Row 1: "EFFECT" label and effect descriptions
+    description_font = Font(size=10, bold=True)
+    ws.append(['', '', '', '', '', '', styled('EFFECT', Font(bold=True), effect_fill, center)]
+              + [styled(tag_descriptions.get(tag, ''), description_font, effect_fill, center_wrap)
+                 for tag in effect_columns])
+
+    # Row 2: "Tag No" label and effect tag numbers
+    tag_font = Font(size=9)
+    ws.append(['', '', '', '', '', '', styled('Tag No', Font(bold=True, size=9), effect_fill, center)]
+              + [styled(tag, tag_font, effect_fill, center) for tag in effect_columns])
+
+    # Row 3: CAUSE column headers
+    header_font = Font(bold=True)
+    headers = ['Interlock\nNo', 'Tag No', 'Service Description', 'Range', 'Pre-Trip\n(H or L)', 'Trip\n(HH or LL)']
+    ws.append([styled(header, header_font, header_fill, center_wrap) for header in headers]
+              + [''] * (1 + len(effect_columns)))
+
+    # Row 4: CAUSE label, bordered across the whole matrix
+    ws.append([styled('CAUSE', Font(bold=True), cause_fill, center)] + [blank] * (6 + len(effect_columns)))
+
+    # Interlock rows - copy the all-blank effect row and drop the X marks in
+    blank_effects = [effect_blank] * len(effect_columns)
+    for interlock, row_marks in zip(interlocks, marks):
+        effect_cells = blank_effects.copy()
+        for idx in row_marks:
+            effect_cells[idx] = x_mark
+        ws.append(
+            [
+                styled(f"I-{interlock['Interlock No']}"),
+                styled(interlock['Tag No']),
+                styled(interlock['Service Description']),
+                styled(interlock['Range']),
+                styled(interlock['Pre-Trip (H or L)']),
+                styled(interlock['Trip (HH or LL)']),
+                blank,
+            ]
+            + effect_cells
+        )
+
+    count(cells=(4 + len(interlocks)) * (7 + len(effect_columns)))
+    wb.save(output_file)
+
+def write_cross_reference_excel(xref, tag_descriptions, output_file):
+    """
+    Write the cross reference as one sheet with a write-only workbook: a row per
+    address (rungs reading / writing / timing or counting it), then the
+    commented tags no rung uses. Duplicate OTE coils and unused tags are flagged.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Cross Reference')
+
+    header_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+    flag_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+    for letter, width in zip('ABCDEF', (16, 50, 30, 30, 20, 16)):
+        ws.column_dimensions[letter].width = width
+
+    def styled(value, font=None, fill=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
+
+    header_font = Font(bold=True)
+    ws.append([styled(header, header_font, header_fill)
+               for header in ('Address', 'Description', 'Read', 'Written', 'Timer / Counter', 'Flag')])
+    ws.freeze_panes = 'A2'
+
+    rows = 0
+    for address in xref.addresses():
+        flag = 'Duplicate OTE' if address in xref.duplicate_coils else ''
+        ws.append([
+            address,
+            tag_descriptions.get(address, ''),
+            ', '.join(xref.readers(address)),
+            ', '.join(xref.writers(address)),
+            ', '.join(xref.timer_uses(address) + xref.counter_uses(address)),
+            styled(flag, fill=flag_fill) if flag else '',
+        ])
+        rows += 1
+    for tag in xref.unused:
+        ws.append([tag, tag_descriptions.get(tag, ''), '', '', '', styled('Unused', fill=flag_fill)])
+        rows += 1
+
+    count(cells=(1 + rows) * 6)
+    wb.save(output_file)
+
+def write_alarm_summary_direct(alarms, output_file, template_file, plc_name=PLC_NAME):
+    """
+    Fill the Alarm Summary template by writing its sheet XML directly (see template_writer.py).
+
+    Produces the same sheets as the openpyxl template path in
+    generate_alarm_summary_excel() - same pages, layout, styles and merges -
+    without loading the workbook: the title and header rows are prepared
+    once, each page is a copy of them with its rows set through style
+    indices memoized per template format, and every other part of the
+    template is copied unchanged.
+    """
+    sheet = TemplateSheet(template_file)
+
+    HEADER_ROW = 19
+    DATA_START_ROW = 20
+    END_ROW = 67
+
+    sheet.unmerge(HEADER_ROW)
+    for col in range(1, 20):
+        sheet.set(HEADER_ROW, col, style=(
+            STYLE_HEADER_THICK if col <= 6 else STYLE_HEADER_THICK_BOXED if col <= 13 else STYLE_BLANK))
+
+    for row in range(16, 19):
+        for col in range(1, 7):
+            value = sheet.value(row, col)
+            if value and '[UNIT NAME]' in str(value):
+                sheet.set(row, col, str(value).replace('[UNIT NAME]', plc_name))
+
+    column_styles = (
+        [STYLE_DATA_LEFT] * 3 + [STYLE_DATA_CENTER] * 3 + [STYLE_DISCRETE] * 4
+        + [STYLE_DATA_CENTER] + [STYLE_BORDERED] * 2 + [STYLE_BLANK] * 6
+    )
+    padding_styles = [STYLE_BORDERED] * 6 + [STYLE_BORDERED_DISCRETE] * 4 + [STYLE_BORDERED] * 3 + [STYLE_BLANK] * 6
+    padding = [None] * (len(column_styles) - 11)
+    blank = [None] * len(padding_styles)
+
+    titles = page_titles('Alarm Summary', len(alarms))
+    pages = []
+    for page_idx in range(len(titles)):
+        page = sheet.copy()
+        page_alarms = alarms[page_idx * PAGE_ROWS:(page_idx + 1) * PAGE_ROWS]
+        for row_idx, alarm in enumerate(page_alarms):
+            page.set_row(DATA_START_ROW + row_idx, [
+                alarm['Tag No'], alarm['P & ID'], alarm['Service Description'], '-', '-', '-', '', '', '', '',
+                alarm['Engineering Notes'],
+            ] + padding, column_styles)
+        for row in range(DATA_START_ROW + len(page_alarms), END_ROW + 1):
+            page.set_row(row, blank, padding_styles)
+        for row in range(HEADER_ROW, END_ROW + 1):
+            page.merge(row, 11, row, 13)
+        pages.append(page)
+
+    save_pages(output_file, list(zip(titles, pages)))
+    count(rows=len(alarms), pages=len(pages), cells=len(pages) * END_ROW * len(column_styles))
+
+def write_cause_effect_direct(interlocks, marks, tag_descriptions, effect_columns, output_file, template_file,
+                              plc_name=PLC_NAME):
+    """
+    Fill the Cause & Effect template by writing its sheet XML directly (see template_writer.py).
+
+    Same sheets as the openpyxl template path in generate_cause_effect_excel();
+    each cell style is resolved once per template format it lands on.
+    """
+    sheet = TemplateSheet(template_file)
+
+    TITLE_ROW = 15
+    UNIT_NAME_ROW = 16
+    CAUSE_LABEL_ROW = 17
+    HEADER_ROW = 18
+    DATA_START_ROW = 19
+    EFFECT_START_COL = 10
+    END_ROW = 67
+
+    sheet.unmerge(TITLE_ROW)
+    sheet.set(TITLE_ROW, 1, '')
+    sheet.set(TITLE_ROW, 4, f"CAUSE AND EFFECT MATRIX\n{plc_name}", sheet.styles.derive(
+        sheet.xf(TITLE_ROW, 4) or 0, font=Font(bold=True, size=14),
+        alignment=Alignment(horizontal='center', vertical='center', wrap_text=True)))
+
+    thick_bottom_border = Border(bottom=Side(style='thick'))
+    for col in range(1, 8):
+        sheet.set(UNIT_NAME_ROW, col, '')
+        sheet.set(UNIT_NAME_ROW, col,
+                  style=sheet.styles.derive(sheet.xf(UNIT_NAME_ROW, col), border=thick_bottom_border))
+
+    sheet.set(HEADER_ROW, 3, 'Service Description')
+    sheet.set(HEADER_ROW, 4, '')
+    sheet.set(HEADER_ROW, 7, 'Trip\n(HH or LL)')
+    sheet.set(HEADER_ROW, 8, '')
+
+    for idx, tag in enumerate(effect_columns):
+        sheet.set(TITLE_ROW, EFFECT_START_COL + idx, tag_descriptions.get(tag, ''), STYLE_DATA_WRAP)
+        sheet.set(CAUSE_LABEL_ROW, EFFECT_START_COL + idx, tag, STYLE_DATA_CENTER)
+
+    cause_styles = [STYLE_DATA] * 3 + [STYLE_BORDERED] + [STYLE_DATA] * 3 + [STYLE_BORDERED] + [STYLE_DATA]
+    row_styles = cause_styles + [STYLE_DATA_CENTER] * len(effect_columns)
+    blank_values = [''] * len(effect_columns)
+
+    titles = page_titles('Cause & Effect', len(interlocks))
+    pages = []
+    for page_idx in range(len(titles)):
+        page = sheet.copy()
+        first = page_idx * PAGE_ROWS
+        for row_idx in range(first, min(first + PAGE_ROWS, len(interlocks))):
+            interlock = interlocks[row_idx]
+            # None (D and H, the right halves of the C:D and G:H merges) keeps the cell's value
+            values = [
+                f"I-{interlock['Interlock No']}", interlock['Tag No'], interlock['Service Description'], None,
+                interlock['Range'], interlock['Pre-Trip (H or L)'], interlock['Trip (HH or LL)'], None,
+                interlock['P & ID'],
+            ] + blank_values
+            styles = row_styles
+            if marks[row_idx]:
+                styles = styles.copy()
+                for idx in marks[row_idx]:
+                    values[9 + idx] = 'X'
+                    styles[9 + idx] = STYLE_X_MARK
+            page.set_row(DATA_START_ROW + row_idx - first, values, styles)
+        for row in range(HEADER_ROW, END_ROW + 1):
+            page.merge(row, 3, row, 4)
+            page.merge(row, 7, row, 8)
+        pages.append(page)
+
+    save_pages(output_file, list(zip(titles, pages)))
+    count(pages=len(pages), cells=len(pages) * END_ROW * (9 + len(effect_columns)))
+
+@profiled('generate_cause_effect_excel')
+def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, template_file=None, plc_name=PLC_NAME,
+                                streaming=False, direct=False):
+    """
+    Generate Cause & Effect Matrix Excel file using template if provided.
+
+    streaming=True writes the plain layout in constant memory (template_file is
+    ignored) - use it for matrices too large to hold as openpyxl cells.
+    direct=True fills the template by writing its sheet XML directly
+    (write_cause_effect_direct()) - same sheet, a fraction of the time.
+    """
     
-    # Collect all unique output effects
-    all_effects = set()
-    for interlock in interlocks:
-        all_effects.update(interlock['Effects'].keys())
+    # Intern every effect tag once; each interlock row becomes a bitset
+    matrix = CauseEffectMatrix.from_interlocks(interlocks)
 
-    effect_columns = sorted(list(all_effects), key=lambda x: (x.split(':')[0], int(x.split(':')[1].split('/')[0]), int(x.split('/')[1])))
+    effect_columns = sorted(matrix.used_effects(), key=address_sort_key)
+
+    marks = effect_marks(matrix, effect_columns)
+    count(rows=len(interlocks), effects=len(effect_columns), x_marks=matrix.count())
+
+    if streaming:
+        write_cause_effect_streaming(interlocks, marks, tag_descriptions, effect_columns, output_file)
+        print(f'✓ Cause & Effect Matrix saved to: {output_file}')
+        return
+
+    if direct and template_file:
+        write_cause_effect_direct(interlocks, marks, tag_descriptions, effect_columns, output_file, template_file,
+                                  plc_name)
+        print(f'✓ Cause & Effect Matrix saved to: {output_file}')
+        return
 
     if template_file:
-        # Copy template to output file and load it
-        shutil.copy(template_file, output_file)
-        wb = load_workbook(output_file)
+        # Fresh in-memory copy of the template (parsed once per process)
+        wb = load_template(template_file)
+        styles = WorkbookStyles(wb)
         ws = wb['TEMPLATE']
-        ws.title = 'Cause & Effect'
         
         # Template structure (based on analysis):
         # Row 15: Title area - put title in D15 (centered in large space)
@@ -764,6 +788,7 @@ def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, templ
         CAUSE_LABEL_ROW = 17     # Row with "CAUSE" label and Tag No
         HEADER_ROW = 18          # Row with column headers
         DATA_START_ROW = 19      # Data starts here (replacing example)
+        END_ROW = 67             # Merged C:D / G:H rows end here (PAGE_ROWS data rows, then padding)
         
         EFFECT_START_COL = 10    # Column J is where effects start
         
@@ -777,7 +802,7 @@ def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, templ
         
         # Clear A15 and put title in D15 with two lines
         ws.cell(row=TITLE_ROW, column=1, value='')  # Clear A15
-        title_cell = ws.cell(row=TITLE_ROW, column=4, value=f"CAUSE AND EFFECT MATRIX\n{PLC_NAME}")
+        title_cell = ws.cell(row=TITLE_ROW, column=4, value=f"CAUSE AND EFFECT MATRIX\n{plc_name}")
         title_cell.font = Font(bold=True, size=14)
         title_cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
         
@@ -800,107 +825,63 @@ def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, templ
         ws.cell(row=HEADER_ROW, column=7, value='Trip\n(HH or LL)')
         ws.cell(row=HEADER_ROW, column=8, value='')  # H18 empty
         
-        # Standard black font for data rows
-        black_font = Font(size=8, color='000000')
-        black_font_bold = Font(size=8, bold=True, color='000000')
-        
-        # Standard thin border
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
         # Write EFFECT headers (row 15 - effect descriptions) starting at column J
         for idx, tag in enumerate(effect_columns):
             col = EFFECT_START_COL + idx
-            cell = ws.cell(row=TITLE_ROW, column=col, value=tag_descriptions.get(tag, ''))
-            cell.font = black_font
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+            styles.apply(ws.cell(row=TITLE_ROW, column=col, value=tag_descriptions.get(tag, '')), STYLE_DATA_WRAP)
         
         # Write Tag No row (row 17 - effect tag numbers) starting at column J
         for idx, tag in enumerate(effect_columns):
             col = EFFECT_START_COL + idx
-            cell = ws.cell(row=CAUSE_LABEL_ROW, column=col, value=tag)
-            cell.font = black_font
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+            styles.apply(ws.cell(row=CAUSE_LABEL_ROW, column=col, value=tag), STYLE_DATA_CENTER)
         
-        # Write interlock data starting at row 19 (replacing example row)
-        for row_idx, interlock in enumerate(interlocks):
-            current_row = DATA_START_ROW + row_idx
-            
-            # Column mapping based on template:
-            # A=Interlock No, B=Tag No, C-D=Service Description (merged), 
-            # E=Range, F=Pre-Trip, G-H=Trip (merged), I=P&ID, J+=Effect columns
-            
-            # Write each column individually with proper formatting
-            # Column A - Interlock No
-            cell = ws.cell(row=current_row, column=1, value=f"I-{interlock['Interlock No']}")
-            cell.font = black_font
-            cell.border = thin_border
-            
-            # Column B - Tag No
-            cell = ws.cell(row=current_row, column=2, value=interlock['Tag No'])
-            cell.font = black_font
-            cell.border = thin_border
-            
-            # Column C - Service Description (will merge C:D after)
-            cell = ws.cell(row=current_row, column=3, value=interlock['Service Description'])
-            cell.font = black_font
-            cell.border = thin_border
-            
-            # Column D - For merge with C (set border)
-            cell = ws.cell(row=current_row, column=4)
-            cell.border = thin_border
-            
-            # Column E - Range
-            cell = ws.cell(row=current_row, column=5, value=interlock['Range'])
-            cell.font = black_font
-            cell.border = thin_border
-            
-            # Column F - Pre-Trip
-            cell = ws.cell(row=current_row, column=6, value=interlock['Pre-Trip (H or L)'])
-            cell.font = black_font
-            cell.border = thin_border
-            
-            # Column G - Trip (will merge G:H after)
-            cell = ws.cell(row=current_row, column=7, value=interlock['Trip (HH or LL)'])
-            cell.font = black_font
-            cell.border = thin_border
-            
-            # Column H - For merge with G (set border)
-            cell = ws.cell(row=current_row, column=8)
-            cell.border = thin_border
-            
-            # Column I - P & ID
-            cell = ws.cell(row=current_row, column=9, value=interlock['P & ID'])
-            cell.font = black_font
-            cell.border = thin_border
+        # Cause columns keep the template's alignment; D and H (merged into C
+        # and G) only get the border
+        cause_styles = [STYLE_DATA] * 3 + [STYLE_BORDERED] + [STYLE_DATA] * 3 + [STYLE_BORDERED] + [STYLE_DATA]
+        
+        # Title and header rows are ready: one copy of the sheet per PAGE_ROWS interlocks
+        pages = add_pages(ws, page_titles('Cause & Effect', len(interlocks)))
+        count(pages=len(pages))
+        for page_idx, ws in enumerate(pages):
+            first = page_idx * PAGE_ROWS
             
-            # Effect columns (J onwards)
-            for idx, effect_col in enumerate(effect_columns):
-                col = EFFECT_START_COL + idx
-                value = 'X' if effect_col in interlock['Effects'] else ''
-                cell = ws.cell(row=current_row, column=col, value=value)
-                cell.border = thin_border
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                if value == 'X':
-                    cell.font = black_font_bold
-                else:
-                    cell.font = black_font
+            # Write interlock data starting at row 19 (replacing example row)
+            for row_idx, interlock in enumerate(interlocks[first:first + PAGE_ROWS]):
+                current_row = DATA_START_ROW + row_idx
+                
+                # Column mapping based on template:
+                # A=Interlock No, B=Tag No, C-D=Service Description (merged), 
+                # E=Range, F=Pre-Trip, G-H=Trip (merged), I=P&ID, J+=Effect columns
+                # (D and H are the right halves of the C:D and G:H merges)
+                row_data = [
+                    f"I-{interlock['Interlock No']}",   # A
+                    interlock['Tag No'],                # B
+                    interlock['Service Description'],   # C
+                    None,                               # D
+                    interlock['Range'],                 # E
+                    interlock['Pre-Trip (H or L)'],     # F
+                    interlock['Trip (HH or LL)'],       # G
+                    None,                               # H
+                    interlock['P & ID'],                # I
+                ]
+                for col_idx, value in enumerate(row_data, 1):
+                    styles.apply(ws.cell(row=current_row, column=col_idx, value=value), cause_styles[col_idx - 1])
+                
+                # Effect columns (J onwards)
+                row_marks = set(marks[first + row_idx])
+                for idx in range(len(effect_columns)):
+                    col = EFFECT_START_COL + idx
+                    if idx in row_marks:
+                        styles.apply(ws.cell(row=current_row, column=col, value='X'), STYLE_X_MARK)
+                    else:
+                        styles.apply(ws.cell(row=current_row, column=col, value=''), STYLE_DATA_CENTER)
             
-        # Merge cells for ALL rows from 18 to 67 (header + data rows including empty ones)
-        END_ROW = 67
-        
-        # Merge C:D and G:H for header row and all data rows (18-67)
-        for row in range(HEADER_ROW, END_ROW + 1):
-            # Merge C:D for Service Description
-            ws.merge_cells(start_row=row, start_column=3, end_row=row, end_column=4)
-            # Merge G:H for Trip
-            ws.merge_cells(start_row=row, start_column=7, end_row=row, end_column=8)
+            # Merge C:D and G:H for header row and all data rows (18-67)
+            for row in range(HEADER_ROW, END_ROW + 1):
+                # Merge C:D for Service Description
+                ws.merge_cells(start_row=row, start_column=3, end_row=row, end_column=4)
+                # Merge G:H for Trip
+                ws.merge_cells(start_row=row, start_column=7, end_row=row, end_column=8)
         
     else:
         # Original behavior - create new workbook
@@ -991,7 +972,7 @@ def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, templ
         ws.row_dimensions[4].height = 20
 
         # Add interlock data
-        for interlock in interlocks:
+        for interlock, row_marks in zip(interlocks, marks):
             row_data = [
                 f"I-{interlock['Interlock No']}",
                 interlock['Tag No'],
@@ -1003,11 +984,10 @@ def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, templ
             ]
 
             # Add effect markers
-            for effect_col in effect_columns:
-                if effect_col in interlock['Effects']:
-                    row_data.append('X')
-                else:
-                    row_data.append('')
+            effect_cells = [''] * len(effect_columns)
+            for idx in row_marks:
+                effect_cells[idx] = 'X'
+            row_data.extend(effect_cells)
 
             ws.append(row_data)
 
@@ -1030,50 +1010,341 @@ def generate_cause_effect_excel(interlocks, tag_descriptions, output_file, templ
 
         # Set effect column widths (starting from H)
         for i, tag in enumerate(effect_columns):
-            col_letter = chr(ord('H') + i)
+            col_letter = get_column_letter(8 + i)
             ws.column_dimensions[col_letter].width = 20
 
+    count(cells=sum(sheet.max_row * sheet.max_column for sheet in wb.worksheets))
     wb.save(output_file)
     print(f'✓ Cause & Effect Matrix saved to: {output_file}')
 
+def extract_data(input_file, comment_store=None):
+    """
+    Extract rungs and tag descriptions from a PDF printout, a Studio 5000 L5X / L5K
+    export, or an RSLogix 500 ASCII export (.SLC with its .csv symbol database).
+
+    comment_store (L5X / L5K only) is a file to keep the tag comments in; the
+    descriptions are then a CommentStore decoded on lookup instead of a dict.
+    """
+    if input_file.lower().endswith('.l5x'):
+        # Stream tag comments and rung text from the Studio 5000 export
+        return extract_data_from_l5x(input_file, comment_store=comment_store)
+    if input_file.lower().endswith('.l5k'):
+        # Full-project text export, read one line at a time
+        return extract_data_from_l5k(input_file, comment_store=comment_store)
+    if input_file.lower().endswith('.slc'):
+        # Program rung text; descriptions from the database exported next to it
+        return extract_data_from_slc(input_file)
+    # Printout text layer, plus the database exported next to it when there is one
+    return extract_data_from_pdf(input_file)
+
+def load_program(input_file, use_cache=True, comment_store=False):
+    """
+    (rungs, tag_descriptions, cache_hit) for a PDF / L5X / L5K / SLC, from the parse cache when possible.
+
+    comment_store=True keeps an L5X / L5K's comments in an indexed, memory-mapped
+    store in the cache directory rather than in memory (full-controller exports).
+    """
+    parse, variant = extract_data, ''
+    if comment_store and input_file.lower().endswith(('.l5x', '.l5k')):
+        variant = 'comments'
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        store_path = os.path.join(CACHE_DIR, cache_key(input_file, variant) + '.comments')
+        parse = functools.partial(extract_data, comment_store=store_path)
+    elif input_file.lower().endswith(('.slc', '.pdf')):
+        # Descriptions (also) come from a second file; a new database is a new parse
+        database = symbol_database_for(input_file)
+        if database:
+            variant = 'symbols-' + file_sha256(database)[:16]
+    if not use_cache:
+        return (*parse(input_file), False)
+    return cached_parse(input_file, parse, variant=variant)
+
+def write_outputs(alarms, interlocks, tag_descriptions, plc_name=PLC_NAME, output_dir='', streaming=False,
+                  force=False, direct=False):
+    """
+    Write both workbooks, skipping any whose content is unchanged since the last run.
+
+    A fingerprint of everything each workbook is rendered from (rows, effect
+    descriptions, PLC name, template) is kept in a sidecar manifest together
+    with a snapshot of the alarms, interlocks and X cells. When the content
+    changed, the differences are written to Changes_<PLC>.json; otherwise a
+    Changes_<PLC>.json left by an earlier run is removed.
+
+    Returns:
+        {'outputs': [alarm, C&E], 'written': [paths rewritten], 'changes': diff or None}
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    alarm_output, cause_effect_output = output_paths(plc_name, output_dir)
+    manifest_file, changes_file = manifest_paths(plc_name, output_dir)
+    previous = load_manifest(manifest_file)
+
+    effect_descriptions = {
+        effect: tag_descriptions.get(effect, '') for interlock in interlocks for effect in interlock['Effects']
+    }
+    fingerprints = {
+        'alarm_summary': fingerprint(alarms, plc_name, file_sha256(ALARM_SUMMARY_TEMPLATE)),
+        'cause_effect': fingerprint(interlocks, effect_descriptions, plc_name, streaming,
+                                    file_sha256(CAUSE_EFFECT_TEMPLATE)),
+    }
+
+    def unchanged(key, output_file):
+        return not force and previous.get(key) == fingerprints[key] and os.path.exists(output_file)
+
+    written = []
+    if unchanged('alarm_summary', alarm_output):
+        print(f'✓ Alarm Summary unchanged: {alarm_output}')
+    else:
+        generate_alarm_summary_excel(alarms, alarm_output, template_file=ALARM_SUMMARY_TEMPLATE, plc_name=plc_name,
+                                     direct=direct)
+        written.append(alarm_output)
+    if unchanged('cause_effect', cause_effect_output):
+        print(f'✓ Cause & Effect Matrix unchanged: {cause_effect_output}')
+    else:
+        generate_cause_effect_excel(interlocks, tag_descriptions, cause_effect_output,
+                                    template_file=CAUSE_EFFECT_TEMPLATE, plc_name=plc_name, streaming=streaming,
+                                    direct=direct)
+        written.append(cause_effect_output)
+
+    current = snapshot(alarms, interlocks)
+    changes = None
+    if 'snapshot' in previous:
+        changes = diff_snapshots(previous['snapshot'], current)
+        if diff_is_empty(changes):
+            changes = None
+        else:
+            with open(changes_file, 'w', encoding='utf-8') as f:
+                json.dump(changes, f, indent=2, ensure_ascii=False)
+            print(f"✓ Changes since last run: "
+                  f"+{len(changes['alarms']['added'])}/-{len(changes['alarms']['removed'])} alarms, "
+                  f"+{len(changes['interlocks']['added'])}/-{len(changes['interlocks']['removed'])} interlocks, "
+                  f"+{len(changes['cells']['added'])}/-{len(changes['cells']['removed'])} X cells "
+                  f"-> {changes_file}")
+    if changes is None:
+        # A Changes file from an earlier run no longer describes the outputs
+        try:
+            os.remove(changes_file)
+        except FileNotFoundError:
+            pass
+
+    save_manifest(manifest_file, dict(fingerprints, plc=plc_name, snapshot=current))
+    return {'outputs': [alarm_output, cause_effect_output], 'written': written, 'changes': changes}
+
+def prepare_plc(input_file, use_cache=True, transitive=False, alarm_rules=ALARM_RULES_FILE, comment_store=False,
+                voting=False):
+    """
+    Extract and build one PLC without writing anything.
+
+    Returns:
+        {'rungs', 'tags', 'cache_hit'} counts, 'warnings' (options that could
+        not apply to this input), plus the 'alarms' and 'interlocks' rows and
+        the 'effect_descriptions' ({effect tag: description}) that
+        write_outputs() needs - small enough to hand to another process
+    """
+    with stage('extract') as record:
+        rungs, tag_descriptions, cache_hit = load_program(input_file, use_cache, comment_store)
+        record.update(rungs=len(rungs), tags=len(tag_descriptions), cache_hit=cache_hit)
+
+    warnings = []
+    warning = voting_warning(rungs) if voting else None
+    if warning:
+        warnings.append(warning)
+        transitive, voting = True, False
+
+    alarms = build_alarm_summary(tag_descriptions, load_rules(alarm_rules))
+    interlocks = build_cause_effect_matrix(rungs, tag_descriptions, transitive=transitive, voting=voting)
+
+    return {
+        'rungs': len(rungs),
+        'tags': len(tag_descriptions),
+        'cache_hit': cache_hit,
+        'warnings': warnings,
+        'alarms': alarms,
+        'interlocks': interlocks,
+        'effect_descriptions': {
+            effect: tag_descriptions.get(effect, '') for interlock in interlocks for effect in interlock['Effects']
+        },
+    }
+
+def convert_plc(input_file, plc_name=PLC_NAME, output_dir='', use_cache=True, streaming=False, transitive=False,
+                force=False, alarm_rules=ALARM_RULES_FILE, comment_store=False, direct=False, voting=False):
+    """
+    Run the whole conversion for one PLC: extract, build, and write both workbooks.
+
+    streaming=True writes the C&E matrix in the plain layout with a write-only
+    workbook instead of the STX template (for very large matrices); transitive=True
+    traces physical inputs to outputs through internal bits; force=True rewrites
+    workbooks even when their content is unchanged; alarm_rules is the JSON
+    rule file classifying alarm tags; comment_store=True keeps L5X comments on
+    disk (see load_program()); direct=True fills the templates by writing their
+    sheet XML directly instead of through openpyxl; voting=True groups k-out-of-N
+    voting inputs onto one row per vote (see build_transitive_interlocks()).
+
+    Returns:
+        Summary dict with counts and the output file paths
+    """
+    plc = prepare_plc(input_file, use_cache, transitive, alarm_rules, comment_store, voting)
+    result = write_outputs(plc['alarms'], plc['interlocks'], plc['effect_descriptions'], plc_name, output_dir,
+                           streaming=streaming, force=force, direct=direct)
+
+    return {
+        'rungs': plc['rungs'],
+        'tags': plc['tags'],
+        'alarms': len(plc['alarms']),
+        'interlocks': len(plc['interlocks']),
+        'cache_hit': plc['cache_hit'],
+        'warnings': plc['warnings'],
+        'outputs': result['outputs'],
+        'written': result['written'],
+        'changes': result['changes'],
+    }
+
+def print_verification(results):
+    """Summarise verify_interlocks() results: marked effects the simulated logic does / does not drive"""
+    confirmed = sum(len(result['confirmed']) for result in results)
+    missing = [result for result in results if result['missing']]
+    print(f'      ✓ Simulation confirms {confirmed} marked effect(s)')
+    if missing:
+        print(f"      ⚠ {sum(len(result['missing']) for result in missing)} marked effect(s) "
+              f'not driven by their cause alone:')
+        for result in missing[:10]:
+            line = f"        #{result['Interlock No']} {result['Tag No']}"
+            if result['Rung']:
+                line += f" (rung {result['Rung']})"
+            line += f": {', '.join(result['missing'])}"
+            partners = result.get('with_second_cause')
+            if partners:
+                line += f' (with a second cause: {sum(len(causes) for causes in partners.values())} pair(s))'
+            print(line)
+        if len(missing) > 10:
+            print(f'        ... and {len(missing) - 10} more interlock(s)')
+
 def main():
     """Main execution function"""
+    # 'batch' sub-command converts a directory or manifest of PLC exports in parallel
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        from batch_convert import main as batch_main
+        return batch_main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(
+        description='Convert RSLogix ladder logic to Alarm Summary and C&E workbooks',
+        epilog='Use "%(prog)s batch --help" to convert many PLCs in parallel.')
+    parser.add_argument('input_file', nargs='?', default=PDF_FILE, help='PDF printout, .L5X / .L5K export, or RSLogix 500 .SLC export')
+    parser.add_argument('--plc-name', default=PLC_NAME, help='PLC name used in titles and output file names')
+    parser.add_argument('--no-cache', action='store_true', help='re-parse even if the input is unchanged')
+    parser.add_argument('--streaming', action='store_true',
+                        help='write the C&E matrix in constant memory (plain layout, no template)')
+    parser.add_argument('--direct', action='store_true',
+                        help='fill the templates by writing their sheet XML directly (much faster for large matrices)')
+    parser.add_argument('--transitive', action='store_true',
+                        help='trace physical inputs to outputs through internal bits across rungs')
+    parser.add_argument('--voting', action='store_true',
+                        help='like --transitive, with k-out-of-N voting inputs on one row per vote (e.g. 2oo6)')
+    parser.add_argument('--force', action='store_true', help='rewrite the workbooks even if their content is unchanged')
+    parser.add_argument('--verify', nargs='?', const='single', choices=('single', 'pairs'),
+                        help='simulate the logic and check that each cause drives its marked effects '
+                             '(pairs: also try every second cause for effects one cause does not drive)')
+    parser.add_argument('--xref', action='store_true',
+                        help='also write a cross reference workbook (where each address is read / written / timed)')
+    parser.add_argument('--comment-store', action='store_true',
+                        help='keep L5X tag comments in an on-disk index instead of memory (very large exports)')
+    parser.add_argument('--alarm-rules', default=ALARM_RULES_FILE, metavar='JSON',
+                        help='alarm classification rules (default: %(default)s)')
+    parser.add_argument('--profile', nargs='?', const='', metavar='JSONL',
+                        help='print per-stage time / memory / counts; with a file, also append them as JSON lines')
+    args = parser.parse_args()
+    input_file = args.input_file
+    plc_name = args.plc_name
+    if args.profile is not None:
+        start_profiling(plc=plc_name, input=input_file)
+
     print('═' * 70)
     print('  RSLogix 500 FIRE SYSTEM PARSER')
-    print(f'  {PLC_NAME}')
+    print(f'  {plc_name}')
     print('═' * 70)
 
-    # Extract data from PDF
-    print('\n[1/4] Extracting ladder logic from PDF...')
-    rungs, tag_descriptions = extract_data_from_pdf()
+    # Extract data from PDF / L5X (unchanged inputs are served from the parse cache)
+    print(f'\n[1/4] Extracting ladder logic from {input_file}...')
+    with stage('extract') as record:
+        rungs, tag_descriptions, cache_hit = load_program(input_file, not args.no_cache, args.comment_store)
+        record.update(rungs=len(rungs), tags=len(tag_descriptions), cache_hit=cache_hit)
+    if cache_hit:
+        print('      ✓ Input unchanged - loaded from parse cache')
     print(f'      ✓ Extracted {len(rungs)} ladder rungs')
     print(f'      ✓ Loaded {len(tag_descriptions)} tag descriptions')
 
     # Build alarm summary
     print('\n[2/4] Building alarm summary...')
-    alarms = build_alarm_summary(tag_descriptions)
+    alarms = build_alarm_summary(tag_descriptions, load_rules(args.alarm_rules))
     print(f'      ✓ Found {len(alarms)} alarm tags')
 
     # Build cause & effect matrix
     print('\n[3/4] Building cause & effect matrix...')
-    interlocks = build_cause_effect_matrix(rungs, tag_descriptions)
+    transitive, voting = args.transitive, args.voting
+    warning = voting_warning(rungs) if voting else None
+    if warning:
+        print(f'      ⚠ {warning}')
+        transitive, voting = True, False
+    interlocks = build_cause_effect_matrix(rungs, tag_descriptions, transitive=transitive, voting=voting)
     print(f'      ✓ Found {len(interlocks)} interlocks')
+    if voting:
+        print(f"      ✓ {sum(1 for interlock in interlocks if 'Vote' in interlock)} voting group(s)")
+    guessed = sum(1 for rung in rungs if not has_logic(rung))
+    if args.verify and guessed:
+        # Simulating series XICs in place of the real branches reports false misses
+        print(f'      ⚠ --verify skipped: {guessed} rung(s) have no rung text (PDF printout), so their branches '
+              f'and XIC / XIO are unknown - verify an L5X / L5K / .SLC export instead')
+    elif args.verify:
+        with stage('verify') as record:
+            results = verify_interlocks(rungs, interlocks, pairs=args.verify == 'pairs')
+            record.update(interlocks=len(results))
+        print_verification(results)
+    if args.xref:
+        with stage('xref') as record:
+            xref = CrossReference(rungs, tag_descriptions)
+            record.update(addresses=len(xref))
+        print(f'      ✓ Cross reference: {len(xref)} addresses')
+        if xref.duplicate_coils:
+            print(f'      ⚠ {len(xref.duplicate_coils)} coil(s) written by more than one OTE:')
+            for address, rung_numbers in list(xref.duplicate_coils.items())[:10]:
+                print(f"        {address}: rungs {', '.join(rung_numbers)}")
+        if xref.unused:
+            print(f'      ⚠ {len(xref.unused)} commented tag(s) not used by any rung')
 
     # Generate Excel files using templates
     print('\n[4/4] Generating Excel files from templates...')
     print(f'      Using Alarm Summary template: {ALARM_SUMMARY_TEMPLATE}')
-    print(f'      Using Cause & Effect template: {CAUSE_EFFECT_TEMPLATE}')
+    if args.streaming:
+        print('      Streaming Cause & Effect matrix (plain layout)')
+    else:
+        print(f'      Using Cause & Effect template: {CAUSE_EFFECT_TEMPLATE}')
     
-    generate_alarm_summary_excel(alarms, ALARM_SUMMARY_OUTPUT, template_file=ALARM_SUMMARY_TEMPLATE)
-    generate_cause_effect_excel(interlocks, tag_descriptions, CAUSE_EFFECT_OUTPUT, template_file=CAUSE_EFFECT_TEMPLATE)
+    result = write_outputs(alarms, interlocks, tag_descriptions, plc_name,
+                           streaming=args.streaming, force=args.force, direct=args.direct)
+    alarm_output, cause_effect_output = result['outputs']
+    if args.xref:
+        xref_output = cross_reference_path(plc_name)
+        write_cross_reference_excel(xref, tag_descriptions, xref_output)
 
     print('\n' + '═' * 70)
     print('  PROCESSING COMPLETE!')
     print('═' * 70)
-    print('\nOutput files created:')
-    print(f'  ├─ {ALARM_SUMMARY_OUTPUT}')
-    print(f'  └─ {CAUSE_EFFECT_OUTPUT}')
+    print('\nOutput files:' if result['written'] else '\nOutput files (unchanged, not rewritten):')
+    print(f'  ├─ {alarm_output}')
+    if args.xref:
+        print(f'  ├─ {cause_effect_output}')
+        print(f'  └─ {xref_output}')
+    else:
+        print(f'  └─ {cause_effect_output}')
     print('')
 
+    if args.profile is not None:
+        profiler = stop_profiling()
+        print(profiler.table())
+        if args.profile:
+            profiler.write_jsonl(args.profile)
+            print(f'\nProfile appended to: {args.profile}')
+        print('')
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+RSLogix 500 PDF Report Extractor
+Reads rung numbers, addresses and descriptions from the text layer of a ladder printout
+"""
+
+import contextlib
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pypdf import PdfReader
+from slc_parser import load_symbol_database, symbol_database_for
+from tag_address import element_of
+
+# Pages handed to each worker task - large enough to amortize opening the PDF
+PAGES_PER_TASK = 16
+
+# Below this many pages the process pool costs more than it saves
+MIN_PAGES_FOR_POOL = 32
+
+# One classification regex per text-layer line; the matching group name is the line kind
+_LINE_RE = re.compile(
+    r'(?P<header>.+\.RSS|LAD \d+ - .*|Page \d+\s+\w+day, .*)'
+    r'|(?P<watermark>.*(?:PDF document was edited with|Icecream PDF Editor|to remove watermark).*)'
+    r'|(?P<end>\d{4} END)'
+    r'|(?P<rung>\d{4})'
+    r'|(?P<address>(?:[IOSU]|[BTCRNFLA]\d+):\d+(?:\.\d+)?)'
+    r'|(?P<block_address>(?:Timer|Counter|Control|MSG File) #?(?P<block_target>[A-Z]+\d+:\d+))'
+    r'|(?P<block_param>(?:Time Base|Preset|Accum|Length|Position|Source|Dest|Setup Screen)\b.*)'
+    r'|(?P<mnemonic>TON|TOF|RTO|CTU|CTD|RES|MSG|COP|FLL|MOV|MVM|CPT|ADD|SUB|MUL|DIV|EQU|NEQ|GRT|LES|GEQ|LEQ|LIM|OSR|ONS|JSR|RET|PID|SQO|SQC|BSL|BSR)'
+    r'|(?P<status>EN|DN|TT|CU|CD|OV|UN|ER|XIC|XIO|OTE|OTL|OTU)'
+    r'|(?P<bit>\d{1,3})'
+    r'|(?P<module>Bul\.\d+|\d{4}-[A-Z0-9]+)'
+    r'|(?P<cross_ref>[A-Z]/\d+)'
+)
+
+def _new_fragment(number, title):
+    """Start a rung fragment (number is None for a rung continued from the previous page)"""
+    return {'rung': number, 'title': title, 'elements': [], 'timer': None, 'counter': None}
+
+def parse_page_text(text):
+    """
+    Parse the text layer of one report page into rung fragments.
+
+    Each element is [address, description lines, is_output]. A line holding a
+    single space is the report's marker for an output coil; every element after
+    it in the same rung is an output.
+
+    Returns:
+        List of fragment dicts in page order
+    """
+    fragments = []
+    fragment = None
+    element = None         # element whose description lines are being collected
+    pending = None         # (file:word) waiting for its bit / status suffix
+    output_side = False
+    in_block = None        # mnemonic of the open output block (TON, CTU, MSG, ...)
+    title = []
+
+    def finish_pending():
+        nonlocal pending, element
+        if pending is not None:
+            element = [pending, [], output_side]
+            fragment['elements'].append(element)
+            pending = None
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            if raw and fragment is not None:
+                # Whitespace-only line - output coil marker
+                finish_pending()
+                output_side = True
+                element = None
+            continue
+
+        match = _LINE_RE.fullmatch(line)
+        kind = match.lastgroup if match else None
+
+        if kind in ('header', 'watermark'):
+            continue
+
+        if pending is not None:
+            if kind == 'bit':
+                element = [f'{pending}/{line}', [], output_side]
+                fragment['elements'].append(element)
+                pending = None
+                continue
+            if kind == 'status':
+                element = [f'{pending}/{line}', [], output_side]
+                fragment['elements'].append(element)
+                pending = None
+                continue
+            finish_pending()
+
+        if kind in ('rung', 'end'):
+            fragment = _new_fragment(line[:4], ' '.join(title))
+            fragments.append(fragment)
+            title = []
+            element = None
+            output_side = False
+            in_block = None
+            if kind == 'end':
+                fragment = None
+            continue
+
+        if fragment is None:
+            if kind is None:
+                # Rung title printed above the rung number
+                title.append(line)
+                continue
+            # Elements before the first rung number continue the previous page's rung
+            fragment = _new_fragment(None, '')
+            fragments.append(fragment)
+
+        if in_block is not None:
+            if kind == 'block_address':
+                target = match.group('block_target')
+                element = [target, [], True]
+                if line.startswith('Timer') and fragment['timer'] is None:
+                    fragment['timer'] = target
+                elif line.startswith('Counter') and fragment['counter'] is None:
+                    fragment['counter'] = target
+            elif kind == 'mnemonic' and line == in_block:
+                # Closing mnemonic - description lines of the block's address follow
+                in_block = None
+                if element is None or element[0] not in (fragment['timer'], fragment['counter']):
+                    element = None
+                elif element not in fragment['elements']:
+                    fragment['elements'].append(element)
+            continue
+
+        if kind == 'address':
+            pending = line
+            element = None
+        elif kind == 'mnemonic':
+            in_block = line
+            element = None
+        elif kind is None:
+            if element is not None:
+                element[1].append(line)
+            elif not fragment['elements']:
+                title.append(line)
+        # status / module / cross_ref / bit / block_param lines carry no description
+
+    if pending is not None and fragment is not None:
+        finish_pending()
+    if title and fragments and fragments[-1]['rung'] is not None:
+        # Title at the foot of a page belongs to the rung on the next page
+        fragments.append(_new_fragment('', ' '.join(title)))
+    return fragments
+
+@contextlib.contextmanager
+def _quiet_pypdf():
+    """
+    Raise the pypdf logger to ERROR while a report is read, then restore it.
+    Printouts edited after export often carry a malformed xref trailer; pypdf
+    recovers but logs a warning for every reader opened.
+    """
+    logger = logging.getLogger('pypdf')
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+def _extract_pages(task):
+    """Worker: extract and parse a run of pages, returning (page index, fragments) pairs"""
+    pdf_file, page_indexes = task
+    with _quiet_pypdf():
+        reader = PdfReader(pdf_file)
+        return [(index, parse_page_text(reader.pages[index].extract_text() or '')) for index in page_indexes]
+
+def iter_page_fragments(pdf_file, max_workers=None):
+    """
+    Yield (page index, fragments) for every page of a report, in page order.
+
+    Pages are split into runs of PAGES_PER_TASK and parsed in a process pool;
+    executor.map() returns the runs in submission order so the merge is
+    deterministic regardless of which worker finishes first.
+    """
+    with _quiet_pypdf():
+        page_count = len(PdfReader(pdf_file).pages)
+    tasks = [
+        (pdf_file, range(start, min(start + PAGES_PER_TASK, page_count)))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+
+    if max_workers == 1 or page_count < MIN_PAGES_FOR_POOL:
+        for task in tasks:
+            yield from _extract_pages(task)
+        return
+
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for pages in executor.map(_extract_pages, tasks):
+            yield from pages
+
+def extract_data_from_pdf_report(pdf_file, max_workers=None, database=None):
+    """
+    Extract ladder rungs and tag descriptions from an RSLogix 500 PDF printout.
+
+    The printout only shows the descriptions of addresses a rung uses and that
+    carry a comment; an address / symbol database exported with it fills in
+    the rest (the printout's text wins where both describe an address).
+
+    Args:
+        pdf_file: path of the PDF report (must have a text layer)
+        max_workers: process pool size (default: CPU count, 1 = no pool)
+        database: path of the address / symbol CSV database export (default:
+                  the .csv with the same name, when there is one)
+
+    Returns:
+        (rungs, tag_descriptions) in the same structures as extract_data_from_pdf()
+    """
+    rungs = []
+    tag_descriptions = {}
+    pending_title = ''
+
+    for _, fragments in iter_page_fragments(pdf_file, max_workers):
+        for fragment in fragments:
+            if fragment['rung'] == '':
+                pending_title = fragment['title']
+                continue
+            if fragment['rung'] is None and rungs:
+                rung = rungs[-1]
+            else:
+                rung = {
+                    'rung': fragment['rung'] or f'{len(rungs):04d}',
+                    'inputs': [],
+                    'outputs': [],
+                    'description': fragment['title'] or pending_title,
+                }
+                rungs.append(rung)
+                pending_title = ''
+
+            for address, lines, is_output in fragment['elements']:
+                if lines:
+                    # Timer/counter status bits share the element's description
+                    key = element_of(address)
+                    tag_descriptions.setdefault(key, ' '.join(lines))
+                if address in (fragment['timer'], fragment['counter']):
+                    continue
+                (rung['outputs'] if is_output else rung['inputs']).append(address)
+
+            if fragment['timer'] and 'timer' not in rung:
+                rung['timer'] = fragment['timer']
+            if fragment['counter'] and 'counter' not in rung:
+                rung['counter'] = fragment['counter']
+
+    database = database or symbol_database_for(pdf_file)
+    if database:
+        for address, text in load_symbol_database(database).items():
+            tag_descriptions.setdefault(address, text)
+
+    # Page titles are not positioned reliably in the text layer, so a rung is
+    # described by its first output and only falls back to the title
+    for rung in rungs:
+        if rung['outputs'] and rung['outputs'][0] in tag_descriptions:
+            rung['description'] = tag_descriptions[rung['outputs'][0]]
+
+    # The END rung carries no logic
+    if rungs and not rungs[-1]['inputs'] and not rungs[-1]['outputs']:
+        rungs.pop()
+
+    return rungs, tag_descriptions
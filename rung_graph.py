@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Rung Dependency Graph
+Links every rung's inputs to its outputs and precomputes transitive reachability through internal bits
+"""
+
+from rung_parser import rung_label
+from tag_address import element_of
+
+def _rung_writes(rung):
+    """Nodes a rung drives: coil outputs plus its timer / counter element"""
+    writes = [element_of(tag) for tag in rung['outputs']]
+    for key in ('timer', 'counter'):
+        if key in rung:
+            writes.append(element_of(rung[key]))
+    return writes
+
+class RungGraph:
+    """
+    Directed graph tag -> tag with an edge from every input of a rung to every
+    node it writes. Timer / counter / control status bits (T4:16/DN) share the
+    node of their element, which the TON / CTU instruction writes.
+
+    Strongly connected components are found once (iterative Tarjan, so deep
+    chains do not hit the recursion limit); their order is a topological order
+    of the condensed graph, and reachability is computed over it as one int
+    bitset per component. Any component with more than one node, or a node
+    that feeds itself (a seal-in rung), is reported as a cycle.
+    """
+
+    def __init__(self, rungs):
+        self.nodes = []          # node index -> tag
+        self._index = {}         # tag -> node index
+        successors = []
+
+        def node(tag):
+            index = self._index.get(tag)
+            if index is None:
+                index = self._index[tag] = len(self.nodes)
+                self.nodes.append(tag)
+                successors.append(set())
+            return index
+
+        self.writers = {}        # tag -> labels of the rungs driving it
+        for rung in rungs:
+            written = _rung_writes(rung)
+            for tag in written:
+                self.writers.setdefault(tag, []).append(rung_label(rung))
+            writes = [node(tag) for tag in written]
+            for tag in rung['inputs']:
+                source = node(element_of(tag))
+                successors[source].update(writes)
+
+        self.successors = [sorted(targets) for targets in successors]
+        self._components, self._component_of = self._strongly_connected()
+        self._reach = self._reachability()
+
+    def _strongly_connected(self):
+        """Tarjan's algorithm without recursion; components come out in reverse topological order"""
+        successors = self.successors
+        count = len(self.nodes)
+        index_of = [-1] * count
+        lowlink = [0] * count
+        on_stack = [False] * count
+        stack = []
+        components = []
+        component_of = [0] * count
+        next_index = 0
+
+        for root in range(count):
+            if index_of[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work.pop()
+                if child == 0:
+                    index_of[node] = lowlink[node] = next_index
+                    next_index += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                targets = successors[node]
+                while child < len(targets):
+                    target = targets[child]
+                    child += 1
+                    if index_of[target] == -1:
+                        # Descend; resume this node at the next child afterwards
+                        work.append((node, child))
+                        work.append((target, 0))
+                        break
+                    if on_stack[target]:
+                        lowlink[node] = min(lowlink[node], index_of[target])
+                else:
+                    if lowlink[node] == index_of[node]:
+                        members = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component_of[member] = len(components)
+                            members.append(member)
+                            if member == node:
+                                break
+                        components.append(members)
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+        return components, component_of
+
+    def _reachability(self):
+        """Bitset of nodes reachable from each component, successors first"""
+        component_of = self._component_of
+        member_bits = []
+        for members in self._components:
+            bits = 0
+            for member in members:
+                bits |= 1 << member
+            member_bits.append(bits)
+
+        reach = [0] * len(self._components)
+        for component, members in enumerate(self._components):
+            bits = 0
+            for member in members:
+                for target in self.successors[member]:
+                    other = component_of[target]
+                    if other == component:
+                        # Cycle (or seal-in): the component reaches itself
+                        bits |= member_bits[component]
+                    else:
+                        bits |= member_bits[other] | reach[other]
+            reach[component] = bits
+        return reach
+
+    def __contains__(self, tag):
+        return element_of(tag) in self._index
+
+    def topological_order(self):
+        """Tags ordered so every rung's inputs come before what it writes (cycles kept together)"""
+        nodes = self.nodes
+        return [nodes[member] for members in reversed(self._components) for member in sorted(members)]
+
+    def cycles(self):
+        """Lists of tags that feed back into themselves (seal-ins, latches, loops)"""
+        nodes = self.nodes
+        found = []
+        for members in reversed(self._components):
+            if len(members) > 1 or members[0] in self.successors[members[0]]:
+                found.append([nodes[member] for member in sorted(members)])
+        return found
+
+    def reachable(self, tag):
+        """Every tag whose state depends, directly or through other rungs, on tag"""
+        index = self._index.get(element_of(tag))
+        if index is None:
+            return []
+        bits = self._reach[self._component_of[index]]
+        nodes = self.nodes
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(nodes[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+    def trips(self, is_cause, is_effect):
+        """
+        Transitive cause -> effect pairs, e.g. field input -> field output.
+
+        Args:
+            is_cause: predicate selecting the cause tags (graph sources of interest)
+            is_effect: predicate selecting the effect tags
+
+        Returns:
+            List of (cause, [effects]) in first-seen order, causes with no effect omitted
+        """
+        effect_mask = 0
+        for index, tag in enumerate(self.nodes):
+            if is_effect(tag):
+                effect_mask |= 1 << index
+
+        nodes = self.nodes
+        result = []
+        for index, tag in enumerate(nodes):
+            if not is_cause(tag):
+                continue
+            bits = self._reach[self._component_of[index]] & effect_mask
+            effects = []
+            while bits:
+                low = bits & -bits
+                effects.append(nodes[low.bit_length() - 1])
+                bits ^= low
+            if effects:
+                result.append((tag, effects))
+        return result
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Rung Text Parser
+Tokenizes Logix neutral rung text (RLL) and builds a compact series/parallel AST
+"""
+
+import re
+from collections import namedtuple
+from tag_address import normalize_address
+
+# AST nodes - a rung (and every branch leg) is a tuple of nodes in series
+Instruction = namedtuple('Instruction', ['mnemonic', 'operands'])
+Branch = namedtuple('Branch', ['legs'])
+
+# Instruction groups used to derive inputs / outputs from the AST
+INPUT_INSTRUCTIONS = frozenset(('XIC', 'XIO'))
+OUTPUT_INSTRUCTIONS = frozenset(('OTE', 'OTL', 'OTU'))
+TIMER_INSTRUCTIONS = frozenset(('TON', 'TOF', 'RTO'))
+COUNTER_INSTRUCTIONS = frozenset(('CTU', 'CTD'))
+
+# Commas that are not inside [...] array subscripts
+_OPERAND_SPLIT_RE = re.compile(r',(?![^\[]*\])')
+
+class RungSyntaxError(ValueError):
+    """Raised when rung text is not well-formed RLL"""
+
+def _split_operands(args):
+    """Split an instruction's operand string into a tuple of stripped operands"""
+    if not args:
+        return ()
+    if '[' in args and ',' in args:
+        parts = _OPERAND_SPLIT_RE.split(args)
+    else:
+        parts = args.split(',')
+    return tuple(part.strip() for part in parts)
+
+# namedtuple.__new__ goes through a Python-level wrapper; building the nodes
+# with tuple.__new__ directly roughly halves the per-instruction cost
+_new_node = tuple.__new__
+
+def parse_rung(text):
+    """
+    Parse one rung of neutral text into a tuple of Instruction / Branch nodes.
+
+    The text is scanned once: it is split on ')' so every piece is
+    '<branch chars><MNEMONIC>(<operands>' and only the few '[', ',' and ']'
+    characters between instructions are looked at one by one. Operands holding
+    nested parentheses (CPT/CMP expressions) are re-joined with the pieces
+    that follow until the parentheses balance.
+
+    Example:
+        '[XIC(A) ,XIC(B) ]OTE(C);' ->
+        (Branch(legs=((Instruction('XIC', ('A',)),), (Instruction('XIC', ('B',)),))),
+         Instruction('OTE', ('C',)))
+
+    Raises:
+        RungSyntaxError: on unbalanced branches or parentheses, or unrecognised text
+    """
+    series = []          # current leg being filled
+    stack = []           # saved (outer series, legs of open branch)
+    legs = None          # legs of the innermost open branch
+    pieces = text.split(')')
+    last = len(pieces) - 1
+    index = 0
+    mnemonic = None
+    pieces_iter = iter(pieces)
+
+    for piece in pieces_iter:
+        if index == last:
+            # Trailing piece - only branch closes and ';' are allowed
+            head = piece
+            mnemonic = None
+        else:
+            index += 1
+            head, sep, args = piece.partition('(')
+            if not sep:
+                raise RungSyntaxError(f'Unbalanced ")" in rung: {text!r}')
+            if '(' in args:
+                depth = args.count('(')
+                for follow in pieces_iter:
+                    if index == last:
+                        break
+                    index += 1
+                    args = args + ')' + follow
+                    depth += follow.count('(') - 1
+                    if not depth:
+                        break
+                if depth:
+                    raise RungSyntaxError(f'Unbalanced "(" in rung: {text!r}')
+            mnemonic = head.lstrip(' [,]')
+            if not mnemonic.isidentifier():
+                raise RungSyntaxError(f'Unrecognised instruction {mnemonic!r} in rung: {text!r}')
+            head = head[:-len(mnemonic)]
+
+        for char in head:
+            if char == '[':
+                stack.append((series, legs))
+                legs = []
+                series = []
+            elif char == ',':
+                if legs is None:
+                    raise RungSyntaxError(f'Branch separator outside a branch in rung: {text!r}')
+                legs.append(tuple(series))
+                series = []
+            elif char == ']':
+                if legs is None:
+                    raise RungSyntaxError(f'Unbalanced "]" in rung: {text!r}')
+                legs.append(tuple(series))
+                branch = _new_node(Branch, (tuple(legs),))
+                series, legs = stack.pop()
+                series.append(branch)
+            elif char == ';':
+                if legs is not None or mnemonic is not None:
+                    raise RungSyntaxError(f'Unexpected ";" in rung: {text!r}')
+            elif not char.isspace():
+                raise RungSyntaxError(f'Unrecognised rung text {head.strip()!r} in rung: {text!r}')
+
+        if mnemonic is not None:
+            if ',' in args:
+                operands = _split_operands(args)
+            elif args:
+                operands = (args.strip(),)
+            else:
+                operands = ()
+            series.append(_new_node(Instruction, (mnemonic, operands)))
+
+    if legs is not None:
+        raise RungSyntaxError(f'Unclosed branch in rung: {text!r}')
+    return tuple(series)
+
+def iter_instructions(nodes):
+    """Yield every Instruction in an AST in left-to-right order"""
+    for node in nodes:
+        if type(node) is Instruction:
+            yield node
+        else:
+            for leg in node.legs:
+                yield from iter_instructions(leg)
+
+def _has_parallel_inputs(nodes):
+    """True if any branch before the first output holds input instructions on two or more legs"""
+    for node in nodes:
+        if type(node) is Instruction:
+            if node.mnemonic in OUTPUT_INSTRUCTIONS:
+                return False
+            continue
+        input_legs = 0
+        for leg in node.legs:
+            if any(ins.mnemonic in INPUT_INSTRUCTIONS for ins in iter_instructions(leg)):
+                input_legs += 1
+        if input_legs > 1:
+            return True
+    return False
+
+def rung_from_text(number, text, comment='', routine=''):
+    """
+    Build a rung dictionary (same shape as extract_data_from_pdf()) from rung text.
+
+    'inputs' holds the XIC/XIO operands, 'outputs' the OTE/OTL/OTU operands, and
+    'timer' / 'counter' / 'logic_type' are set the same way the hand-built
+    tables use them ('XIO' when every examine is XIO, 'OR' for parallel inputs).
+    'routine' names the routine / program file the rung is in, since rung
+    numbers restart in each one.
+    """
+    ast = parse_rung(text)
+
+    inputs = []
+    outputs = []
+    examines = set()
+    timer = None
+    counter = None
+    for ins in iter_instructions(ast):
+        mnemonic = ins.mnemonic
+        if mnemonic in INPUT_INSTRUCTIONS:
+            inputs.append(ins.operands[0])
+            examines.add(mnemonic)
+        elif mnemonic in OUTPUT_INSTRUCTIONS:
+            outputs.append(ins.operands[0])
+        elif mnemonic in TIMER_INSTRUCTIONS and timer is None:
+            timer = ins.operands[0]
+        elif mnemonic in COUNTER_INSTRUCTIONS and counter is None:
+            counter = ins.operands[0]
+
+    rung = {
+        'rung': f'{number:04d}',
+        'inputs': inputs,
+        'outputs': outputs,
+        'description': comment,
+        'text': text,
+    }
+    if routine:
+        rung['routine'] = routine
+    if timer is not None:
+        rung['timer'] = timer
+    if counter is not None:
+        rung['counter'] = counter
+    if examines == {'XIO'}:
+        rung['logic_type'] = 'XIO'
+    elif _has_parallel_inputs(ast):
+        rung['logic_type'] = 'OR'
+
+    return rung
+
+def rung_label(rung):
+    """A rung's number qualified by its routine / file when it has one (MainRoutine:0003, LAD 2:0005)"""
+    routine = rung.get('routine')
+    return f"{routine}:{rung['rung']}" if routine else rung['rung']
+
+def has_logic(rung):
+    """
+    Whether rung_ast() gives the rung's actual logic: rungs with text (L5X /
+    L5K / .SLC) or a logic_type do. A PDF printout lists a rung's contacts
+    without its branches or XIC / XIO, so its rebuilt tree is only a guess.
+    """
+    return 'text' in rung or 'logic_type' in rung
+
+def rung_ast(rung):
+    """
+    A rung's instruction tree with data-table operands in RSLogix 500 spelling.
+
+    L5X rungs keep their Logix text while 'inputs' / 'outputs' / 'timer' /
+    'counter' hold the translated addresses in instruction order, so the
+    parsed text is re-labelled from them. Rungs without text (PDF reports)
+    are rebuilt from the dict: XIO or XIC examines in series (in parallel for
+    logic_type 'OR'), one OTE per output and the TON / CTU element.
+    """
+    if 'text' not in rung:
+        examine = 'XIO' if rung.get('logic_type') == 'XIO' else 'XIC'
+        inputs = [Instruction(examine, (tag,)) for tag in rung['inputs']]
+        if rung.get('logic_type') == 'OR' and len(inputs) > 1:
+            inputs = [Branch(tuple((node,) for node in inputs))]
+        nodes = inputs + [Instruction('OTE', (tag,)) for tag in rung['outputs']]
+        if 'timer' in rung:
+            nodes.append(Instruction('TON', (rung['timer'],)))
+        if 'counter' in rung:
+            nodes.append(Instruction('CTU', (rung['counter'],)))
+        return tuple(nodes)
+
+    inputs = iter(rung['inputs'])
+    outputs = iter(rung['outputs'])
+    first = {'timer': rung.get('timer'), 'counter': rung.get('counter')}
+
+    def relabel(nodes):
+        labelled = []
+        for node in nodes:
+            if type(node) is not Instruction:
+                labelled.append(Branch(tuple(relabel(leg) for leg in node.legs)))
+                continue
+            mnemonic, operands = node
+            if not operands:
+                labelled.append(node)
+                continue
+            if mnemonic in INPUT_INSTRUCTIONS:
+                operand = next(inputs, None)
+            elif mnemonic in OUTPUT_INSTRUCTIONS:
+                operand = next(outputs, None)
+            elif mnemonic in TIMER_INSTRUCTIONS:
+                operand = first.pop('timer', None)
+            elif mnemonic in COUNTER_INSTRUCTIONS:
+                operand = first.pop('counter', None)
+            else:
+                operand = None
+            operand = normalize_address(operand if operand is not None else operands[0])
+            labelled.append(Instruction(mnemonic, (operand,) + tuple(normalize_address(o) for o in operands[1:])))
+        return tuple(labelled)
+
+    return relabel(parse_rung(rung['text']))
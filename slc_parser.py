@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+RSLogix 500 ASCII Export Parser
+Reads rung text from .SLC program exports and tag descriptions from the address / symbol CSV database
+"""
+
+import csv
+import os
+import re
+from itertools import chain
+from l5x_parser import RungText
+from rung_parser import rung_from_text
+from tag_address import normalize_address, parse_address
+
+# Operands taken by each ladder instruction in the ASCII rung text; an
+# instruction not listed takes every token up to the next listed one
+OPERAND_COUNTS = {
+    'XIC': 1, 'XIO': 1, 'OTE': 1, 'OTL': 1, 'OTU': 1, 'OSR': 1, 'ONS': 1, 'OSF': 3,
+    'TON': 4, 'TOF': 4, 'RTO': 4, 'CTU': 3, 'CTD': 3, 'RES': 1, 'HSC': 3,
+    'EQU': 2, 'NEQ': 2, 'LES': 2, 'LEQ': 2, 'GRT': 2, 'GEQ': 2, 'MEQ': 3, 'LIM': 3,
+    'MOV': 2, 'MVM': 3, 'COP': 3, 'FLL': 3, 'CLR': 1, 'NOT': 2, 'NEG': 2, 'TOD': 2, 'FRD': 2,
+    'ADD': 3, 'SUB': 3, 'MUL': 3, 'DIV': 3, 'AND': 3, 'OR': 3, 'XOR': 3, 'SQR': 2, 'SCL': 4, 'SCP': 6,
+    'BSL': 4, 'BSR': 4, 'SQO': 5, 'SQC': 5, 'SQL': 4, 'MSG': 4, 'PID': 3,
+    'JSR': 1, 'SBR': 0, 'RET': 0, 'JMP': 1, 'LBL': 1, 'MCR': 0, 'AFI': 0, 'NOP': 0, 'TND': 0, 'END': 0,
+    'IIM': 3, 'IOM': 3, 'REF': 0, 'SUS': 1,
+}
+
+# Branch keywords and their neutral rung text
+BRANCH_TEXT = {'BST': '[', 'NXB': ' ,', 'BND': ' ]'}
+
+# Tokens that end the operands of an unlisted instruction
+_OPERANDS_END = frozenset(OPERAND_COUNTS) | frozenset(BRANCH_TEXT) | {'EOR'}
+
+# LADDER 2 MAIN_PROG - starts a program file; rungs are numbered from 0 in each
+_LADDER_RE = re.compile(r'\s*LADDER\s+(\d+)\s*(\S*)', re.IGNORECASE)
+
+def slc_rung_text(tokens):
+    """
+    Neutral rung text (the L5X <Text> form) of one SOR ... EOR rung's tokens.
+
+    Example:
+        'SOR BST XIC I:0/1 NXB XIC B3:0/0 BND OTE B3:0/0 EOR'.split() ->
+        '[XIC(I:0/1) ,XIC(B3:0/0) ]OTE(B3:0/0);'
+    """
+    text = []
+    position = 0
+    count = len(tokens)
+    while position < count:
+        token = tokens[position].upper()
+        position += 1
+        if token in ('SOR', 'EOR'):
+            continue
+        branch = BRANCH_TEXT.get(token)
+        if branch is not None:
+            text.append(branch)
+            continue
+        operand_count = OPERAND_COUNTS.get(token)
+        if operand_count is None:
+            end = position
+            while end < count and tokens[end].upper() not in _OPERANDS_END:
+                end += 1
+            operand_count = end - position
+        operands = tokens[position:position + operand_count]
+        position += operand_count
+        text.append(f"{token}({','.join(normalize_address(operand) for operand in operands)})")
+    return ''.join(text) + ';'
+
+def iter_slc_rungs(slc_file):
+    """
+    Stream an RSLogix 500 ASCII program export and yield a RungText per rung.
+
+    A rung is the tokens from SOR to EOR, which may wrap over several lines;
+    LADDER lines start a new program file (RungText.routine), and rungs are
+    numbered from 0 in each file. Lines outside rungs (project header,
+    '% Rung: n %' markers) are skipped.
+    """
+    routine = None
+    number = 0
+    tokens = None        # tokens of the rung being read (None between rungs)
+    with open(slc_file, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if tokens is None:
+                match = _LADDER_RE.match(line)
+                if match:
+                    routine = match.group(2) or f'LAD {match.group(1)}'
+                    number = 0
+                    continue
+            for token in line.split():
+                upper = token.upper()
+                if upper == 'SOR':
+                    tokens = []
+                elif tokens is None:
+                    continue
+                elif upper == 'EOR':
+                    yield RungText(routine, number, slc_rung_text(tokens), '')
+                    number += 1
+                    tokens = None
+                else:
+                    tokens.append(token)
+
+def _columns(row):
+    """
+    (address index, symbol index, description slice, is header) for a
+    database's first row, from its header or the export's fixed layout
+    """
+    names = [name.strip().upper() for name in row]
+    if 'ADDRESS' in names:
+        address = names.index('ADDRESS')
+        symbol = names.index('SYMBOL') if 'SYMBOL' in names else None
+        descriptions = [index for index, name in enumerate(names) if name.startswith('DESC')]
+        if not descriptions:
+            return address, symbol, slice(0, 0), True
+        return address, symbol, slice(descriptions[0], descriptions[-1] + 1), True
+    # No header: 'address, symbol, desc1..descN', optionally after a record type column
+    address = 0 if parse_address(row[0]) is not None or len(row) < 2 else 1
+    return address, address + 1, slice(address + 2, None), False
+
+def load_symbol_database(csv_file):
+    """
+    {address: description} from an RSLogix 500 address / symbol database CSV export.
+
+    The file is read row by row with csv.reader and the dict is built in one
+    pass from a generator. The columns come from the header row (ADDRESS,
+    SYMBOL, DESC1..DESC5) when there is one, else the export's fixed layout
+    (optional record type, address, symbol, description lines). Description
+    lines are joined with spaces, as in the PDF printout; an address with
+    only a symbol is described by the symbol.
+    """
+    with open(csv_file, newline='', encoding='utf-8-sig', errors='replace') as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return {}
+        address, symbol, descriptions, header = _columns(first)
+
+        def entries(rows):
+            for row in rows:
+                parsed = parse_address(row[address].strip()) if len(row) > address else None
+                if parsed is None:
+                    continue
+                text = ' '.join(filter(None, map(str.strip, row[descriptions])))
+                if not text and symbol is not None and len(row) > symbol:
+                    text = row[symbol].strip()
+                if text:
+                    yield str(parsed), text
+
+        return dict(entries(reader if header else chain([first], reader)))
+
+def symbol_database_for(slc_file):
+    """The CSV database exported next to slc_file (same name), or None"""
+    stem = os.path.splitext(slc_file)[0]
+    for extension in ('.csv', '.CSV'):
+        if os.path.exists(stem + extension):
+            return stem + extension
+    return None
+
+def extract_data_from_slc(slc_file, database=None):
+    """
+    Extract ladder rungs and tag descriptions from an RSLogix 500 ASCII export.
+
+    Args:
+        slc_file: path of the .SLC program text export
+        database: path of the address / symbol CSV database export (default:
+                  the .csv with the same name, when there is one)
+
+    Returns:
+        (rungs, tag_descriptions) in the same structures as extract_data_from_pdf()
+    """
+    rungs = [rung_from_text(record.number, record.text, record.comment, record.routine)
+             for record in iter_slc_rungs(slc_file)]
+    database = database or symbol_database_for(slc_file)
+    tag_descriptions = load_symbol_database(database) if database else {}
+    return rungs, tag_descriptions
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Pipeline Stage Profiler
+Records wall time, CPU time, peak memory and item counts for each conversion stage
+"""
+
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is reported as None
+    resource = None
+
+# The profiler stages record into; None when profiling is off (every hook is a no-op)
+_active = None
+
+def _peak_rss_mb():
+    """Peak resident set size of this process so far, in MB"""
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+class StageProfiler:
+    """
+    Collects one record per completed stage, in completion order:
+        {'stage', 'wall_s', 'cpu_s', 'peak_alloc_mb', 'peak_rss_mb', **counts}
+
+    peak_alloc_mb is the tracemalloc peak of Python allocations made while the
+    stage ran (nested stages included); peak_rss_mb is the process high-water
+    mark when the stage finished. Extra fields passed to the constructor (e.g.
+    the PLC name) are added to every record.
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self.records = []
+        self._stack = []         # open records, innermost last
+
+    @contextmanager
+    def stage(self, name, **counts):
+        record = dict(self.fields, stage=name, **counts)
+        if self._stack:
+            # Keep the enclosing stage's peak so far before the peak is reset
+            parent = self._stack[-1]
+            parent['_peak'] = max(parent['_peak'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        record['_base'] = record['_peak'] = tracemalloc.get_traced_memory()[0]
+        self._stack.append(record)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            self._stack.pop()
+            peak = max(record.pop('_peak'), tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                parent = self._stack[-1]
+                parent['_peak'] = max(parent['_peak'], peak)
+            peak -= record.pop('_base')
+            record.update(
+                wall_s=round(wall, 4),
+                cpu_s=round(cpu, 4),
+                peak_alloc_mb=round(max(peak, 0) / 2**20, 2),
+                peak_rss_mb=_peak_rss_mb(),
+            )
+            self.records.append(record)
+
+    def write_jsonl(self, path):
+        """Append the records to a JSON lines file"""
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def table(self):
+        """Summary table of the records, one line per stage"""
+        count_keys = [key for key in dict.fromkeys(k for record in self.records for k in record)
+                      if key not in self.fields and key not in
+                      ('stage', 'wall_s', 'cpu_s', 'peak_alloc_mb', 'peak_rss_mb')]
+        lines = [f"{'Stage':<34}{'Wall s':>9}{'CPU s':>9}{'Alloc MB':>10}{'RSS MB':>9}  Counts"]
+        for record in self.records:
+            counts = ' '.join(f'{key}={record[key]}' for key in count_keys if key in record)
+            rss = record['peak_rss_mb'] if record['peak_rss_mb'] is not None else '-'
+            lines.append(f"{record['stage']:<34}{record['wall_s']:>9.3f}{record['cpu_s']:>9.3f}"
+                         f"{record['peak_alloc_mb']:>10.2f}{rss:>9}  {counts}")
+        return '\n'.join(lines)
+
+def start_profiling(**fields):
+    """Turn profiling on (tracemalloc included) and return the new StageProfiler"""
+    global _active
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _active = StageProfiler(**fields)
+    return _active
+
+def stop_profiling():
+    """Turn profiling off and return the StageProfiler that was active"""
+    global _active
+    profiler, _active = _active, None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return profiler
+
+@contextmanager
+def profiling(**fields):
+    """Profile every stage run inside the block; yields the StageProfiler"""
+    profiler = start_profiling(**fields)
+    try:
+        yield profiler
+    finally:
+        stop_profiling()
+
+@contextmanager
+def stage(name, **counts):
+    """Time a stage when profiling is on; yields its record (a throwaway dict otherwise)"""
+    if _active is None:
+        yield {}
+        return
+    with _active.stage(name, **counts) as record:
+        yield record
+
+def count(**counts):
+    """Add item counts (rungs, tags, cells, ...) to the innermost running stage"""
+    if _active is not None and _active._stack:
+        _active._stack[-1].update(counts)
+
+def profiled(name, counts=None):
+    """
+    Decorator running the function as a stage. counts, if given, maps the
+    function's return value to a dict of counts for the record.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.stage(name) as record:
+                result = func(*args, **kwargs)
+                if counts is not None:
+                    record.update(counts(result))
+                return result
+        return wrapper
+    return decorator
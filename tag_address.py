@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tag Address Model
+Parses RSLogix 500 and Logix data-table addresses into compact, sortable, interned Address tuples
+"""
+
+import re
+from collections import namedtuple
+
+# Status bits addressed with '/' (T4:8/DN); other suffixes are words (T4:8.ACC)
+STATUS_BITS = frozenset((
+    'EN', 'TT', 'DN', 'CU', 'CD', 'OV', 'UN', 'UA', 'ER', 'EU', 'EM', 'FD', 'IN', 'UL', 'RN',
+))
+
+# File types whose status bits belong to the element (timers, counters, controls)
+STRUCTURE_FILE_TYPES = frozenset(('T', 'C', 'R'))
+
+# Default file numbers of the SLC output / input / status files (printed without a number)
+_DEFAULT_FILE_NUMBERS = {'O': 0, 'I': 1, 'S': 2}
+
+# One pattern per syntax; the group layout is shared
+_ADDRESS_RE = re.compile(
+    # RSLogix 500: B3:0/4, I:0.1/3, N7:0, T4:8.DN, T4:16/DN, T4:8.ACC
+    r'(?P<type>[A-Z]{1,2})(?P<file>\d*):(?P<word>\d+)(?:\.(?P<sub>\d+))?(?:/(?P<bit>\d+))?(?:[./](?P<suffix>[A-Z]+))?'
+    # Bit-addressed binary file: B3/58 (= B3:3/10)
+    r'|(?P<bt_type>[A-Z]{1,2})(?P<bt_file>\d+)/(?P<bt_bit>\d+)'
+    # Logix array form of converted SLC files: B3[0].4, T4[16].DN, N7[0]
+    r'|(?P<lx_type>[A-Z]{1,2})(?P<lx_file>\d+)\[(?P<lx_word>\d+)\](?:\.(?P<lx_bit>\d+))?(?:\.(?P<lx_suffix>[A-Z]+))?'
+)
+
+# An address inside an expression operand: N7:5+N7:6, (N7:0 * 10) | B3/58
+_EMBEDDED_ADDRESS_RE = re.compile(r'(?<![\w\[\].:/])(?:' + _ADDRESS_RE.pattern + r')(?![\w\[])')
+
+class Address(namedtuple('Address', ['file_type', 'file_number', 'word', 'sub', 'bit', 'suffix'])):
+    """
+    One data-table address: file type, file number, word (element), sub-element
+    word (I:1.2 - word 2 of slot 1; -1 when none), bit (-1 when the address is
+    a whole word) and status / member suffix ('' when none).
+
+    Fields compare in that order, so sorting gives natural data-table order
+    (B3:0/2 < B3:0/10 < B3:1/0). str() is the canonical RSLogix 500 spelling;
+    a bit of a sub-element word is folded into the slot's linear bit
+    (I:1.2/3 -> I:1/35), the way RSLogix 500 itself accepts both.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        if _DEFAULT_FILE_NUMBERS.get(self.file_type) == self.file_number:
+            text = f'{self.file_type}:{self.word}'
+        else:
+            text = f'{self.file_type}{self.file_number}:{self.word}'
+        if self.sub >= 0:
+            text += f'.{self.sub}'
+        if self.bit >= 0:
+            text += f'/{self.bit}'
+        if self.suffix:
+            text += ('/' if self.suffix in STATUS_BITS else '.') + self.suffix
+        return text
+
+    @property
+    def logix(self):
+        """Logix spelling of a converted SLC address (B3[0].4, T4[16].DN); I/O keep the SLC form"""
+        if self.file_type in _DEFAULT_FILE_NUMBERS:
+            return str(self)
+        text = f'{self.file_type}{self.file_number}[{self.word}]'
+        if self.bit >= 0:
+            text += f'.{self.bit}'
+        if self.suffix:
+            text += f'.{self.suffix}'
+        return text
+
+    @property
+    def element(self):
+        """The address without bit / suffix (T4:16/DN -> T4:16)"""
+        return self._replace(sub=-1, bit=-1, suffix='')
+
+_new_address = tuple.__new__
+
+def _build(match):
+    """Address from a regex match of any of the supported syntaxes"""
+    groups = match.groupdict()
+    if groups['type'] is not None:
+        file_type = groups['type']
+        file_number = groups['file']
+        word = int(groups['word'])
+        sub = int(groups['sub']) if groups['sub'] is not None else -1
+        bit = int(groups['bit']) if groups['bit'] is not None else -1
+        if sub >= 0 and bit >= 0:
+            # I:1.2/3 - slot 1, word 2 of the slot: fold into a linear bit (I:1/35);
+            # a whole word (I:1.2) keeps its sub-element
+            bit, sub = sub * 16 + bit, -1
+        suffix = groups['suffix'] or ''
+    elif groups['bt_type'] is not None:
+        file_type = groups['bt_type']
+        file_number = groups['bt_file']
+        linear = int(groups['bt_bit'])
+        word, sub, bit, suffix = linear // 16, -1, linear % 16, ''
+    else:
+        file_type = groups['lx_type']
+        file_number = groups['lx_file']
+        word = int(groups['lx_word'])
+        sub = -1
+        bit = int(groups['lx_bit']) if groups['lx_bit'] is not None else -1
+        suffix = groups['lx_suffix'] or ''
+
+    if file_number:
+        file_number = int(file_number)
+    elif file_type in _DEFAULT_FILE_NUMBERS:
+        file_number = _DEFAULT_FILE_NUMBERS[file_type]
+    else:
+        return None
+    return _new_address(Address, (file_type, file_number, word, sub, bit, suffix))
+
+# Address text -> interned Address (None for symbolic tags), shared by every stage
+ADDRESS_INDEX = {}
+
+def parse_address(text):
+    """
+    Parse an RSLogix 500 or Logix address, returning the interned Address.
+
+    Each distinct string is parsed once; every spelling of the same address
+    (b3:0/4 and B3:0/4 included) returns the same object. Symbolic tags that are not data-table addresses
+    (e.g. 'SLOT00_Bul_1766_Placeholder.I[0].1', 'Fire_Alarm') give None.
+    """
+    try:
+        return ADDRESS_INDEX[text]
+    except KeyError:
+        pass
+
+    match = _ADDRESS_RE.fullmatch(text.strip().upper())
+    address = _build(match) if match else None
+    if address is not None:
+        # One object per address, whichever spelling produced it
+        address = ADDRESS_INDEX.setdefault(str(address), address)
+    ADDRESS_INDEX[text] = address
+    return address
+
+def normalize_address(text):
+    """Canonical RSLogix 500 spelling of an address; symbolic tags are returned unchanged"""
+    address = parse_address(text)
+    return str(address) if address is not None else text
+
+def addresses_in(expression):
+    """Canonical spelling of every data-table address in an expression (N7:5+N7:6 -> ['N7:5', 'N7:6'])"""
+    addresses = []
+    for match in _EMBEDDED_ADDRESS_RE.finditer(expression):
+        address = parse_address(match.group())
+        if address is not None:
+            addresses.append(str(address))
+    return addresses
+
+def element_of(text):
+    """
+    Element a timer / counter / control status bit belongs to (T4:16/DN -> T4:16,
+    T4[16].DN -> T4[16]); any other tag is returned unchanged.
+    """
+    address = parse_address(text)
+    if address is None or address.file_type not in STRUCTURE_FILE_TYPES or not address.suffix:
+        return text
+    element = address.element
+    return element.logix if '[' in text else str(element)
+
+def status_bit(element, suffix):
+    """Status bit of a timer / counter element (T4:16, 'DN' -> T4:16/DN)"""
+    address = parse_address(element)
+    if address is None:
+        return f'{element}.{suffix}'
+    return str(address._replace(sub=-1, bit=-1, suffix=suffix))
+
+def address_sort_key(text):
+    """Sort key placing addresses in data-table order, then symbolic tags alphabetically"""
+    address = parse_address(text)
+    if address is None:
+        return (1, text)
+    return (0, address)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Template Workbook Cache
+Parses each STX template once per process and hands out independent in-memory copies,
+and copies a prepared template sheet once per output page
+"""
+
+import copy
+import os
+import pickle
+from openpyxl import load_workbook
+
+# abspath -> (mtime, size, pickled workbook)
+_TEMPLATE_CACHE = {}
+
+def load_template(template_file):
+    """
+    Return a fresh Workbook for template_file without re-parsing the .xlsx.
+
+    The first call per process parses the template with load_workbook() and
+    keeps a pickled snapshot; later calls unpickle the snapshot, which is an
+    order of magnitude cheaper than re-reading the zip and its sheet XML. Each
+    caller gets its own copy, so edits never leak between outputs. The entry is
+    refreshed if the template file changes on disk.
+    """
+    path = os.path.abspath(template_file)
+    stat = os.stat(path)
+
+    entry = _TEMPLATE_CACHE.get(path)
+    if entry is None or entry[0] != stat.st_mtime or entry[1] != stat.st_size:
+        workbook = load_workbook(path)
+        entry = (stat.st_mtime, stat.st_size, pickle.dumps(workbook, protocol=pickle.HIGHEST_PROTOCOL))
+        _TEMPLATE_CACHE[path] = entry
+
+    return pickle.loads(entry[2])
+
+def add_pages(ws, titles):
+    """
+    Pages of an output sheet: ws (titled titles[0]) plus a copy of it for
+    every further title, appended after the workbook's last sheet.
+
+    Call once the title and header rows are filled in and before any data
+    rows: each copy costs one pass over the prepared sheet's cells. Besides
+    what copy_worksheet() copies (cells, merges, dimensions, page setup),
+    every page gets the sheet's view (frozen panes, zoom, gridlines) and
+    print titles; only the first page's tab is selected.
+    """
+    ws.title = titles[0]
+    pages = [ws]
+    for title in titles[1:]:
+        page = ws.parent.copy_worksheet(ws)
+        page.title = title
+        page.views = copy.deepcopy(ws.views)
+        page.sheet_view.tabSelected = False
+        page.print_title_rows = ws.print_title_rows
+        page.print_title_cols = ws.print_title_cols
+        pages.append(page)
+    return pages
+
+def clear_template_cache():
+    """Drop all cached templates (e.g. after editing a template in a long-running process)"""
+    _TEMPLATE_CACHE.clear()
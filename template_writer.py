@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Direct Template Sheet Writer
+Fills an STX template by rewriting its sheet XML as text - one copy of the sheet per page, data rows set
+with precomputed style indices, every other part of the .xlsx copied unchanged
+"""
+
+import os
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Border
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils import column_index_from_string, get_column_letter, quote_sheetname, range_boundaries
+from openpyxl.xml.functions import tostring
+from excel_styles import CellStyle
+
+_NS = {
+    'm': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+_R_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+_ROW = re.compile(r'<row\b([^>]*?)(/>|>(.*?)</row>)', re.S)
+_CELL = re.compile(r'<c\b[^>]*?\br="([A-Z]+)(\d+)"[^>]*?(?:/>|>.*?</c>)', re.S)
+_ATTR = re.compile(r'\b(s|t)="([^"]*)"')
+_VALUE = re.compile(r'<v>(.*?)</v>', re.S)
+_TEXT = re.compile(r'<t(?:\s[^>]*)?>(.*?)</t>', re.S)
+_MERGE_CELLS = re.compile(r'<mergeCells\b[^>]*?(?:/>|>.*?</mergeCells>)', re.S)
+_MERGE_REF = re.compile(r'<mergeCell ref="([^"]+)"')
+_SPANS = re.compile(r'\sspans="[^"]*"')
+
+_WORKSHEET_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet'
+_WORKSHEET_CONTENT = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+_DRAWING_CONTENT = 'application/vnd.openxmlformats-officedocument.drawing+xml'
+
+# set() argument meaning "leave as it is"
+KEEP = object()
+
+def _unescape(text):
+    return text.replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"').replace('&apos;', "'").replace(
+        '&amp;', '&')
+
+def _attribute(text):
+    return escape(text, {'"': '&quot;'})
+
+def _copy_info(info):
+    """Fresh ZipInfo for writing a member under the same name, date and compression"""
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    copy.compress_type = info.compress_type
+    copy.external_attr = info.external_attr
+    return copy
+
+def _xml(element):
+    return tostring(element.to_tree()).decode('utf-8')
+
+def cell_xml(ref, value, xf):
+    """<c> element for one cell: inline string, number or bool; None / '' leave only the style"""
+    style = f' s="{xf}"' if xf else ''
+    if value is None or value == '':
+        return f'<c r="{ref}"{style}/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{style}><v>{value!r}</v></c>'
+    text = escape(ILLEGAL_CHARACTERS_RE.sub('', str(value)))
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+class StyleTable:
+    """
+    The template's cell formats plus any added for one output.
+
+    Template formats keep their indices; new fonts, fills, borders and cellXfs
+    are appended after them (de-duplicated), so template cells copied as-is
+    still point at the right format.
+    """
+
+    def __init__(self, styles_xml):
+        self.styles_xml = styles_xml
+        stylesheet = Stylesheet.from_tree(ET.fromstring(styles_xml))
+        self.fonts = list(stylesheet.fonts)
+        self.fills = list(stylesheet.fills)
+        self.borders = list(stylesheet.borders)
+        self.xfs = [(xf.fontId or 0, xf.fillId or 0, xf.borderId or 0, xf.numFmtId or 0, xf.alignment, xf.protection)
+                    for xf in stylesheet.cellXfs.xf]
+        self._added = {'fonts': [], 'fills': [], 'borders': [], 'cellXfs': []}
+        self._index = {}                 # (part, xml) -> index of an added entry
+        self._applied = {}               # (xf, CellStyle) -> xf index
+        self._merged = {}                # merged() arguments -> result
+
+    def _add(self, part, table, obj):
+        key = (part, _xml(obj))
+        if key not in self._index:
+            self._index[key] = len(table)
+            table.append(obj)
+            self._added[part].append(key[1])
+        return self._index[key]
+
+    def xf(self, font_id=0, fill_id=0, border_id=0, number_format_id=0, alignment=None, protection=None):
+        """Index of a cellXfs entry with these parts (appended when new)"""
+        attrs = f'numFmtId="{number_format_id}" fontId="{font_id}" fillId="{fill_id}" borderId="{border_id}" xfId="0"'
+        flags = ''.join(f' {flag}="1"' for flag, used in (
+            ('applyNumberFormat', number_format_id), ('applyFont', font_id), ('applyFill', fill_id),
+            ('applyBorder', border_id), ('applyAlignment', alignment is not None),
+            ('applyProtection', protection is not None)) if used)
+        children = ''.join(_xml(child) for child in (alignment, protection) if child is not None)
+        xml = f'<xf {attrs}{flags}>{children}</xf>' if children else f'<xf {attrs}{flags}/>'
+        key = ('cellXfs', xml)
+        if key not in self._index:
+            self._index[key] = len(self.xfs)
+            self.xfs.append((font_id, fill_id, border_id, number_format_id, alignment, protection))
+            self._added['cellXfs'].append(xml)
+        return self._index[key]
+
+    def border(self, xf):
+        """Border object of a cellXfs entry"""
+        return self.borders[self.xfs[xf][2]]
+
+    def derive(self, xf, font=None, fill=None, border=None, alignment=None):
+        """Index of xf with its font, fill, border and / or alignment replaced (cell.font = ..., etc.)"""
+        font_id, fill_id, border_id, number_format_id, old_alignment, protection = self.xfs[xf]
+        if font is not None:
+            font_id = self._add('fonts', self.fonts, font)
+        if fill is not None:
+            fill_id = self._add('fills', self.fills, fill)
+        if border is not None:
+            border_id = self._add('borders', self.borders, border)
+        return self.xf(font_id, fill_id, border_id, number_format_id,
+                       alignment if alignment is not None else old_alignment, protection)
+
+    def border_plus(self, xf, border):
+        """xf with its border combined with another one (openpyxl's cell.border += border)"""
+        return self.derive(xf, border=self.border(xf) + border)
+
+    def merged(self, top_left, bottom_right, rows, columns):
+        """
+        Formats after merging a rows x columns range whose top-left and
+        bottom-right cells have these formats (None = no cell), as openpyxl's
+        merge_cells() leaves them: (top-left xf, {(row offset, column offset):
+        xf} of the covered cells). Memoized - every page merges the same ranges.
+        """
+        key = (top_left, bottom_right, rows, columns)
+        if key in self._merged:
+            return self._merged[key]
+        if top_left is None:
+            top_left = 0
+        if bottom_right is not None and (rows, columns) != (1, 1):
+            corner = self.border(bottom_right)
+            top_left = self.border_plus(top_left, Border(right=corner.right, bottom=corner.bottom))
+
+        # The covered cells lose their value and format; the ones on the
+        # range's edge get the top-left cell's border on that side
+        borders = {}
+        start = self.border(top_left)
+        for name in ('top', 'left', 'right', 'bottom'):
+            side = getattr(start, name)
+            if side and side.style is None:
+                continue
+            edge = {
+                'top': [(0, column) for column in range(columns)],
+                'left': [(row, 0) for row in range(rows)],
+                'right': [(row, columns - 1) for row in range(rows)],
+                'bottom': [(rows - 1, column) for column in range(columns)],
+            }[name]
+            for position in edge:
+                borders[position] = borders.get(position, Border()) + Border(**{name: side})
+        covered = {
+            (row, column): 0 if (row, column) not in borders else self.derive(0, border=borders[(row, column)])
+            for row in range(rows) for column in range(columns) if (row, column) != (0, 0)
+        }
+        self._merged[key] = (top_left, covered)
+        return self._merged[key]
+
+    def apply(self, xf, style):
+        """Index of xf with a CellStyle's attributes set (excel_styles.py); memoized per (xf, style)"""
+        key = (xf, style)
+        result = self._applied.get(key)
+        if result is None:
+            result = self._applied[key] = self.derive(xf, style.font, style.fill, style.border, style.alignment)
+        return result
+
+    def to_xml(self):
+        """styles.xml with the added entries (the template's own bytes when nothing was added)"""
+        xml = self.styles_xml
+        for part, entries in self._added.items():
+            if not entries:
+                continue
+            match = re.search(rf'<{part}\b[^>]*?count="(\d+)"[^>]*>', xml)
+            total = int(match.group(1)) + len(entries)
+            opening = match.group(0).replace(f'count="{match.group(1)}"', f'count="{total}"')
+            closing = xml.index(f'</{part}>', match.end())
+            xml = xml[:match.start()] + opening + xml[match.end():closing] + ''.join(entries) + xml[closing:]
+        return xml
+
+class TemplateBook:
+    """
+    One template .xlsx, read once: every zip member's bytes, and the sheet to
+    fill split into its XML head, template rows, merged ranges and tail.
+    """
+
+    def __init__(self, path, sheet_name):
+        self.path = path
+        self.sheet_name = sheet_name
+        with zipfile.ZipFile(path) as archive:
+            self.members = [(info, archive.read(info)) for info in archive.infolist()]
+        self.parts = parts = {info.filename: data for info, data in self.members}
+
+        workbook = ET.fromstring(parts['xl/workbook.xml'])
+        rels = ET.fromstring(parts['xl/_rels/workbook.xml.rels'])
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.findall('rel:Relationship', _NS)}
+        sheets = workbook.findall('m:sheets/m:sheet', _NS)
+        self.sheet_count = len(sheets)
+        for position, sheet in enumerate(sheets):
+            if sheet.get('name') == sheet_name:
+                target = targets[sheet.get(_R_ID)]
+                self.sheet_part = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+                self.sheet_position = position
+                break
+        else:
+            raise KeyError(f'Worksheet {sheet_name} does not exist in {path}')
+
+        self.shared_strings = []
+        if 'xl/sharedStrings.xml' in parts:
+            for item in re.findall(r'<si>(.*?)</si>', parts['xl/sharedStrings.xml'].decode('utf-8'), re.S):
+                self.shared_strings.append(_unescape(''.join(_TEXT.findall(item))))
+
+        self.styles_xml = parts['xl/styles.xml'].decode('utf-8')
+        self.workbook_xml = parts['xl/workbook.xml'].decode('utf-8')
+        self.app_xml = parts['docProps/app.xml'].decode('utf-8') if 'docProps/app.xml' in parts else None
+
+        xml = parts[self.sheet_part].decode('utf-8')
+        start = xml.index('<sheetData')
+        end = xml.index('</sheetData>') + len('</sheetData>') if '</sheetData>' in xml else xml.index('/>', start) + 2
+        self.head, body, tail = xml[:start], xml[start:end], xml[end:]
+
+        self.rows = {}                   # row -> (row attributes, whole <row> XML, {column: (XML, value, xf)})
+        for attributes, _, content in _ROW.findall(body):
+            number = int(re.search(r'\br="(\d+)"', attributes).group(1))
+            cells = {}
+            for match in _CELL.finditer(content or ''):
+                column = column_index_from_string(match.group(1))
+                cells[column] = (match.group(0), *self._cell_value(match.group(0)))
+            self.rows[number] = (attributes, f'<row{attributes}>{content or ""}</row>', cells)
+
+        merges = _MERGE_CELLS.search(tail)
+        self.merges = _MERGE_REF.findall(merges.group(0)) if merges else []
+        if merges:
+            self.tail = (tail[:merges.start()], tail[merges.end():])
+        else:
+            self.tail = ('', tail)
+
+    def _cell_value(self, xml):
+        """(value, xf) of one template <c> element"""
+        attrs = dict(_ATTR.findall(xml[:xml.index('>')]))
+        xf = int(attrs.get('s', 0))
+        kind = attrs.get('t', 'n')
+        if kind == 'inlineStr':
+            return _unescape(''.join(_TEXT.findall(xml))), xf
+        raw = _VALUE.search(xml)
+        if raw is None:
+            return None, xf
+        raw = _unescape(raw.group(1))
+        if kind == 's':
+            return self.shared_strings[int(raw)], xf
+        if kind in ('str', 'e'):
+            return raw, xf
+        if kind == 'b':
+            return raw == '1', xf
+        number = float(raw)
+        return int(number) if number.is_integer() and 'E' not in raw and '.' not in raw else number, xf
+
+# abspath -> (mtime, size, sheet name, TemplateBook)
+_BOOK_CACHE = {}
+
+def load_book(template_file, sheet_name='TEMPLATE'):
+    """TemplateBook for template_file, read once per process (re-read if the file changes)"""
+    path = os.path.abspath(template_file)
+    stat = os.stat(path)
+    entry = _BOOK_CACHE.get(path)
+    if entry is None or entry[:3] != (stat.st_mtime, stat.st_size, sheet_name):
+        entry = _BOOK_CACHE[path] = (stat.st_mtime, stat.st_size, sheet_name, TemplateBook(path, sheet_name))
+    return entry[3]
+
+class TemplateSheet:
+    """
+    Edits to one template sheet, written out with save() / save_pages().
+
+    Cells are addressed like openpyxl's ws.cell(row, column) and follow the
+    same rules as the openpyxl template code they replace - a new cell starts
+    with the default format, unmerge() drops the covered cells, merge() keeps
+    only the top-left cell and carries its borders to the range's edges - so
+    both produce the same sheet. Template rows that are never touched are
+    written back byte for byte. copy() starts another page from the sheet as
+    it is, sharing the template and the style table.
+    """
+
+    def __init__(self, template_file, sheet_name='TEMPLATE'):
+        self.book = load_book(template_file, sheet_name)
+        self.styles = StyleTable(self.book.styles_xml)
+        self.cells = {row: dict(cells) for row, (_, _, cells) in self.book.rows.items()}
+        self.merges = list(self.book.merges)
+        self.last_template_row = max(self.book.rows, default=0)
+        self._dirty = set()
+
+    def value(self, row, column):
+        cell = self.cells.get(row, {}).get(column)
+        return cell[1] if cell is not None else None
+
+    def xf(self, row, column):
+        """Format index of a cell, or None when the cell does not exist"""
+        cell = self.cells.get(row, {}).get(column)
+        return cell[2] if cell is not None else None
+
+    def set(self, row, column, value=KEEP, style=KEEP):
+        """
+        Set a cell's value and / or format, creating the cell if needed. style is
+        a cellXfs index, or a CellStyle applied on top of the cell's format.
+        """
+        cells = self.cells.setdefault(row, {})
+        _, old_value, old_xf = cells.get(column, (None, None, 0))
+        if isinstance(style, CellStyle):
+            style = self.styles.apply(old_xf, style)
+        cells[column] = (None, old_value if value is KEEP else value, old_xf if style is KEEP else style)
+        self._dirty.add(row)
+
+    def delete(self, row, column):
+        if self.cells.get(row, {}).pop(column, None) is not None:
+            self._dirty.add(row)
+
+    def unmerge(self, min_row):
+        """
+        Unmerge every range starting at or below min_row. As when openpyxl
+        loads and unmerges the template: the top-left cell picks up the
+        bottom-right cell's right / bottom border, the other cells are removed.
+        """
+        kept = []
+        for ref in self.merges:
+            min_col, first_row, max_col, max_row = range_boundaries(ref)
+            if first_row < min_row:
+                kept.append(ref)
+                continue
+            top_left = self.xf(first_row, min_col)
+            bottom_right = self.xf(max_row, max_col)
+            if top_left is not None and bottom_right is not None:
+                corner = self.styles.border(bottom_right)
+                self.set(first_row, min_col, style=self.styles.border_plus(
+                    top_left, Border(right=corner.right, bottom=corner.bottom)))
+            for row in range(first_row, max_row + 1):
+                for column in range(min_col, max_col + 1):
+                    if (row, column) != (first_row, min_col):
+                        self.delete(row, column)
+        self.merges = kept
+
+    def merge(self, min_row, min_col, max_row, max_col):
+        """Merge a range the way openpyxl's ws.merge_cells() does"""
+        top_left, covered = self.styles.merged(self.xf(min_row, min_col), self.xf(max_row, max_col),
+                                               max_row - min_row + 1, max_col - min_col + 1)
+        self.set(min_row, min_col, None if self.xf(min_row, min_col) is None else KEEP, top_left)
+        for (row, column), xf in covered.items():
+            self.set(min_row + row, min_col + column, None, xf)
+        self.merges.append(f'{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{max_row}')
+
+    def copy(self):
+        """Independent copy of the cells and merges (one more page), sharing the template and style table"""
+        page = object.__new__(TemplateSheet)
+        page.book = self.book
+        page.styles = self.styles
+        page.cells = {row: dict(cells) for row, cells in self.cells.items()}
+        page.merges = list(self.merges)
+        page.last_template_row = self.last_template_row
+        page._dirty = set(self._dirty)
+        return page
+
+    def set_row(self, row, values, styles):
+        """
+        set() columns A onwards at once from values and CellStyles (each applied
+        on top of the cell's format); a None value keeps the cell's value
+        """
+        cells = self.cells.setdefault(row, {})
+        apply = self.styles.apply
+        for column, (value, style) in enumerate(zip(values, styles), 1):
+            old = cells.get(column)
+            if value is None and old is not None:
+                value = old[1]
+            cells[column] = (None, value, apply(old[2] if old is not None else 0, style))
+        self._dirty.add(row)
+
+    def _row_xml(self, row):
+        if row not in self._dirty and row in self.book.rows:
+            return self.book.rows[row][1]
+        attributes = _SPANS.sub('', self.book.rows[row][0]) if row in self.book.rows else f' r="{row}"'
+        cells = self.cells[row]
+        return (f'<row{attributes}>'
+                + ''.join(xml if xml is not None else cell_xml(f'{get_column_letter(column)}{row}', value, xf)
+                          for column, (xml, value, xf) in sorted(cells.items()))
+                + '</row>')
+
+    def to_xml(self, selected=True, dropped=()):
+        """
+        The sheet's XML. selected=False clears the tab selection; dropped are
+        relationship ids whose references are removed (see save_pages()).
+        """
+        book = self.book
+        last_row = max([row for row, cells in self.cells.items() if cells], default=1)
+        last_column = max([max(cells) for cells in self.cells.values() if cells], default=1)
+        head = re.sub(r'<dimension ref="[^"]*"/>', f'<dimension ref="A1:{get_column_letter(last_column)}{last_row}"/>',
+                      book.head, count=1)
+        if not selected:
+            head = head.replace(' tabSelected="1"', '', 1)
+        merges = (f'<mergeCells count="{len(self.merges)}">'
+                  + ''.join(f'<mergeCell ref="{ref}"/>' for ref in self.merges) + '</mergeCells>'
+                  if self.merges else '')
+        tail = book.tail[0] + merges + book.tail[1]
+        for rel_id in dropped:
+            # Elements that are only a reference go; others (pageSetup) lose the attribute
+            tail = re.sub(rf'<\w+ r:id="{rel_id}"/>', '', tail).replace(f' r:id="{rel_id}"', '')
+        rows = ''.join(self._row_xml(row) for row in sorted(self.cells) if self.cells[row] or row in book.rows)
+        return f'{head}<sheetData>{rows}</sheetData>{tail}'
+
+    def save(self, output_file, title):
+        """Write the workbook with the sheet renamed to title"""
+        save_pages(output_file, [(title, self)])
+
+def _rename(workbook_xml, old, title):
+    """workbook.xml with a sheet and its defined names (print titles, ...) renamed"""
+    xml = workbook_xml.replace(f'<sheet name="{escape(old)}"', f'<sheet name="{_attribute(title)}"', 1)
+    return re.sub(r'(<definedName\b[^>]*>)(.*?)(</definedName>)',
+                  lambda match: match.group(1) + _rename_reference(match.group(2), old, title) + match.group(3),
+                  xml, flags=re.S)
+
+def _rename_reference(text, old, title):
+    """Formula text with references to sheet old pointing at title instead"""
+    pattern = re.compile(rf"(?<![\w.'])(?:{re.escape(escape(old))}|'{re.escape(escape(old))}')!")
+    reference = escape(quote_sheetname(title)) + '!'
+    return pattern.sub(lambda _: reference, text)
+
+def _insert(xml, closing, text):
+    """xml with text inserted before its (last) closing tag"""
+    position = xml.rindex(closing)
+    return xml[:position] + text + xml[position:]
+
+def _next_number(names, pattern):
+    """One more than the highest number in the part names matching pattern (sheet3.xml -> 4)"""
+    numbers = [int(match.group(1)) for match in map(re.compile(pattern).match, names) if match]
+    return max(numbers, default=0) + 1
+
+def save_pages(output_file, pages):
+    """
+    Write a template workbook with its sheet filled in once per page.
+
+    pages are (title, TemplateSheet) pairs, copies of one sheet made with
+    TemplateSheet.copy(). The first page takes the template sheet's place;
+    the others are added after the workbook's last sheet with their own print
+    titles and their own copy of the sheet's drawing (the logo). The other
+    relationships of the sheet (printer settings) stay with the first page.
+    Every other part of the template is copied unchanged.
+    """
+    (title, first), extra = pages[0], pages[1:]
+    book = first.book
+    parts = book.parts
+    old = book.sheet_name
+
+    workbook_xml = _rename(book.workbook_xml, old, title)
+    replaced = {
+        'xl/styles.xml': first.styles.to_xml(),
+        book.sheet_part: first.to_xml(),
+    }
+    added = []                           # (part name, XML) of the extra pages
+    if book.app_xml is not None:
+        app_xml = book.app_xml.replace(f'<vt:lpstr>{escape(old)}</vt:lpstr>', f'<vt:lpstr>{escape(title)}</vt:lpstr>')
+        app_xml = app_xml.replace(f'<vt:lpstr>{escape(old)}!', f'<vt:lpstr>{escape(quote_sheetname(title))}!')
+        if extra:
+            # The list of sheets and named ranges is optional; Excel rebuilds it on save
+            app_xml = re.sub(r'<HeadingPairs>.*?</HeadingPairs>|<TitlesOfParts>.*?</TitlesOfParts>', '', app_xml,
+                             flags=re.S)
+        replaced['docProps/app.xml'] = app_xml
+
+    if extra:
+        rels_xml = parts['xl/_rels/workbook.xml.rels'].decode('utf-8')
+        types_xml = parts['[Content_Types].xml'].decode('utf-8')
+        sheet_rels_part = posixpath.join(posixpath.dirname(book.sheet_part), '_rels',
+                                         posixpath.basename(book.sheet_part) + '.rels')
+        sheet_rels = (ET.fromstring(parts[sheet_rels_part]).findall('rel:Relationship', _NS)
+                      if sheet_rels_part in parts else [])
+        local_names = re.findall(rf'<definedName\b[^>]*\blocalSheetId="{book.sheet_position}"[^>]*>.*?</definedName>',
+                                 book.workbook_xml, flags=re.S)
+
+        sheet_number = _next_number(parts, r'xl/worksheets/sheet(\d+)\.xml$')
+        drawing_number = _next_number(parts, r'xl/drawings/drawing(\d+)\.xml$')
+        rel_number = max(map(int, re.findall(r'Id="rId(\d+)"', rels_xml)), default=0) + 1
+        sheet_id = max(map(int, re.findall(r'<sheet\b[^>]*\bsheetId="(\d+)"', workbook_xml)), default=0) + 1
+
+        sheets, names, rels, types = [], [], [], []
+        for offset, (page_title, page) in enumerate(extra):
+            part = f'xl/worksheets/sheet{sheet_number + offset}.xml'
+            rel_id = f'rId{rel_number + offset}'
+            sheets.append(f'<sheet name="{_attribute(page_title)}" sheetId="{sheet_id + offset}" r:id="{rel_id}"/>')
+            rels.append(f'<Relationship Id="{rel_id}" Type="{_WORKSHEET_TYPE}" '
+                        f'Target="{posixpath.relpath(part, "xl")}"/>')
+            types.append(f'<Override PartName="/{part}" ContentType="{_WORKSHEET_CONTENT}"/>')
+            position = book.sheet_count + offset
+            for name in local_names:
+                name = name.replace(f'localSheetId="{book.sheet_position}"', f'localSheetId="{position}"', 1)
+                names.append(_rename(name, old, page_title))
+
+            page_rels, dropped = [], []
+            for rel in sheet_rels:
+                if not rel.get('Type').endswith('/drawing'):
+                    dropped.append(rel.get('Id'))
+                    continue
+                drawing = posixpath.normpath(posixpath.join(posixpath.dirname(book.sheet_part), rel.get('Target')))
+                drawing_copy = f'xl/drawings/drawing{drawing_number}.xml'
+                drawing_number += 1
+                added.append((drawing_copy, parts[drawing]))
+                drawing_rels = posixpath.join(posixpath.dirname(drawing), '_rels',
+                                              posixpath.basename(drawing) + '.rels')
+                if drawing_rels in parts:
+                    # Same folder, so the drawing's relative targets (the image) still resolve
+                    added.append((posixpath.join('xl/drawings/_rels', posixpath.basename(drawing_copy) + '.rels'),
+                                  parts[drawing_rels]))
+                types.append(f'<Override PartName="/{drawing_copy}" ContentType="{_DRAWING_CONTENT}"/>')
+                page_rels.append(f'<Relationship Id="{rel.get("Id")}" Type="{rel.get("Type")}" '
+                                 f'Target="{posixpath.relpath(drawing_copy, posixpath.dirname(part))}"/>')
+            added.append((part, page.to_xml(selected=False, dropped=dropped)))
+            if page_rels:
+                added.append((posixpath.join('xl/worksheets/_rels', posixpath.basename(part) + '.rels'),
+                              f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                              f'<Relationships xmlns="{_NS["rel"]}">{"".join(page_rels)}</Relationships>'))
+
+        workbook_xml = _insert(workbook_xml, '</sheets>', ''.join(sheets))
+        if names:
+            workbook_xml = _insert(workbook_xml, '</definedNames>', ''.join(names))
+        replaced['xl/_rels/workbook.xml.rels'] = _insert(rels_xml, '</Relationships>', ''.join(rels))
+        replaced['[Content_Types].xml'] = _insert(types_xml, '</Types>', ''.join(types))
+    replaced['xl/workbook.xml'] = workbook_xml
+
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for info, data in book.members:
+            new = replaced.get(info.filename)
+            if new is None:
+                archive.writestr(_copy_info(info), data)
+                continue
+            new_info = _copy_info(info)
+            new_info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(new_info, new.encode('utf-8') if isinstance(new, str) else new)
+        for name, data in added:
+            archive.writestr(zipfile.ZipInfo(name, book.members[0][0].date_time),
+                             data.encode('utf-8') if isinstance(data, str) else data, zipfile.ZIP_DEFLATED)
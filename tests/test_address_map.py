@@ -0,0 +1,42 @@
+"""Tests for address_map: Logix <-> RSLogix 500 translation of converted programs"""
+
+from address_map import AddressMap
+
+def converted_program():
+    address_map = AddressMap()
+    address_map.add_member('SLOT00_UDT', 'I', 2)
+    address_map.add_member('SLOT00_UDT', 'O', 0)
+    address_map.add_member('SLOT00_UDT', 'Fault', 0)
+    address_map.add_tag('SLOT00_Bul_1766_Placeholder', 'SLOT00_UDT')
+    address_map.add_tag('Fire_Eye_1', alias_for='SLOT00_Bul_1766_Placeholder.I[0].7')
+    address_map.add_tag('Fire_Eye_1_Alias', alias_for='Fire_Eye_1')
+    return address_map
+
+def test_placeholder_io_round_trip():
+    address_map = converted_program()
+    assert address_map.to_slc('SLOT00_Bul_1766_Placeholder.I[1].1') == 'I:0/17'
+    assert address_map.to_slc('SLOT00_Bul_1766_Placeholder.O.3') == 'O:0/3'
+    for logix, slc in address_map.logix_to_slc.items():
+        assert address_map.to_logix(slc) == logix
+    # Only the I / O members are SLC words
+    assert not any('.Fault' in logix for logix in address_map.logix_to_slc)
+
+def test_aliases_resolve_through_their_targets():
+    address_map = converted_program()
+    assert address_map.to_slc('Fire_Eye_1') == 'I:0/7'
+    assert address_map.to_slc('Fire_Eye_1_Alias') == 'I:0/7'
+
+def test_alias_cycle_is_left_unresolved():
+    address_map = AddressMap()
+    address_map.add_tag('A', alias_for='B')
+    address_map.add_tag('B', alias_for='A')
+    assert address_map.to_slc('A') is None
+    assert address_map.translate('A') == 'A'
+
+def test_converted_data_files():
+    address_map = converted_program()
+    assert address_map.translate('B3[3].10') == 'B3:3/10'
+    assert address_map.translate('T4[16].DN') == 'T4:16/DN'
+    assert address_map.to_logix('B3:3/10') == 'B3[3].10'
+    assert address_map.to_logix('S:1/15') is None
+    assert address_map.translate('Fire_Alarm') == 'Fire_Alarm'
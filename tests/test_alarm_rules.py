@@ -0,0 +1,55 @@
+"""Tests for alarm_rules: compiled rule matching, exclusions, priorities and address ranges"""
+
+import json
+import os
+
+import pytest
+
+from alarm_rules import AlarmRules, Classification, load_rules
+
+RULES = [
+    {'category': 'alarm', 'keywords': ['alarm'], 'addresses': ['B3:0-B3:999'], 'priority': 'High'},
+    {'category': 'alarm', 'regex': r'\bbit \d+$', 'exclude': True},
+    {'category': 'alarm', 'regex': 'fire alarm', 'addresses': ['B3:0-B3:999'], 'priority': 'Critical'},
+    {'category': 'esd', 'keywords': ['ESD'], 'priority': 'Critical'},
+    {'category': 'status', 'addresses': ['O:0/0-O:0/7']},
+]
+
+@pytest.mark.parametrize('tag, description, expected', [
+    ('B3:0/5', 'Smoke alarm', Classification(frozenset({'alarm'}), 'High')),
+    ('B3:0/5', 'Zone 1 FIRE ALARM', Classification(frozenset({'alarm'}), 'Critical')),
+    ('B3:0/5', 'Alarm bit 1', None),
+    ('I:1/0', 'Smoke alarm', None),
+    ('B3:2/4', 'Plant ESD alarm', Classification(frozenset({'alarm', 'esd'}), 'Critical')),
+    ('O:0/3', '', Classification(frozenset({'status'}), None)),
+    ('O:0/8', 'Horn', None),
+    ('N7:0', None, None),
+])
+def test_classify(tag, description, expected):
+    assert AlarmRules(RULES, ['Critical', 'High']).classify(tag, description) == expected
+
+def test_classify_all():
+    rules = AlarmRules(RULES, ['Critical', 'High'])
+    classified = rules.classify_all({'B3:0/5': 'Smoke alarm', 'I:1/0': 'Smoke alarm', 'O:0/1': 'Horn'})
+    assert sorted(classified) == ['B3:0/5', 'O:0/1']
+    assert rules.categories == ['alarm', 'esd', 'status']
+
+@pytest.mark.parametrize('rule', [
+    {'keywords': ['alarm']},
+    {'category': 'alarm'},
+    {'category': 'alarm', 'addresses': ['B3:0-N7:0']},
+    {'category': 'alarm', 'addresses': ['not an address']},
+])
+def test_bad_rules(rule):
+    with pytest.raises(ValueError):
+        AlarmRules([rule])
+
+def test_load_rules_reloads_changed_file(tmp_path):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps({'rules': RULES[:1]}))
+    rules = load_rules(str(path))
+    assert load_rules(str(path)) is rules
+    path.write_text(json.dumps({'rules': RULES[3:4]}))
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert load_rules(str(path)).categories == ['esd']
@@ -0,0 +1,55 @@
+"""Tests for bdd: drive logic BDDs and k-out-of-N vote detection"""
+
+from itertools import combinations
+
+from bdd import BDD, DriveLogic, Vote
+from parse_fire_system import build_transitive_interlocks, is_cause
+from rung_parser import rung_from_text
+
+DETECTORS = [f'I:1/{bit}' for bit in range(6)]
+
+def vote_rungs(k, detectors, missing=0):
+    """A vote bit set by one leg per k-detector combination (less the last 'missing' legs), driving O:0/0"""
+    legs = list(combinations(detectors, k))
+    legs = legs[:len(legs) - missing]
+    branch = ' ,'.join(''.join(f'XIC({tag})' for tag in leg) for leg in legs)
+    return [
+        rung_from_text(0, f'[{branch} ]OTE(B3:0/0);'),
+        rung_from_text(1, 'XIC(B3:0/0)OTE(O:0/0);'),
+    ]
+
+def test_at_least():
+    bdd = BDD()
+    inputs = [bdd.variable(name) for name in 'abc']
+    two_of_three = bdd.at_least(2, inputs)
+    expected = bdd.or_(bdd.or_(bdd.and_(inputs[0], inputs[1]), bdd.and_(inputs[0], inputs[2])),
+                       bdd.and_(inputs[1], inputs[2]))
+    assert two_of_three == expected
+
+def test_2oo6_vote_through_an_internal_bit():
+    logic = DriveLogic(vote_rungs(2, DETECTORS))
+    assert logic.cause_groups('O:0/0', is_cause) == [Vote(2, tuple(DETECTORS), ())]
+    assert logic.tag_of(Vote(2, tuple(DETECTORS), ())) == 'B3:0/0'
+
+def test_incomplete_vote_is_not_k_out_of_n():
+    logic = DriveLogic(vote_rungs(2, DETECTORS, missing=1))
+    [group] = logic.cause_groups('O:0/0', is_cause)
+    assert group.k is None
+    assert group.causes == tuple(DETECTORS)
+
+def test_single_causes_are_1oo1():
+    logic = DriveLogic([rung_from_text(0, '[XIC(I:1/0) ,XIC(I:1/1) ]OTE(O:0/1);')])
+    assert logic.cause_groups('O:0/1', is_cause) == [Vote(1, ('I:1/0',), ()), Vote(1, ('I:1/1',), ())]
+
+def test_voting_interlock_row():
+    rungs = vote_rungs(2, DETECTORS) + [rung_from_text(2, 'XIC(I:1/7)OTE(O:0/1);')]
+    interlocks = build_transitive_interlocks(rungs, {'B3:0/0': 'Fire confirmed'}, voting=True)
+    votes = [interlock for interlock in interlocks if 'Vote' in interlock]
+    assert len(votes) == 1
+    assert votes[0]['Vote'] == 2
+    assert votes[0]['Tag No'] == 'B3:0/0'
+    assert votes[0]['Service Description'] == '2oo6: Fire confirmed'
+    assert votes[0]['All Inputs'] == DETECTORS
+    assert 'O:0/0' in votes[0]['Effects']
+    # The detectors only trip O:0/0 through the vote, so they get no rows of their own
+    assert [interlock['Tag No'] for interlock in interlocks if 'Vote' not in interlock] == ['I:1/7']
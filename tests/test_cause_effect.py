@@ -0,0 +1,54 @@
+"""Tests for cause_effect: the bitset matrix against a plain dict-of-sets matrix"""
+
+import random
+
+from cause_effect import CauseEffectMatrix
+
+def random_interlocks(seed, rows=60, causes=25, effects=40):
+    rng = random.Random(seed)
+    return [{'Tag No': f'I:0/{rng.randrange(causes)}',
+             'Effects': [f'O:{rng.randrange(effects)}' for _ in range(rng.randint(0, 6))]}
+            for _ in range(rows)]
+
+def dict_matrix(interlocks):
+    """cause -> set of effects, the plain form the bitset matrix replaces"""
+    cells = {}
+    for interlock in interlocks:
+        cells.setdefault(interlock['Tag No'], set()).update(interlock['Effects'])
+    return cells
+
+def pairs(matrix):
+    return {(matrix.causes[row], matrix.effects[column]) for row, column in matrix.cells()}
+
+def test_matches_the_dict_matrix():
+    interlocks = random_interlocks(0)
+    matrix = CauseEffectMatrix.from_interlocks(interlocks)
+    cells = dict_matrix(interlocks)
+
+    assert len(matrix) == len(interlocks)
+    assert matrix.count() == sum(len(set(interlock['Effects'])) for interlock in interlocks)
+    assert pairs(matrix) == {(cause, effect) for cause, effects in cells.items() for effect in effects}
+    for cause, effects in cells.items():
+        assert set(matrix.effects_of(cause)) == effects
+    for effect in matrix.effects:
+        assert set(matrix.causes_of(effect)) == {cause for cause, effects in cells.items() if effect in effects}
+    for row, interlock in enumerate(interlocks):
+        assert set(matrix.row_effects(row)) == set(interlock['Effects'])
+        assert all(matrix.has(row, effect) for effect in interlock['Effects'])
+    assert set(matrix.used_effects()) == set().union(*cells.values())
+
+def test_union_and_intersection():
+    first, second = random_interlocks(1), random_interlocks(2)
+    a, b = CauseEffectMatrix.from_interlocks(first), CauseEffectMatrix.from_interlocks(second)
+    assert pairs(a | b) == pairs(a) | pairs(b)
+    assert pairs(a & b) == pairs(a) & pairs(b)
+    # One row per cause
+    assert len((a | b).causes) == len(set((a | b).causes))
+
+def test_example():
+    matrix = CauseEffectMatrix()
+    row = matrix.add_row('I:0/3', ['O:0/0', 'B3:2/0'])
+    assert matrix.shape == (1, 2)
+    assert matrix.causes_of('O:0/0') == ['I:0/3']
+    assert matrix.row_columns(row) == [0, 1]
+    assert matrix.column_rows('O:9/9') == [] and not matrix.has(row, 'O:9/9')
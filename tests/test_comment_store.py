@@ -0,0 +1,73 @@
+"""Tests for comment_store: lookups, languages and equivalence with the dict path"""
+
+import os
+import pickle
+
+import pytest
+
+from comment_store import CommentStore, CommentStoreWriter
+from l5x_parser import extract_data_from_l5x
+
+L5X_SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '_2_LADDER.L5X')
+
+def build_store(path, comments, translate=None):
+    writer = CommentStoreWriter(str(path))
+    for key, text, lang in comments:
+        writer.add(key, text, lang)
+    return writer.close(translate)
+
+def test_lookups(tmp_path):
+    path = build_store(tmp_path / 'tags.comments', [
+        ('I:1/3', 'Zone 3 detector', None),
+        ('B3:0/1', 'Plant ESD', None),
+        ('I:1/3', 'Duplicate, ignored', None),
+        ('O:0/0', 'Sirène', None),
+    ])
+    with CommentStore(path) as store:
+        assert len(store) == 3
+        assert list(store) == ['B3:0/1', 'I:1/3', 'O:0/0']
+        assert store['I:1/3'] == 'Zone 3 detector'
+        assert store.get('O:0/0') == 'Sirène'
+        assert 'B3:0/1' in store and 'B3:0/2' not in store and 7 not in store
+        assert store.get('B3:0/2', '-') == '-'
+        with pytest.raises(KeyError):
+            store['B3:0/2']
+        assert dict(store) == {'B3:0/1': 'Plant ESD', 'I:1/3': 'Zone 3 detector', 'O:0/0': 'Sirène'}
+
+def test_languages_fall_back_to_first_exported(tmp_path):
+    path = build_store(tmp_path / 'tags.comments', [
+        ('Pump', 'Pompe', 'fr-FR'),
+        ('Pump', 'Pump', 'en-US'),
+        ('Valve', 'Valve', 'en-US'),
+    ])
+    with CommentStore(path, lang='en-US') as store:
+        assert store['Pump'] == 'Pump'
+        assert store.get('Pump', lang='fr-FR') == 'Pompe'
+        assert store.get('Valve', lang='fr-FR') == 'Valve'
+        assert store.translations('Pump') == {'fr-FR': 'Pompe', 'en-US': 'Pump'}
+    with CommentStore(path) as store:
+        assert store['Pump'] == 'Pompe'
+
+def test_translate_and_pickle(tmp_path):
+    path = build_store(tmp_path / 'tags.comments', [('Local:1:I.Data.3', 'Detector', None)],
+                       translate=lambda key: 'I:1/3')
+    store = CommentStore(path)
+    clone = pickle.loads(pickle.dumps(store))
+    assert clone['I:1/3'] == store['I:1/3'] == 'Detector'
+    clone.close()
+    store.close()
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'empty.comments'
+    path.write_bytes(b'')
+    with pytest.raises(ValueError):
+        CommentStore(str(path))
+
+def test_matches_l5x_descriptions(tmp_path):
+    _, descriptions = extract_data_from_l5x(L5X_SAMPLE)
+    _, store = extract_data_from_l5x(L5X_SAMPLE, comment_store=str(tmp_path / 'sample.comments'))
+    try:
+        assert isinstance(store, CommentStore)
+        assert dict(store) == descriptions
+    finally:
+        store.close()
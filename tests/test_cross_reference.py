@@ -0,0 +1,66 @@
+"""Tests for cross_reference: read / write / timer / counter classification"""
+
+from cross_reference import READ, WRITE, CrossReference
+from rung_parser import rung_from_text
+
+def xref(*texts, routine='MainRoutine', tag_descriptions=None):
+    rungs = [rung_from_text(number, text, routine=routine) for number, text in enumerate(texts)]
+    return CrossReference(rungs, tag_descriptions)
+
+def uses(index, address):
+    return [(reference.instruction, reference.use) for reference in index.where_used(address)]
+
+def test_bit_instructions():
+    index = xref('XIC(B3:0/1)XIO(B3:0/2)OTL(B3:0/3)OTU(B3:0/4)OTE(O:0/0);')
+    assert uses(index, 'B3:0/1') == [('XIC', READ)]
+    assert uses(index, 'B3:0/2') == [('XIO', READ)]
+    assert uses(index, 'B3:0/3') == [('OTL', WRITE)]
+    assert uses(index, 'B3:0/4') == [('OTU', WRITE)]
+    assert index.writers('O:0/0') == ['MainRoutine:0000']
+
+def test_timer_counter_and_reset():
+    index = xref('XIC(I:1/0)TON(T4:0,1.0,10,0);', 'XIC(T4:0/DN)CTU(C5:0,5,0);', 'XIC(C5:0/DN)RES(C5:0);')
+    assert index.timer_uses('T4:0') == ['MainRoutine:0000']
+    assert index.readers('T4:0/DN') == ['MainRoutine:0001']
+    assert index.counter_uses('C5:0') == ['MainRoutine:0001']
+    assert index.writers('C5:0') == ['MainRoutine:0002']
+
+def test_word_instruction_destinations():
+    index = xref('MOV(N7:0,N7:1)ADD(N7:2,5,N7:3)SCL(N7:4,100,0,N7:5)NEG(N7:6,N7:7);',
+                 'SCP(F8:0,0,100,0,10,F8:1);')
+    for source in ('N7:0', 'N7:2', 'N7:4', 'N7:6', 'F8:0'):
+        assert index.readers(source) and not index.writers(source), source
+    for destination in ('N7:1', 'N7:3', 'N7:5', 'N7:7', 'F8:1'):
+        assert index.writers(destination) and not index.readers(destination), destination
+    # Literals are not indexed
+    assert '100' not in index
+
+def test_expression_operands_are_read():
+    index = xref('CPT(N7:4,N7:5+N7:6*(N7:7|B3/58));', 'CMP(N7:1>N7:2)OTE(B3:0/0);')
+    assert index.writers('N7:4') == ['MainRoutine:0000']
+    for address in ('N7:5', 'N7:6', 'N7:7', 'B3:3/10'):
+        assert index.readers(address) == ['MainRoutine:0000'], address
+    assert index.readers('N7:1') == index.readers('N7:2') == ['MainRoutine:0001']
+
+def test_logix_spelling_finds_the_same_entry():
+    index = xref('XIC(B3[4].6)OTE(B3[0].1);')
+    assert index.readers('B3:4/6') == index.readers('B3[4].6') == ['MainRoutine:0000']
+
+def test_duplicate_coils_name_their_routines():
+    rungs = [rung_from_text(0, 'XIC(I:1/0)OTE(B3:0/0);', routine='LAD 2'),
+             rung_from_text(0, 'XIC(I:1/1)OTE(B3:0/0);', routine='LAD 3'),
+             rung_from_text(1, 'XIC(I:1/2)OTL(B3:0/1);', routine='LAD 3')]
+    index = CrossReference(rungs)
+    assert index.duplicate_coils == {'B3:0/0': ['LAD 2:0000', 'LAD 3:0000']}
+    assert index.readers('I:1/0') == ['LAD 2:0000']
+
+def test_unused_tags():
+    index = xref('XIC(T4:0/DN)OTE(B3:0/0);', tag_descriptions={'T4:0': 'Delay', 'B3:0/0': 'Trip', 'B3:9/9': 'Spare'})
+    assert index.unused == ['B3:9/9']
+
+def test_two_coils_in_one_rung_are_not_duplicates():
+    index = xref('XIC(I:1/0)[OTL(B3:0/0) ,OTE(B3:0/0) ,OTE(B3:0/0) ];')
+    assert index.duplicate_coils == {}
+    assert index.writers('B3:0/0') == ['MainRoutine:0000']
+    index = xref('XIC(I:1/0)[OTE(B3:0/0) ,OTE(B3:0/0) ];', 'XIC(I:1/1)OTE(B3:0/0);')
+    assert index.duplicate_coils == {'B3:0/0': ['MainRoutine:0000', 'MainRoutine:0001']}
@@ -0,0 +1,51 @@
+"""Tests for l5k_parser: streaming records from a full-project .L5K export"""
+
+from l5k_parser import extract_data_from_l5k, iter_l5k_records
+from l5x_parser import RungText
+
+PROJECT = """\
+IE_VER := 2.24;
+
+CONTROLLER Fire_System (ProcessorType := "1756-L71")
+\tTAG
+\t\tB3 : INT[10] (Description := "Binary file") := [0,0,0,0,0,0,0,0,0,0];
+\tEND_TAG
+
+\tPROGRAM MainProgram (MAIN := "MainRoutine")
+\t\tROUTINE MainRoutine
+\t\t\tRC: "Start the pump";
+\t\t\tN: XIC(Start_PB)
+\t\t\t   OTE(B3[0].2);
+\t\t\tN: XIC(A)
+\t\t\t   [XIO(B) ,XIC(C)
+\t\t\t   ]OTE(D);
+\t\tEND_ROUTINE
+\t\tROUTINE Alarms
+\t\t\tN: XIC(D)OTE(E);
+\t\tEND_ROUTINE
+\tEND_PROGRAM
+END_CONTROLLER
+"""
+
+def write_project(tmp_path):
+    l5k_file = tmp_path / 'Fire_System.L5K'
+    l5k_file.write_text(PROJECT)
+    return str(l5k_file)
+
+def test_wrapped_rungs_are_one_line(tmp_path):
+    rungs = [record for record in iter_l5k_records(write_project(tmp_path)) if isinstance(record, RungText)]
+    assert rungs == [
+        RungText('MainRoutine', 0, 'XIC(Start_PB) OTE(B3[0].2);', 'Start the pump'),
+        RungText('MainRoutine', 1, 'XIC(A) [XIO(B) ,XIC(C) ]OTE(D);', ''),
+        RungText('Alarms', 0, 'XIC(D)OTE(E);', ''),
+    ]
+
+def test_wrapped_rungs_parse(tmp_path):
+    rungs, _ = extract_data_from_l5k(write_project(tmp_path), translate=False)
+    assert rungs[0]['inputs'] == ['Start_PB']
+    assert rungs[0]['outputs'] == ['B3[0].2']
+    assert rungs[0]['description'] == 'Start the pump'
+    assert rungs[1]['inputs'] == ['A', 'B', 'C']
+    assert rungs[1]['logic_type'] == 'OR'
+    assert [(rung['routine'], rung['rung']) for rung in rungs] == [
+        ('MainRoutine', '0000'), ('MainRoutine', '0001'), ('Alarms', '0000')]
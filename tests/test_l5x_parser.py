@@ -0,0 +1,65 @@
+"""Tests for l5x_parser: streamed records, comment languages and SLC address translation"""
+
+import io
+import os
+
+from l5x_parser import RungText, TagComment, extract_data_from_l5x, iter_l5x_records
+
+L5X_SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '_2_LADDER.L5X')
+
+EXPORT = b'''<?xml version="1.0" encoding="UTF-8"?>
+<RSLogix5000Content>
+<Controller Name="PLC">
+<Tags>
+<Tag Name="Pump" DataType="DINT">
+<Description><![CDATA[Pump run]]></Description>
+<Comments>
+<Comment Operand=".0"><LocalizedComment Lang="fr-FR">Marche</LocalizedComment>
+<LocalizedComment Lang="en-US">Running</LocalizedComment></Comment>
+<Comment Operand=".1">Fault</Comment>
+</Comments>
+</Tag>
+</Tags>
+<Programs><Program Name="MainProgram"><Routines>
+<Routine Name="Main"><RLLContent>
+<Rung Number="0"><Comment><![CDATA[Pump interlock]]></Comment>
+<Text><![CDATA[XIC(Pump.1)OTU(Pump.0);]]></Text></Rung>
+<Rung Number="1"><Text><![CDATA[XIO(Pump.1)OTE(Pump.2);]]></Text></Rung>
+</RLLContent></Routine>
+</Routines></Program></Programs>
+</Controller>
+</RSLogix5000Content>
+'''
+
+def test_records_in_file_order():
+    records = [record for record in iter_l5x_records(io.BytesIO(EXPORT)) if isinstance(record, (TagComment, RungText))]
+    assert records == [
+        TagComment('Pump', 'Pump', '', 'Pump run', None),
+        TagComment('Pump.0', 'Pump', '.0', 'Marche', 'fr-FR'),
+        TagComment('Pump.0', 'Pump', '.0', 'Running', 'en-US'),
+        TagComment('Pump.1', 'Pump', '.1', 'Fault', None),
+        RungText('Main', 0, 'XIC(Pump.1)OTU(Pump.0);', 'Pump interlock'),
+        RungText('Main', 1, 'XIO(Pump.1)OTE(Pump.2);', ''),
+    ]
+
+def test_preferred_language():
+    rungs, descriptions = extract_data_from_l5x(io.BytesIO(EXPORT), lang='en-US')
+    assert descriptions == {'Pump': 'Pump run', 'Pump.0': 'Running', 'Pump.1': 'Fault'}
+    _, descriptions = extract_data_from_l5x(io.BytesIO(EXPORT))
+    assert descriptions['Pump.0'] == 'Marche'
+    assert [(rung['rung'], rung['inputs'], rung['outputs'], rung['routine']) for rung in rungs] == [
+        ('0000', ['Pump.1'], ['Pump.0'], 'Main'),
+        ('0001', ['Pump.1'], ['Pump.2'], 'Main'),
+    ]
+    assert rungs[0]['description'] == 'Pump interlock'
+
+def test_converted_slc_addresses_are_translated():
+    rungs, descriptions = extract_data_from_l5x(L5X_SAMPLE)
+    assert len(rungs) == 62
+    assert rungs[0]['inputs'] == ['B14:0/3'] and rungs[0]['outputs'] == ['B3:2/4']
+    assert rungs[0]['text'] == 'XIC(B14[0].3)OTE(B3[2].4);'
+    assert descriptions['B11:0/0'] == 'Pull Station 7 Zone 1'
+
+    raw_rungs, raw_descriptions = extract_data_from_l5x(L5X_SAMPLE, translate=False)
+    assert raw_rungs[0]['inputs'] == ['B14[0].3']
+    assert 'B11:0/0' not in raw_descriptions
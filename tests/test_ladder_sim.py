@@ -0,0 +1,66 @@
+"""Tests for ladder_sim: bit-parallel scans against hand-evaluated rungs"""
+
+from itertools import product
+
+from ladder_sim import LadderSimulator, verify_interlocks
+from rung_parser import rung_from_text
+
+INPUTS = ['I:1/0', 'I:1/1', 'I:1/2', 'I:1/3']
+
+def simulate(texts, scenarios, base=None):
+    rungs = [rung_from_text(number, text) for number, text in enumerate(texts)]
+    return LadderSimulator(rungs).run(scenarios, base)
+
+def every_scenario(tags):
+    return [dict(zip(tags, values)) for values in product((False, True), repeat=len(tags))]
+
+def test_scan_matches_hand_evaluation():
+    texts = [
+        'XIC(I:1/0)[XIC(I:1/1)[XIO(I:1/2) ,XIC(I:1/3) ] ,XIO(I:1/1)XIC(I:1/2) ]OTE(B3:0/0);',
+        'XIC(B3:0/0)XIO(I:1/3)OTE(O:0/0);',
+    ]
+    scenarios = every_scenario(INPUTS)
+    result = simulate(texts, scenarios)
+    for number, scenario in enumerate(scenarios):
+        a, b, c, d = (scenario[tag] for tag in INPUTS)
+        trip = a and (b and (not c or d) or not b and c)
+        assert result.is_on('B3:0/0', number) == trip, scenario
+        assert result.is_on('O:0/0', number) == (trip and not d), scenario
+    assert result.unsettled() == []
+
+def test_rung_reading_a_bit_written_below_settles():
+    result = simulate(['XIC(B3:0/1)OTE(O:0/0);', 'XIC(I:1/0)OTE(B3:0/1);'], [{'I:1/0': True}, {}])
+    assert result.energized(0, ['B3:0/1', 'O:0/0']) == ['B3:0/1', 'O:0/0']
+    assert result.energized(1, ['B3:0/1', 'O:0/0']) == []
+
+def test_seal_in_and_latches_hold():
+    texts = [
+        '[XIC(I:1/0) ,XIC(B3:0/0) ]XIO(I:1/1)OTE(B3:0/0);',   # start / stop seal-in
+        'XIC(I:1/2)OTL(B3:0/1);',
+        'XIC(I:1/3)OTU(B3:0/1);',
+    ]
+    sealed = {'B3:0/0': True, 'B3:0/1': True}
+    result = simulate(texts, [{}, {'I:1/1': True}, {'I:1/3': True}, {'I:1/2': True, 'I:1/3': True}], base=sealed)
+    assert [result.is_on('B3:0/0', number) for number in range(4)] == [True, False, True, True]
+    # The unlatch rung comes after the latch rung, so it wins when both are true
+    assert [result.is_on('B3:0/1', number) for number in range(4)] == [True, True, False, False]
+
+def test_timer_done_follows_the_rung():
+    result = simulate(['XIC(I:1/0)TON(T4:0,1.0,5,0);', 'XIC(T4:0/DN)OTE(O:0/0);'], [{'I:1/0': True}, {}])
+    assert result.is_on('T4:0/EN', 0) and result.is_on('O:0/0', 0)
+    assert not result.is_on('O:0/0', 1)
+
+def test_oscillating_rung_is_unsettled():
+    result = simulate(['XIO(B3:0/0)OTE(B3:0/0);'], [{}])
+    assert result.unsettled(['B3:0/0']) == [0]
+
+def test_verify_interlocks():
+    rungs = [rung_from_text(0, 'XIC(I:1/0)OTE(O:0/0);'), rung_from_text(1, 'XIC(I:1/1)XIC(I:1/2)OTE(O:0/1);')]
+    interlocks = [
+        {'Interlock No': 1, 'Tag No': 'I:1/0', 'Rung': '0000', 'Effects': ['O:0/0'], 'All Inputs': ['I:1/0']},
+        {'Interlock No': 2, 'Tag No': 'I:1/1', 'Rung': '0001', 'Effects': ['O:0/1'], 'All Inputs': ['I:1/1']},
+    ]
+    first, second = verify_interlocks(rungs, interlocks, pairs=True)
+    assert first['confirmed'] == ['O:0/0'] and first['missing'] == []
+    assert second['missing'] == ['O:0/1'] and second['Rung'] == '0001'
+    assert second['with_second_cause'] == {}
@@ -0,0 +1,70 @@
+"""Tests for output_manifest: fingerprints, snapshots and change reports between runs"""
+
+import json
+import os
+
+from output_manifest import (
+    diff_is_empty, diff_snapshots, fingerprint, load_manifest, save_manifest, snapshot,
+)
+from parse_fire_system import manifest_paths, write_outputs
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_INPUTS = os.path.join(ROOT_DIR, 'benchmarks', 'golden', 'baseline_inputs.json')
+
+def alarm(tag, description):
+    return {'Tag No': tag, 'Service Description': description}
+
+def interlock(tag, rung, effects, description=''):
+    return {'Tag No': tag, 'Rung': rung, 'Service Description': description, 'Effects': effects}
+
+def test_fingerprint_ignores_key_order_and_tuples():
+    assert fingerprint({'a': 1, 'b': [1, 2]}) == fingerprint({'b': (1, 2), 'a': 1})
+    assert fingerprint({'a': 1}) != fingerprint({'a': 2})
+
+def test_diff_survives_the_manifest_round_trip(tmp_path):
+    old = snapshot([alarm('B3:0/0', 'Fire Alarm'), alarm('B3:0/1', 'Fault')],
+                   [interlock('I:0/1', '0001', ['O:0/0', 'O:0/1'])])
+    path = str(tmp_path / 'manifest.json')
+    save_manifest(path, {'snapshot': old})
+    old = load_manifest(path)['snapshot']      # tuples come back as lists
+
+    new = snapshot([alarm('B3:0/0', 'Fire Alarm Zone 1'), alarm('B3:0/2', 'ESD')],
+                   [interlock('I:0/1', '0001', ['O:0/0', 'O:0/2'])])
+    assert diff_snapshots(old, new) == {
+        'alarms': {'added': ['B3:0/2'], 'removed': ['B3:0/1'], 'changed': ['B3:0/0']},
+        'interlocks': {'added': [], 'removed': []},
+        'cells': {'added': [['I:0/1', 'O:0/2']], 'removed': [['I:0/1', 'O:0/1']]},
+    }
+    assert diff_is_empty(diff_snapshots(old, snapshot([alarm('B3:0/0', 'Fire Alarm'), alarm('B3:0/1', 'Fault')],
+                                                      [interlock('I:0/1', '0001', ['O:0/1', 'O:0/0'])])))
+
+def test_unreadable_or_foreign_manifest_is_empty(tmp_path):
+    path = tmp_path / 'manifest.json'
+    assert load_manifest(str(path)) == {}
+    path.write_text('{"schema": 999}')
+    assert load_manifest(str(path)) == {}
+    path.write_text('not json')
+    assert load_manifest(str(path)) == {}
+
+def test_write_outputs_skips_unchanged_and_reports_changes(tmp_path, monkeypatch):
+    with open(GOLDEN_INPUTS, encoding='utf-8') as f:
+        inputs = json.load(f)
+    alarms, interlocks, tag_descriptions = inputs['alarms'][:3], inputs['interlocks'][:3], inputs['tag_descriptions']
+    monkeypatch.chdir(ROOT_DIR)                # templates are found relative to the repository
+    output_dir = str(tmp_path)
+    _, changes_file = manifest_paths('Test PLC', output_dir)
+
+    first = write_outputs(alarms, interlocks, tag_descriptions, 'Test PLC', output_dir, direct=True)
+    assert len(first['written']) == 2 and first['changes'] is None
+
+    cause = interlocks[0]['Tag No']
+    interlocks[0] = dict(interlocks[0], Effects=dict(interlocks[0]['Effects'], **{'O:0/15': 'X'}))
+    second = write_outputs(alarms, interlocks, tag_descriptions, 'Test PLC', output_dir, direct=True)
+    assert second['written'] == [second['outputs'][1]]
+    assert second['changes']['cells']['added'] == [[cause, 'O:0/15']]
+    assert os.path.exists(changes_file)
+
+    # Nothing changed since: nothing is rewritten and the stale change report goes
+    third = write_outputs(alarms, interlocks, tag_descriptions, 'Test PLC', output_dir, direct=True)
+    assert third['written'] == [] and third['changes'] is None
+    assert not os.path.exists(changes_file)
@@ -0,0 +1,71 @@
+"""Tests for parse_cache: content-hash hits, invalidation and eviction"""
+
+import os
+
+import parse_cache
+from parse_cache import cache_key, cached_parse, evict_cache
+
+def write_input(tmp_path, text='XIC(A)OTE(B);'):
+    input_file = tmp_path / 'program.L5X'
+    input_file.write_text(text)
+    return str(input_file)
+
+class CountingParser:
+    """parse_func stand-in counting its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, input_file):
+        self.calls += 1
+        return [{'rung': '0000', 'inputs': ['A'], 'outputs': ['B'], 'description': ''}], {'B': 'Horn'}
+
+def test_hit_after_miss(tmp_path):
+    input_file, cache_dir, parse = write_input(tmp_path), str(tmp_path / 'cache'), CountingParser()
+    first = cached_parse(input_file, parse, cache_dir)
+    second = cached_parse(input_file, parse, cache_dir)
+    assert first[2] is False and second[2] is True
+    assert first[:2] == second[:2]
+    assert parse.calls == 1
+
+def test_changed_content_misses(tmp_path):
+    input_file, cache_dir, parse = write_input(tmp_path), str(tmp_path / 'cache'), CountingParser()
+    cached_parse(input_file, parse, cache_dir)
+    write_input(tmp_path, 'XIC(A)OTE(C);')
+    assert cached_parse(input_file, parse, cache_dir)[2] is False
+    assert parse.calls == 2
+
+def test_parser_version_invalidates(tmp_path, monkeypatch):
+    input_file, cache_dir, parse = write_input(tmp_path), str(tmp_path / 'cache'), CountingParser()
+    key = cache_key(input_file)
+    cached_parse(input_file, parse, cache_dir)
+    monkeypatch.setattr(parse_cache, 'PARSER_VERSION', parse_cache.PARSER_VERSION + 1)
+    assert cache_key(input_file) != key
+    assert cached_parse(input_file, parse, cache_dir)[2] is False
+    assert parse.calls == 2
+
+def test_variants_are_kept_apart(tmp_path):
+    input_file, cache_dir, parse = write_input(tmp_path), str(tmp_path / 'cache'), CountingParser()
+    cached_parse(input_file, parse, cache_dir)
+    assert cached_parse(input_file, parse, cache_dir, variant='comments')[2] is False
+    assert cached_parse(input_file, parse, cache_dir, variant='comments')[2] is True
+
+def test_corrupt_entry_is_reparsed(tmp_path):
+    input_file, cache_dir, parse = write_input(tmp_path), str(tmp_path / 'cache'), CountingParser()
+    cached_parse(input_file, parse, cache_dir)
+    entry_path = os.path.join(cache_dir, cache_key(input_file) + '.pkl')
+    with open(entry_path, 'wb') as f:
+        f.write(b'not a pickle')
+    assert cached_parse(input_file, parse, cache_dir)[2] is False
+    assert cached_parse(input_file, parse, cache_dir)[2] is True
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    for age, name in enumerate(('old.pkl', 'new.pkl')):
+        path = cache_dir / name
+        path.write_bytes(b'x' * 100)
+        os.utime(path, (1000 + age, 1000 + age))
+    (cache_dir / 'notes.txt').write_bytes(b'x' * 1000)
+    evict_cache(str(cache_dir), max_bytes=150)
+    assert sorted(os.listdir(cache_dir)) == ['new.pkl', 'notes.txt']
@@ -0,0 +1,19 @@
+"""Tests for parse_fire_system: building one PLC with the stage profiler on"""
+
+import os
+
+import pytest
+
+from parse_fire_system import prepare_plc
+from stage_profiler import profiling
+
+L5X_SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '_2_LADDER.L5X')
+
+@pytest.mark.parametrize('options', [{}, {'transitive': True}, {'voting': True}])
+def test_prepare_plc_with_profiling(options):
+    with profiling(plc='test') as profiler:
+        plc = prepare_plc(L5X_SAMPLE, use_cache=False, **options)
+    stages = {record['stage']: record for record in profiler.records}
+    assert stages['build_cause_effect_matrix']['interlocks'] == len(plc['interlocks'])
+    assert stages['build_alarm_summary']['alarms'] == len(plc['alarms'])
+    assert plc['warnings'] == []
@@ -0,0 +1,76 @@
+"""Tests for pdf_extractor: rung fragments from the text layer of the test.pdf printout"""
+
+import os
+
+from pdf_extractor import extract_data_from_pdf_report, parse_page_text
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Excerpts of test.pdf pages 1 and 3 as pypdf extracts them
+HEADER = (
+    'TRAFIGURA_FIRE_SYSTEM_PLC_1_NEW.RSS\n'
+    'LAD 2 -  --- Total Rungs in File = 63\n'
+    'Page 1  Thursday, December 11, 2025 - 12:08:36\n'
+)
+WATERMARK = 'This PDF document was edited with \nIcecream PDF Editor.Upgrade to PRO\n to remove watermark.'
+
+PAGE_1 = HEADER + (
+    '0000\nB14:0\n3\n \nB3:2\n4\nPlant ESD\n'
+    '0001\nI:0\n1            \nBul.1766\nPull Station 2\nZone 1\n'
+    'B14:0\n0\nPull Station 10\nfrom Office Plc\nZone 1\n'
+    ' \nB3:0\n0\nFire Alarm\nZone 1\nB/0\n \nB3:2\n0\nPlant ESD\n'
+) + WATERMARK
+
+PAGE_3 = HEADER + (
+    'Fire Eye Faults\n'
+    '0004\nI:0\n7            \nBul.1766\nFire Eye 1\nFire Detected\nZone 1\n'
+    'XIO\nEN\nDN\nTON\nTimer On Delay\nTimer T4:16\nTime Base 1.0\nPreset 2<\nAccum 0<\nTON\nDelay Timer\n'
+    '0005\nT4:16\nDN\nDelay Timer\n \nB3:3\n8\nFE 1 Failure Alarm\n'
+) + WATERMARK
+
+def descriptions(fragments):
+    return {address: ' '.join(lines) for fragment in fragments for address, lines, _ in fragment['elements'] if lines}
+
+def test_contacts_and_coils():
+    first, second = parse_page_text(PAGE_1)
+    assert first['rung'] == '0000'
+    # The single-space line marks the output side of the rung
+    assert first['elements'] == [['B14:0/3', [], False], ['B3:2/4', ['Plant ESD'], True]]
+    assert second['rung'] == '0001'
+    assert [(address, is_output) for address, _, is_output in second['elements']] == [
+        ('I:0/1', False), ('B14:0/0', False), ('B3:0/0', True), ('B3:2/0', True)]
+
+def test_description_blocks():
+    assert descriptions(parse_page_text(PAGE_1)) == {
+        'B3:2/4': 'Plant ESD',
+        'I:0/1': 'Pull Station 2 Zone 1',
+        'B14:0/0': 'Pull Station 10 from Office Plc Zone 1',
+        'B3:0/0': 'Fire Alarm Zone 1',
+        'B3:2/0': 'Plant ESD',
+    }
+
+def test_timer_block_and_status_bit():
+    timer_rung, status_rung = parse_page_text(PAGE_3)
+    assert timer_rung['title'] == 'Fire Eye Faults'
+    assert timer_rung['timer'] == 'T4:16'
+    assert timer_rung['elements'] == [['I:0/7', ['Fire Eye 1', 'Fire Detected', 'Zone 1'], False],
+                                      ['T4:16', ['Delay Timer'], True]]
+    assert status_rung['elements'] == [['T4:16/DN', ['Delay Timer'], False],
+                                       ['B3:3/8', ['FE 1 Failure Alarm'], True]]
+
+def test_page_continued_from_the_previous_one():
+    [fragment] = parse_page_text(HEADER + 'B3:3\n8\nFE 1 Failure Alarm\n' + WATERMARK)
+    assert fragment['rung'] is None
+    assert fragment['elements'] == [['B3:3/8', ['FE 1 Failure Alarm'], False]]
+
+def test_printout_descriptions_without_the_database(tmp_path):
+    # Only the 7 descriptions the printout does not show come from test.csv
+    empty = tmp_path / 'empty.csv'
+    empty.write_text('"ADDRESS","SYMBOL","DESC1"\n')
+    rungs, tag_descriptions = extract_data_from_pdf_report(os.path.join(ROOT_DIR, 'test.pdf'), max_workers=1,
+                                                           database=str(empty))
+    assert len(rungs) == 62
+    assert len(tag_descriptions) == 91
+    assert tag_descriptions['T4:16'] == 'Delay Timer'
+    for address in ('B14:0/2', 'B14:0/3', 'I:1/12', 'I:1/13', 'I:1/15', 'B3:0/6', 'B3:0/12'):
+        assert address not in tag_descriptions
@@ -0,0 +1,60 @@
+"""Tests for rung_graph: transitive reachability, cycles and cause -> effect trips"""
+
+import random
+
+from parse_fire_system import is_cause, is_effect
+from rung_graph import RungGraph
+
+def rung(number, inputs, outputs, **extra):
+    return dict({'rung': f'{number:04d}', 'inputs': inputs, 'outputs': outputs, 'description': ''}, **extra)
+
+def reachable_by_search(rungs, tag):
+    """Tags depending on tag, by breadth-first search over the rungs"""
+    found, frontier = set(), [tag]
+    while frontier:
+        source = frontier.pop()
+        for each in rungs:
+            if source in each['inputs']:
+                for target in each['outputs']:
+                    if target not in found:
+                        found.add(target)
+                        frontier.append(target)
+    return found
+
+def test_reachability_matches_search():
+    rng = random.Random(0)
+    tags = [f'B3:{word}/{bit}' for word in range(4) for bit in range(8)]
+    rungs = [rung(number, rng.sample(tags, rng.randint(1, 3)), rng.sample(tags, rng.randint(1, 2)))
+             for number in range(40)]
+    graph = RungGraph(rungs)
+    for tag in tags:
+        assert set(graph.reachable(tag)) == reachable_by_search(rungs, tag), tag
+
+def test_chain_through_internal_bits_and_timer():
+    graph = RungGraph([
+        rung(0, ['I:0/1'], ['B3:0/0']),
+        rung(1, ['B3:0/0'], [], timer='T4:0'),
+        rung(2, ['T4:0/DN'], ['O:0/0']),
+        rung(3, ['I:0/2'], ['B3:2/0']),
+    ])
+    assert graph.reachable('I:0/1') == ['B3:0/0', 'T4:0', 'O:0/0']
+    assert graph.trips(is_cause, is_effect) == [('I:0/1', ['B3:0/0', 'O:0/0']), ('I:0/2', ['B3:2/0'])]
+    assert graph.writers['O:0/0'] == ['0002']
+    order = graph.topological_order()
+    assert order.index('I:0/1') < order.index('B3:0/0') < order.index('T4:0') < order.index('O:0/0')
+    assert graph.cycles() == []
+
+def test_seal_in_and_loops_are_cycles():
+    graph = RungGraph([
+        rung(0, ['I:0/1', 'B3:0/1'], ['B3:0/1']),          # seal-in
+        rung(1, ['B3:1/0'], ['B3:1/1']),
+        rung(2, ['B3:1/1'], ['B3:1/0']),
+    ])
+    assert sorted(sorted(cycle) for cycle in graph.cycles()) == [['B3:0/1'], ['B3:1/0', 'B3:1/1']]
+    assert 'B3:0/1' in graph.reachable('B3:0/1')
+
+def test_deep_chain_has_no_recursion_limit():
+    depth = 5000
+    graph = RungGraph([rung(number, [f'N7:{number}'], [f'N7:{number + 1}']) for number in range(depth)])
+    assert len(graph.reachable('N7:0')) == depth
+    assert graph.topological_order()[0] == 'N7:0'
@@ -0,0 +1,52 @@
+"""Tests for rung_parser: the series / parallel AST and the rung dicts built from it"""
+
+import pytest
+
+from rung_parser import Branch, Instruction, RungSyntaxError, has_logic, parse_rung, rung_from_text, rung_label
+
+def test_series():
+    assert parse_rung('XIC(A)XIO(B)OTE(C);') == (
+        Instruction('XIC', ('A',)), Instruction('XIO', ('B',)), Instruction('OTE', ('C',)))
+
+def test_nested_branches():
+    ast = parse_rung('XIC(A)[XIC(B)[XIC(C) ,XIO(D) ] ,XIO(E) ]OTE(F);')
+    assert ast == (
+        Instruction('XIC', ('A',)),
+        Branch(legs=(
+            (Instruction('XIC', ('B',)), Branch(legs=((Instruction('XIC', ('C',)),), (Instruction('XIO', ('D',)),)))),
+            (Instruction('XIO', ('E',)),),
+        )),
+        Instruction('OTE', ('F',)),
+    )
+
+def test_output_branch_and_array_operands():
+    ast = parse_rung('XIC(B3[0].1)[OTE(B3[2].0) ,TON(T4[1],1.0,5,0) ];')
+    assert ast[1] == Branch(legs=((Instruction('OTE', ('B3[2].0',)),),
+                                  (Instruction('TON', ('T4[1]', '1.0', '5', '0')),)))
+
+def test_expression_with_parentheses():
+    ast = parse_rung('CPT(N7[0],(N7[1]+N7[2])*2);')
+    assert ast == (Instruction('CPT', ('N7[0]', '(N7[1]+N7[2])*2')),)
+
+@pytest.mark.parametrize('text', ['[XIC(A) ,XIC(B) OTE(C);', 'XIC(A) ]OTE(C);', 'XIC(A OTE(C);'])
+def test_malformed_rungs_raise(text):
+    with pytest.raises(RungSyntaxError):
+        parse_rung(text)
+
+def test_rung_from_text():
+    rung = rung_from_text(3, 'XIC(A)[XIC(B) ,XIC(C) ]TON(T4[0],?,?)OTE(D);', 'Pump trip', 'MainRoutine')
+    assert rung['rung'] == '0003'
+    assert rung['inputs'] == ['A', 'B', 'C']
+    assert rung['outputs'] == ['D']
+    assert rung['timer'] == 'T4[0]'
+    assert rung['logic_type'] == 'OR'
+    assert rung['description'] == 'Pump trip'
+    assert has_logic(rung)
+
+def test_all_xio_rung():
+    assert rung_from_text(0, 'XIO(A)XIO(B)OTE(C);')['logic_type'] == 'XIO'
+
+def test_rung_label():
+    assert rung_label(rung_from_text(5, 'OTE(A);', routine='LAD 2')) == 'LAD 2:0005'
+    assert rung_label(rung_from_text(5, 'OTE(A);')) == '0005'
+    assert not has_logic({'rung': '0000', 'inputs': ['A'], 'outputs': ['B'], 'description': ''})
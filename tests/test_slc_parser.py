@@ -0,0 +1,67 @@
+"""Tests for slc_parser: RSLogix 500 ASCII rung text and the CSV symbol database"""
+
+from cross_reference import CrossReference
+from slc_parser import extract_data_from_slc, iter_slc_rungs, load_symbol_database, slc_rung_text
+
+PROGRAM = """\
+START 1747-L542
+LADDER 2 MAIN_PROG
+% Rung: 0 %
+SOR BST XIC I:1/0 NXB XIC B3:0/0 BND XIO I:1/1
+  OTE B3:0/0 EOR
+% Rung: 1 %
+SOR XIC B3:0/0 JSR U:3 EOR
+LADDER 3
+% Rung: 0 %
+SOR XIC I:1/2 CPT N7:0 N7:1+N7:2 OTE B3:0/0 EOR
+% Rung: 1 %
+SOR XIC B3:0/0 TON T4:0 1.0 10 0 EOR
+"""
+
+DATABASE = """\
+"ADDRESS","SYMBOL","DESC1","DESC2"
+"I:1/0","PB1","FIRE ALARM","PUSH BUTTON"
+"B3:0/0","","FIRE LATCH",""
+"T4:0","DLY","",""
+"""
+
+def write_program(tmp_path):
+    slc_file = tmp_path / 'PLC.SLC'
+    slc_file.write_text(PROGRAM)
+    (tmp_path / 'PLC.csv').write_text(DATABASE)
+    return str(slc_file)
+
+def test_rung_text():
+    tokens = 'SOR BST XIC I:0/1 NXB XIC B3:0/0 BND OTE B3:0/0 EOR'.split()
+    assert slc_rung_text(tokens) == '[XIC(I:0/1) ,XIC(B3:0/0) ]OTE(B3:0/0);'
+
+def test_rungs_are_numbered_per_program_file(tmp_path):
+    records = list(iter_slc_rungs(write_program(tmp_path)))
+    assert [(record.routine, record.number) for record in records] == [
+        ('MAIN_PROG', 0), ('MAIN_PROG', 1), ('LAD 3', 0), ('LAD 3', 1)]
+    # A rung wrapped over two lines is one rung
+    assert records[0].text == '[XIC(I:1/0) ,XIC(B3:0/0) ]XIO(I:1/1)OTE(B3:0/0);'
+    assert records[2].text == 'XIC(I:1/2)CPT(N7:0,N7:1+N7:2)OTE(B3:0/0);'
+
+def test_extract_keeps_the_program_file(tmp_path):
+    rungs, tag_descriptions = extract_data_from_slc(write_program(tmp_path))
+    assert [(rung['routine'], rung['rung']) for rung in rungs] == [
+        ('MAIN_PROG', '0000'), ('MAIN_PROG', '0001'), ('LAD 3', '0000'), ('LAD 3', '0001')]
+    assert rungs[3]['timer'] == 'T4:0'
+    assert tag_descriptions['I:1/0'] == 'FIRE ALARM PUSH BUTTON'
+
+    # Rung 0 of both files writes B3:0/0 - the cross reference tells them apart
+    xref = CrossReference(rungs, tag_descriptions)
+    assert xref.duplicate_coils == {'B3:0/0': ['MAIN_PROG:0000', 'LAD 3:0000']}
+    assert xref.readers('N7:1') == ['LAD 3:0000']
+
+def test_symbol_database(tmp_path):
+    write_program(tmp_path)
+    database = load_symbol_database(str(tmp_path / 'PLC.csv'))
+    # A symbol with no description describes the address
+    assert database == {'I:1/0': 'FIRE ALARM PUSH BUTTON', 'B3:0/0': 'FIRE LATCH', 'T4:0': 'DLY'}
+
+def test_database_without_header(tmp_path):
+    csv_file = tmp_path / 'symbols.csv'
+    csv_file.write_text('"B3:0/1","","ZONE 1 FAULT"\n"O:0/2","HORN",""\n')
+    assert load_symbol_database(str(csv_file)) == {'B3:0/1': 'ZONE 1 FAULT', 'O:0/2': 'HORN'}
@@ -0,0 +1,54 @@
+"""Tests for tag_address: parsing, canonical spelling and ordering of data-table addresses"""
+
+import pytest
+
+from tag_address import address_sort_key, addresses_in, element_of, normalize_address, parse_address, status_bit
+
+@pytest.mark.parametrize('text, canonical', [
+    ('B3:0/4', 'B3:0/4'),
+    ('B3[0].4', 'B3:0/4'),
+    ('B3/58', 'B3:3/10'),
+    ('T4:16/DN', 'T4:16/DN'),
+    ('T4[16].DN', 'T4:16/DN'),
+    ('T4:8.ACC', 'T4:8.ACC'),
+    ('N7[0]', 'N7:0'),
+    ('I:1/12', 'I:1/12'),
+    ('I:1.2/3', 'I:1/35'),
+    ('O:0/3', 'O:0/3'),
+])
+def test_canonical_spelling(text, canonical):
+    assert normalize_address(text) == canonical
+
+def test_whole_sub_element_word_is_not_a_bit():
+    address = parse_address('I:1.2')
+    assert (address.word, address.sub, address.bit) == (1, 2, -1)
+    assert str(address) == 'I:1.2'
+    assert address.element == parse_address('I:1')
+
+def test_lowercase_addresses():
+    assert parse_address('b3:0/4') is parse_address('B3:0/4')
+    assert normalize_address('t4:8.acc') == 'T4:8.ACC'
+
+def test_spellings_share_one_object():
+    assert parse_address('B3[0].4') is parse_address('B3:0/4')
+    assert parse_address('I:1.2/3') is parse_address('I:1/35')
+
+@pytest.mark.parametrize('text', ['Fire_Alarm', 'SLOT00_Bul_1766_Placeholder.I[0].1', 'B:0/1', '', '5'])
+def test_symbolic_tags_are_not_addresses(text):
+    assert parse_address(text) is None
+    assert normalize_address(text) == text
+
+def test_sort_order():
+    tags = ['B3:1/0', 'Zone_Fault', 'B3:0/10', 'B3:0/2', 'N7:0', 'Alarm']
+    assert sorted(tags, key=address_sort_key) == ['B3:0/2', 'B3:0/10', 'B3:1/0', 'N7:0', 'Alarm', 'Zone_Fault']
+
+def test_element_and_status_bit():
+    assert element_of('T4:16/DN') == 'T4:16'
+    assert element_of('T4[16].DN') == 'T4[16]'
+    assert element_of('B3:0/4') == 'B3:0/4'
+    assert status_bit('T4:16', 'DN') == 'T4:16/DN'
+
+def test_addresses_in_expression():
+    assert addresses_in('(N7:5+N7:6)*10 | B3/58') == ['N7:5', 'N7:6', 'B3:3/10']
+    assert addresses_in('SQR(N7[1]) > 100') == ['N7:1']
+    assert addresses_in('42') == []
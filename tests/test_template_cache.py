@@ -0,0 +1,45 @@
+"""Tests for template_cache: per-process template snapshots and page copies"""
+
+import os
+import shutil
+
+from template_cache import _TEMPLATE_CACHE, add_pages, clear_template_cache, load_template
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT_DIR, 'templates', 'STX Alarm Summary Template - 251113.xlsx')
+
+def test_copies_are_independent():
+    clear_template_cache()
+    first = load_template(TEMPLATE)
+    first['TEMPLATE']['L1'] = 'DOC-1'
+    second = load_template(TEMPLATE)
+    assert len(_TEMPLATE_CACHE) == 1
+    assert second is not first
+    assert second['TEMPLATE']['L1'].value == 'XXXX'
+
+def test_changed_template_is_reloaded(tmp_path):
+    template = str(tmp_path / 'template.xlsx')
+    shutil.copy(TEMPLATE, template)
+    workbook = load_template(template)
+    workbook['TEMPLATE']['L1'] = 'DOC-2'
+    workbook.save(template)
+    stat = os.stat(template)
+    os.utime(template, (stat.st_atime, stat.st_mtime + 10))
+    assert load_template(template)['TEMPLATE']['L1'].value == 'DOC-2'
+    clear_template_cache()
+    assert not _TEMPLATE_CACHE
+
+def test_add_pages():
+    workbook = load_template(TEMPLATE)
+    ws = workbook['TEMPLATE']
+    ws.freeze_panes = 'A7'
+    ws.print_title_rows = '1:6'
+    pages = add_pages(ws, ['Alarm Summary 1', 'Alarm Summary 2', 'Alarm Summary 3'])
+    assert pages[0] is ws
+    assert workbook.sheetnames == ['Alarm Summary 1', 'Alarm Summary 2', 'Alarm Summary 3']
+    for page in pages[1:]:
+        assert page['K1'].value == 'Document No:'
+        assert page.freeze_panes == 'A7'
+        assert page.print_title_rows == '$1:$6'
+        assert not page.sheet_view.tabSelected
+        assert set(map(str, page.merged_cells.ranges)) == set(map(str, ws.merged_cells.ranges))
@@ -0,0 +1,64 @@
+"""Tests for template_writer and excel_styles: direct sheet XML read back with openpyxl"""
+
+import os
+
+from openpyxl import load_workbook
+
+from excel_styles import STYLE_DISCRETE, STYLE_X_MARK, THIN_BORDER, WorkbookStyles
+from template_cache import load_template
+from template_writer import TemplateSheet, save_pages
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT_DIR, 'templates', 'STX Alarm Summary Template - 251113.xlsx')
+
+def test_values_styles_and_merges(tmp_path):
+    sheet = TemplateSheet(TEMPLATE)
+    assert sheet.value(1, 11) == 'Document No:'
+    sheet.set(1, 12, 'DOC-1')
+    sheet.set_row(80, ['I:1/3', 'Zone 3 detector', None], [STYLE_X_MARK, STYLE_X_MARK, STYLE_DISCRETE])
+    sheet.merge(80, 4, 80, 5)
+    output = str(tmp_path / 'out.xlsx')
+    sheet.save(output, 'Alarm Summary')
+
+    ws = load_workbook(output)['Alarm Summary']
+    assert ws['L1'].value == 'DOC-1'
+    assert ws['K1'].value == 'Document No:'
+    assert ws['A80'].value == 'I:1/3' and ws['B80'].value == 'Zone 3 detector'
+    assert ws['A80'].font.b and ws['A80'].alignment.horizontal == 'center'
+    assert ws['A80'].border.left.style == 'thin'
+    assert ws['C80'].fill.fgColor.rgb.endswith('C0C0C0')
+    assert 'D80:E80' in set(map(str, ws.merged_cells.ranges))
+
+def test_unmerge_drops_covered_cells():
+    sheet = TemplateSheet(TEMPLATE)
+    assert 'C20:C21' in sheet.merges
+    sheet.unmerge(20)
+    assert all(int(''.join(filter(str.isdigit, ref.split(':')[0]))) < 20 for ref in sheet.merges)
+    assert sheet.xf(21, 3) is None
+
+def test_save_pages(tmp_path):
+    first = TemplateSheet(TEMPLATE)
+    first.set(1, 12, 'DOC-1')
+    second = first.copy()
+    second.set(7, 1, 'second page')
+    output = str(tmp_path / 'pages.xlsx')
+    save_pages(output, [('Alarm Summary 1', first), ('Alarm Summary 2', second)])
+
+    workbook = load_workbook(output)
+    assert workbook.sheetnames == ['Alarm Summary 1', 'Alarm Summary 2']
+    assert workbook['Alarm Summary 2']['L1'].value == 'DOC-1'
+    assert workbook['Alarm Summary 2']['A7'].value == 'second page'
+    assert workbook['Alarm Summary 1']['A7'].value != 'second page'
+
+def test_workbook_styles_match_attribute_assignment():
+    wb = load_template(TEMPLATE)
+    ws = wb['TEMPLATE']
+    styles = WorkbookStyles(wb)
+    styled = styles.apply(ws.cell(90, 1), STYLE_X_MARK)
+    assigned = ws.cell(90, 2)
+    assigned.font = STYLE_X_MARK.font
+    assigned.border = THIN_BORDER
+    assigned.alignment = STYLE_X_MARK.alignment
+    # Same entries in the workbook's font / fill / border / alignment tables
+    for key in ('fontId', 'fillId', 'borderId', 'alignmentId', 'numFmtId'):
+        assert getattr(styled._style, key) == getattr(assigned._style, key), key